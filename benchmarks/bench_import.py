@@ -0,0 +1,109 @@
+"""
+Import-time benchmark for the plugin entry point.
+
+pytest imports ``pytest_ansible_kind.main`` in every run through the
+``pytest11`` entry point, so its import cost is paid even by runs that
+never use ``kind_runner``. This measures that cost with ``-X importtime``
+(pytest itself is imported first and excluded) in fresh interpreters, and
+lists any heavy dependency the import dragged in.
+
+    python benchmarks/bench_import.py -o import.json
+    python benchmarks/bench_import.py --compare import.json
+
+The run fails (exit 1) if a heavy dependency is imported, or with
+``--compare`` if the import got slower than the baseline by more than the
+tolerance.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import statistics
+import subprocess
+import sys
+from typing import Any
+
+MODULE = "pytest_ansible_kind.main"
+HEAVY = ("ansible_runner", "kubernetes", "yaml")
+
+
+def measure_once() -> tuple[float, list[str]]:
+    """Cumulative import time of MODULE in ms, and heavy modules it loaded."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import pytest; import {MODULE}"],
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+    cumulative = 0.0
+    loaded = set()
+    seen_pytest = False
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cum, name = (p.strip() for p in line[len("import time:") :].split("|"))
+        if name == "pytest":
+            seen_pytest = True
+            continue
+        if not seen_pytest:
+            continue
+        if name.split(".")[0] in HEAVY:
+            loaded.add(name.split(".")[0])
+        if name == MODULE:
+            cumulative = int(cum) / 1000
+    return cumulative, sorted(loaded)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("-r", "--repeat", type=int, default=7)
+    parser.add_argument("-o", "--output", help="Write results as JSON to this path.")
+    parser.add_argument("--compare", metavar="BASELINE", help="Saved JSON result.")
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.25,
+        help="Allowed relative slowdown (default 0.25).",
+    )
+    args = parser.parse_args(argv)
+
+    runs = [measure_once() for _ in range(args.repeat)]
+    times = sorted(t for t, _ in runs)
+    heavy = sorted({m for _, loaded in runs for m in loaded})
+    results: dict[str, Any] = {
+        "meta": {"python": platform.python_version(), "repeat": args.repeat},
+        "module": MODULE,
+        "min_ms": times[0],
+        "median_ms": statistics.median(times),
+        "heavy_modules": heavy,
+    }
+
+    print(
+        f"{MODULE}: min {results['min_ms']:.1f}ms "
+        f"median {results['median_ms']:.1f}ms  heavy: {', '.join(heavy) or 'none'}"
+    )
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as fh:
+            json.dump(results, fh, indent=2, sort_keys=True)
+
+    failed = bool(heavy)
+    if heavy:
+        print(f"REGRESSION heavy modules imported: {', '.join(heavy)}")
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as fh:
+            base = json.load(fh)
+        # Compare medians with a small absolute floor to absorb timer noise.
+        allowed = max(base["median_ms"] * (1 + args.tolerance), base["median_ms"] + 2)
+        if results["median_ms"] > allowed:
+            print(
+                f"REGRESSION median_ms: {base['median_ms']:.1f} -> "
+                f"{results['median_ms']:.1f}"
+            )
+            failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,387 @@
+"""
+Offline benchmark of the plugin's own overhead on the KindRunner call path.
+
+Runs ``KindRunner.__call__``, ``kind_session`` and the ``kind_runner``
+fixture against a stub ``kind`` binary and a stubbed ``ansible_runner.run``:
+no Docker, no network beyond a local TCP listener standing in for the API
+server. For each scenario it reports per-call latency, subprocesses spawned,
+temp files/dirs created and traced memory growth, as JSON.
+
+    python benchmarks/bench_overhead.py -n 1000 -o bench.json
+    python benchmarks/bench_overhead.py -n 1000 --compare bench.json
+
+With ``--compare`` the run is checked against a saved result and the script
+exits with status 1 if any metric regressed beyond the tolerance.
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import json
+import os
+import platform
+import socket
+import stat
+import statistics
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, Callable
+
+import pytest
+
+_STUB_KIND = r'''#!{python}
+import json
+import os
+import sys
+
+args = sys.argv[1:]
+state = os.environ["BENCH_KIND_STATE"]
+db_path = os.path.join(state, "clusters.json")
+try:
+    with open(db_path) as fh:
+        db = json.load(fh)
+except FileNotFoundError:
+    db = []
+
+name = "kind"
+for a in args:
+    if a.startswith("--name="):
+        name = a.split("=", 1)[1]
+
+if args[:2] == ["get", "clusters"]:
+    print("\n".join(db))
+elif args[:2] == ["create", "cluster"]:
+    db.append(name)
+elif args[:2] == ["delete", "cluster"]:
+    db = [c for c in db if c != name]
+elif args[:2] == ["get", "kubeconfig"]:
+    print(
+        "apiVersion: v1\nkind: Config\nclusters:\n"
+        "- cluster:\n    server: https://127.0.0.1:%s\n  name: kind-%s\n"
+        "contexts:\n- context:\n    cluster: kind-%s\n    user: kind-%s\n"
+        "  name: kind-%s\ncurrent-context: kind-%s\n"
+        "users:\n- name: kind-%s\n  user:\n    token: bench\n"
+        % (os.environ["BENCH_API_PORT"], *([name] * 6))
+    )
+with open(db_path, "w") as fh:
+    json.dump(db, fh)
+'''
+
+_PLAYBOOK = "- hosts: localhost\n  gather_facts: false\n  roles:\n    - demo\n"
+
+_EVENTS = [
+    {"event": "playbook_on_start", "stdout": ""},
+    {"event": "playbook_on_task_start", "stdout": "TASK [demo : debug]"},
+    {
+        "event": "runner_on_ok",
+        "stdout": "ok: [localhost]",
+        "event_data": {"task": "debug", "role": "demo", "duration": 0.001},
+    },
+    {"event": "playbook_on_stats", "stdout": "PLAY RECAP"},
+]
+
+# Lower is better for every metric; counts may not grow at all.
+_COUNT_METRICS = ("subprocesses_per_call", "temp_files_per_call")
+_LATENCY_METRICS = ("mean_ms", "p50_ms", "p95_ms")
+
+
+class _Counters:
+    """Count subprocesses and temp files via audit hooks (they cannot be removed)."""
+
+    def __init__(self, temp_root: str) -> None:
+        self.temp_root = temp_root
+        self.active = False
+        self.subprocesses = 0
+        self.temp_files = 0
+        sys.addaudithook(self._hook)
+
+    def _hook(self, event: str, args: tuple[Any, ...]) -> None:
+        if not self.active:
+            return
+        if event == "subprocess.Popen":
+            self.subprocesses += 1
+        elif event in ("open", "os.mkdir") and isinstance(args[0], (str, bytes)):
+            path = os.fsdecode(args[0])
+            if not path.startswith(self.temp_root):
+                return
+            if event == "os.mkdir":
+                self.temp_files += 1
+                return
+            mode, flags = args[1], args[2]
+            if (mode and any(c in mode for c in "wxa")) or flags & os.O_CREAT:
+                self.temp_files += 1
+
+    def reset(self) -> None:
+        self.subprocesses = 0
+        self.temp_files = 0
+
+
+def _api_listener() -> int:
+    """Accept-and-close TCP server standing in for the API server port."""
+    sock = socket.socket()
+    sock.bind(("127.0.0.1", 0))
+    sock.listen(128)
+
+    def _serve() -> None:
+        while True:
+            conn, _ = sock.accept()
+            conn.close()
+
+    threading.Thread(target=_serve, daemon=True).start()
+    return sock.getsockname()[1]
+
+
+def _setup(root: Path) -> Path:
+    """Stub binaries on PATH, a private tempdir and a one-role project."""
+    bin_dir, state, tmp = root / "bin", root / "state", root / "tmp"
+    project = root / "project"
+    for d in (bin_dir, state, tmp, project / "playbooks", project / "roles/demo/tasks"):
+        d.mkdir(parents=True)
+    (project / "playbooks/site.yaml").write_text(_PLAYBOOK)
+    (project / "roles/demo/tasks/main.yml").write_text("- debug:\n    msg: hi\n")
+
+    for binary in ("kind", "kubectl", "ansible-playbook"):
+        path = bin_dir / binary
+        path.write_text(_STUB_KIND.format(python=sys.executable))
+        path.chmod(path.stat().st_mode | stat.S_IXUSR)
+
+    os.environ["BENCH_KIND_STATE"] = str(state)
+    os.environ["BENCH_API_PORT"] = str(_api_listener())
+    os.environ["PATH"] = f"{bin_dir}{os.pathsep}{os.environ['PATH']}"
+    tempfile.tempdir = str(tmp)
+
+    import ansible_runner
+
+    def _run(**kwargs: Any) -> SimpleNamespace:
+        handler = kwargs.get("event_handler")
+        if handler is not None:
+            for event in _EVENTS:
+                handler(dict(event))
+        return SimpleNamespace(status="successful", rc=0)
+
+    ansible_runner.run = _run
+    return project
+
+
+def _summarise(
+    latencies: list[float], counters: _Counters, calls: int, growth: int
+) -> dict[str, float]:
+    ordered = sorted(latencies)
+    return {
+        "calls": calls,
+        "mean_ms": statistics.fmean(ordered) * 1000,
+        "p50_ms": ordered[len(ordered) // 2] * 1000,
+        "p95_ms": ordered[int(len(ordered) * 0.95) - 1] * 1000,
+        "max_ms": ordered[-1] * 1000,
+        "subprocesses_per_call": counters.subprocesses / calls,
+        "temp_files_per_call": counters.temp_files / calls,
+        "memory_growth_kib": growth / 1024,
+    }
+
+
+def _measure(
+    step: Callable[[], None], calls: int, warmup: int, counters: _Counters
+) -> dict[str, float]:
+    """Time ``calls`` steps, then repeat them under tracemalloc for memory."""
+    for _ in range(warmup):
+        step()
+
+    latencies = []
+    counters.reset()
+    counters.active = True
+    for _ in range(calls):
+        t0 = time.perf_counter()
+        step()
+        latencies.append(time.perf_counter() - t0)
+    counters.active = False
+
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    for _ in range(calls):
+        step()
+    gc.collect()
+    growth = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+
+    return _summarise(latencies, counters, calls, growth)
+
+
+def bench_call(project: Path, calls: int, warmup: int, counters: _Counters):
+    from pytest_ansible_kind.runner import KindRunner
+
+    runner = KindRunner(str(project), name="bench", output="silent")
+    try:
+        return _measure(lambda: runner("playbooks/site.yaml"), calls, warmup, counters)
+    finally:
+        runner.close()
+
+
+def bench_session(project: Path, calls: int, warmup: int, counters: _Counters):
+    from pytest_ansible_kind.runner import kind_session
+
+    def _step() -> None:
+        with kind_session(str(project), name="bench", output="silent") as runner:
+            runner("playbooks/site.yaml")
+
+    return _measure(_step, calls, warmup, counters)
+
+
+class _FixtureTimer:
+    """Time the call phase of each test; count and trace after ``warmup``."""
+
+    def __init__(self, warmup: int, counters: _Counters, trace: bool) -> None:
+        self.warmup = warmup
+        self.counters = counters
+        self.trace = trace
+        self.latencies: list[float] = []
+        self.before = 0
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_call(self, item: pytest.Item):
+        steady = len(self.latencies) >= self.warmup
+        if steady and self.trace and not tracemalloc.is_tracing():
+            gc.collect()
+            tracemalloc.start()
+            self.before = tracemalloc.get_traced_memory()[0]
+        self.counters.active = steady and not self.trace
+        t0 = time.perf_counter()
+        yield
+        self.latencies.append(time.perf_counter() - t0)
+        self.counters.active = False
+
+    def growth(self) -> int:
+        gc.collect()
+        current = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        return current - self.before
+
+
+def bench_fixture(project: Path, calls: int, warmup: int, counters: _Counters):
+    test_file = project / "test_bench_fixture.py"
+    test_file.write_text(
+        "import pytest\n\n"
+        f"@pytest.mark.parametrize('i', range({warmup + calls}))\n"
+        "def test_call(kind_runner, i):\n"
+        "    kind_runner('playbooks/site.yaml')\n"
+    )
+    args = [
+        str(test_file),
+        "-q",
+        "-p",
+        "no:cacheprovider",
+        f"--rootdir={project}",
+        f"--kind-project-dir={project}",
+        "-o",
+        "kind_output=silent",
+    ]
+
+    counters.reset()
+    timer = _FixtureTimer(warmup, counters, trace=False)
+    if pytest.main(args, plugins=[timer]) != 0:
+        raise SystemExit("fixture benchmark failed")
+
+    traced = _FixtureTimer(warmup, counters, trace=True)
+    if pytest.main(args, plugins=[traced]) != 0:
+        raise SystemExit("fixture benchmark failed")
+
+    return _summarise(timer.latencies[warmup:], counters, calls, traced.growth())
+
+
+SCENARIOS = {"call": bench_call, "session": bench_session, "fixture": bench_fixture}
+
+
+def compare(
+    current: dict[str, Any], baseline: dict[str, Any], tolerance: float
+) -> list[str]:
+    """Return a line for every metric that regressed against ``baseline``."""
+    regressions = []
+    for name, base in baseline.get("scenarios", {}).items():
+        now = current["scenarios"].get(name)
+        if now is None:
+            continue
+        for metric in _LATENCY_METRICS:
+            if now[metric] > base[metric] * (1 + tolerance):
+                regressions.append(
+                    f"{name}.{metric}: {base[metric]:.3f} -> {now[metric]:.3f}"
+                )
+        for metric in _COUNT_METRICS:
+            if now[metric] > base[metric] + 0.01:
+                regressions.append(
+                    f"{name}.{metric}: {base[metric]:.2f} -> {now[metric]:.2f}"
+                )
+        allowed = max(base["memory_growth_kib"] * (1 + tolerance), 64.0)
+        if now["memory_growth_kib"] > allowed:
+            regressions.append(
+                f"{name}.memory_growth_kib: {base['memory_growth_kib']:.1f} "
+                f"-> {now['memory_growth_kib']:.1f}"
+            )
+    return regressions
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("-n", "--calls", type=int, default=1000)
+    parser.add_argument("--warmup", type=int, default=20)
+    parser.add_argument(
+        "--scenario",
+        action="append",
+        choices=sorted(SCENARIOS),
+        help="Scenario to run (repeatable, default all).",
+    )
+    parser.add_argument("-o", "--output", help="Write results as JSON to this path.")
+    parser.add_argument("--compare", metavar="BASELINE", help="Saved JSON result.")
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.25,
+        help="Allowed relative slowdown for latency and memory (default 0.25).",
+    )
+    args = parser.parse_args(argv)
+
+    results: dict[str, Any] = {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "calls": args.calls,
+            "warmup": args.warmup,
+        },
+        "scenarios": {},
+    }
+    with tempfile.TemporaryDirectory(prefix="kind-bench-") as root:
+        project = _setup(Path(root))
+        counters = _Counters(tempfile.tempdir or root)
+        for name in args.scenario or list(SCENARIOS):
+            results["scenarios"][name] = SCENARIOS[name](
+                project, args.calls, args.warmup, counters
+            )
+        tempfile.tempdir = None
+
+    for name, r in results["scenarios"].items():
+        print(
+            f"{name:<8} mean {r['mean_ms']:7.3f}ms  p95 {r['p95_ms']:7.3f}ms  "
+            f"subprocesses/call {r['subprocesses_per_call']:.2f}  "
+            f"tempfiles/call {r['temp_files_per_call']:.2f}  "
+            f"mem +{r['memory_growth_kib']:.1f}KiB"
+        )
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as fh:
+            json.dump(results, fh, indent=2, sort_keys=True)
+
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as fh:
+            regressions = compare(results, json.load(fh), args.tolerance)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
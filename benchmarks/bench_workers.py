@@ -0,0 +1,143 @@
+"""
+Per-call latency of ``KindRunner.__call__`` with and without warm ansible
+workers.
+
+Runs a one-task playbook against ``localhost`` through the real
+ansible-runner and ansible-playbook, once with a fresh ``ansible-playbook``
+per call and once on an ``AnsibleWorkerPool``. Clusters come from the
+in-process fake provider, so no Docker is needed, but ansible-core must be
+installed (``ansible-playbook`` on PATH and importable from this
+interpreter).
+
+    python benchmarks/bench_workers.py -n 20 -o workers.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import importlib.util
+import json
+import os
+import platform
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable
+
+from pytest_ansible_kind.providers import FakeProvider
+from pytest_ansible_kind.registry import ClusterRegistry
+from pytest_ansible_kind.runner import KindRunner
+from pytest_ansible_kind.workers import AnsibleWorkerPool
+
+_PLAYBOOK = (
+    "- hosts: localhost\n  gather_facts: false\n  tasks:\n"
+    "    - debug:\n        msg: hi\n"
+)
+
+
+def _summarise(latencies: list[float]) -> dict[str, float]:
+    ordered = sorted(latencies)
+    return {
+        "calls": len(ordered),
+        "mean_ms": statistics.fmean(ordered) * 1000,
+        "p50_ms": ordered[len(ordered) // 2] * 1000,
+        "p95_ms": ordered[max(int(len(ordered) * 0.95) - 1, 0)] * 1000,
+        "min_ms": ordered[0] * 1000,
+        "max_ms": ordered[-1] * 1000,
+    }
+
+
+def _measure(step: Callable[[], None], calls: int, warmup: int) -> dict[str, float]:
+    for _ in range(warmup):
+        step()
+    latencies = []
+    for _ in range(calls):
+        t0 = time.perf_counter()
+        step()
+        latencies.append(time.perf_counter() - t0)
+    return _summarise(latencies)
+
+
+def bench_mode(
+    project: Path, calls: int, warmup: int, size: int | None
+) -> dict[str, float]:
+    pool = AnsibleWorkerPool(size) if size else None
+    runner = KindRunner(
+        str(project),
+        name="bench",
+        output="silent",
+        registry=ClusterRegistry(probe=None, provider=FakeProvider()),
+        workers=pool,
+    )
+    try:
+        # ansible-runner echoes playbook output; keep the report readable.
+        with open(os.devnull, "w") as sink, contextlib.redirect_stdout(sink):
+            result = _measure(lambda: runner("playbooks/site.yaml"), calls, warmup)
+    finally:
+        runner.close()
+        if pool is not None:
+            pool.close()
+    if pool is not None and pool.errors:
+        raise SystemExit(f"workers unavailable: {list(pool.errors.values())[0]}")
+    return result
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("-n", "--calls", type=int, default=20)
+    parser.add_argument(
+        "--warmup",
+        type=int,
+        default=2,
+        help="Untimed calls first; the first pool call starts its server.",
+    )
+    parser.add_argument("--workers", type=int, default=2, help="Pool size.")
+    parser.add_argument("-o", "--output", help="Write results as JSON to this path.")
+    args = parser.parse_args(argv)
+
+    if shutil.which("ansible-playbook") is None or not importlib.util.find_spec(
+        "ansible"
+    ):
+        print("ansible-core is not installed", file=sys.stderr)
+        return 2
+
+    results: dict[str, Any] = {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "calls": args.calls,
+            "warmup": args.warmup,
+            "workers": args.workers,
+        },
+        "modes": {},
+    }
+    with tempfile.TemporaryDirectory(prefix="kind-bench-") as root:
+        project = Path(root)
+        (project / "playbooks").mkdir()
+        (project / "playbooks/site.yaml").write_text(_PLAYBOOK)
+        for mode, size in (("subprocess", None), ("workers", args.workers)):
+            results["modes"][mode] = bench_mode(
+                project, args.calls, args.warmup, size
+            )
+
+    for mode, r in results["modes"].items():
+        print(
+            f"{mode:<10} mean {r['mean_ms']:8.1f}ms  p50 {r['p50_ms']:8.1f}ms  "
+            f"p95 {r['p95_ms']:8.1f}ms"
+        )
+    modes = results["modes"]
+    speedup = modes["subprocess"]["mean_ms"] / modes["workers"]["mean_ms"]
+    results["speedup"] = speedup
+    print(f"workers are {speedup:.2f}x faster per call")
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as fh:
+            json.dump(results, fh, indent=2, sort_keys=True)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -7,6 +7,7 @@ from .exceptions import (
     PlaybookFailedError,
     PlaybookNotFoundError,
     ProjectDirError,
+    WaitError,
 )
 from .runner import KindRunner
 
@@ -20,4 +21,5 @@ __all__ = [
     "PlaybookFailedError",
     "InventoryNotFoundError",
     "ProjectDirError",
+    "WaitError",
 ]
@@ -0,0 +1,246 @@
+# Run by path by workers.py: ``client`` runs under ``python -I -S`` as
+# ansible-runner's "binary" and must stay stdlib-only and quick to start;
+# ``serve`` is the per-project process that keeps warm workers forked.
+from __future__ import annotations
+
+import json
+import os
+import socket
+import struct
+import sys
+
+_HEADER = struct.Struct("!I")
+
+
+def _exec_cold(argv: list[str]) -> None:
+    try:
+        os.execvp(argv[0], argv)
+    except OSError as exc:
+        sys.stderr.write(f"{argv[0]}: {exc}\n")
+        sys.exit(127)
+
+
+def _connect(master: str) -> socket.socket | None:
+    """A connection to a warm worker for this cwd and env, if there is one."""
+    request = {"cwd": os.getcwd(), "env": dict(os.environ)}
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.connect(master)
+            sock.sendall(json.dumps(request).encode() + b"\n")
+            with sock.makefile("rb") as reply:
+                path = json.loads(reply.readline()).get("socket")
+        if not path:
+            return None
+        conn = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        conn.connect(path)
+        return conn
+    except (OSError, ValueError):
+        return None
+
+
+def client(master: str, args: list[str]) -> None:
+    """
+    Stand in for ``ansible-playbook``: hand this process' stdio, argv, env
+    and cwd to a warm worker and exit with its status. Runs the real
+    ``ansible-playbook`` instead when no worker can be had.
+    """
+    argv = ["ansible-playbook", *args]
+    conn = _connect(master)
+    if conn is None:
+        _exec_cold(argv)
+        return
+
+    job = json.dumps({"argv": argv, "env": dict(os.environ), "cwd": os.getcwd()})
+    data = _HEADER.pack(len(job.encode())) + job.encode()
+    sent = socket.send_fds(conn, [data], [0, 1, 2])
+    conn.sendall(data[sent:])
+    # The worker stops when this connection closes, e.g. when we are killed.
+    status = b""
+    while chunk := conn.recv(64):
+        status += chunk
+    try:
+        sys.exit(int(status))
+    except ValueError:
+        sys.exit(1)
+
+
+def _recv_job(conn: socket.socket) -> tuple[dict, list[int]]:
+    data, fds, _, _ = socket.recv_fds(conn, 1 << 16, 3)
+    while len(data) < _HEADER.size:
+        data += _recv_more(conn)
+    (size,) = _HEADER.unpack_from(data)
+    while len(data) < _HEADER.size + size:
+        data += _recv_more(conn)
+    return json.loads(data[_HEADER.size :]), fds
+
+
+def _recv_more(conn: socket.socket) -> bytes:
+    chunk = conn.recv(1 << 16)
+    if not chunk:
+        raise EOFError("client went away")
+    return chunk
+
+
+def _watch(conn: socket.socket) -> None:
+    """Kill the job (and ansible's forks) once the client is gone."""
+    import signal
+
+    try:
+        while conn.recv(64):
+            pass
+    except OSError:
+        pass
+    os.killpg(0, signal.SIGKILL)
+
+
+def _exit_status(main, argv: list[str]) -> int:
+    try:
+        main(argv)
+    except SystemExit as exc:
+        if exc.code is None or isinstance(exc.code, int):
+            return exc.code or 0
+        sys.stderr.write(f"{exc.code}\n")
+        return 1
+    except BaseException:
+        import traceback
+
+        traceback.print_exc()
+        return 1
+    return 0
+
+
+def _refresh_settings() -> None:
+    """Bring what ansible read at import in line with the job's stdio."""
+    import importlib
+
+    # Colour defaults to whether stdout is a tty, which it now is.
+    color = sys.modules.get("ansible.utils.color")
+    if color is not None:
+        importlib.reload(color)
+
+
+def _work(listener: socket.socket, main) -> None:
+    """One job in a fresh fork of the warm process, then exit."""
+    import signal
+    import threading
+
+    signal.set_wakeup_fd(-1)
+    signal.signal(signal.SIGCHLD, signal.SIG_DFL)
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    conn, _ = listener.accept()
+    listener.close()
+    try:
+        job, fds = _recv_job(conn)
+    except (OSError, EOFError, ValueError):
+        os._exit(1)
+    if len(fds) != 3:
+        os._exit(1)
+    os.setpgrp()
+    for target, fd in enumerate(fds):
+        os.dup2(fd, target)
+        os.close(fd)
+    sys.stdin = open(0, "r", closefd=False)
+    sys.stdout = open(1, "w", buffering=1, closefd=False)
+    sys.stderr = open(2, "w", buffering=1, closefd=False)
+
+    os.chdir(job["cwd"])
+    os.environ.clear()
+    os.environ.update(job["env"])
+    sys.argv = list(job["argv"])
+    _refresh_settings()
+
+    threading.Thread(target=_watch, args=(conn,), daemon=True).start()
+    status = _exit_status(main, sys.argv)
+    for stream in (sys.stdout, sys.stderr):
+        try:
+            stream.flush()
+        except OSError:
+            pass
+    try:
+        conn.sendall(b"%d\n" % status)
+    except OSError:
+        pass
+    os._exit(status)
+
+
+def _load(entry: str):
+    import importlib
+
+    module, _, attr = entry.partition(":")
+    return getattr(importlib.import_module(module), attr or "main")
+
+
+def serve(path: str, size: int, entry: str, preload: list[str]) -> None:
+    """
+    Import ``entry`` (and ``preload``) once, then keep ``size`` forked
+    workers waiting on ``path``, each running one job. Exits when stdin,
+    the pool's lifeline, closes.
+    """
+    import importlib
+    import select
+    import signal
+
+    main = _load(entry)
+    for name in preload:
+        try:
+            importlib.import_module(name)
+        except ImportError:
+            pass
+
+    listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    listener.bind(path)
+    listener.listen(64)
+    sys.stdout.write("ready\n")
+    sys.stdout.flush()
+    devnull = os.open(os.devnull, os.O_WRONLY)
+    os.dup2(devnull, 1)
+    os.dup2(devnull, 2)
+    os.close(devnull)
+
+    wake_r, wake_w = os.pipe()
+    os.set_blocking(wake_w, False)
+    signal.set_wakeup_fd(wake_w)
+    signal.signal(signal.SIGCHLD, lambda *_: None)
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    children: set[int] = set()
+    try:
+        while True:
+            while len(children) < size:
+                pid = os.fork()
+                if pid == 0:
+                    os.close(wake_r)
+                    os.close(wake_w)
+                    _work(listener, main)
+                children.add(pid)
+            ready, _, _ = select.select([0, wake_r], [], [])
+            if 0 in ready and not os.read(0, 1):
+                return
+            if wake_r in ready:
+                os.read(wake_r, 512)
+            while children:
+                try:
+                    pid, _ = os.waitpid(-1, os.WNOHANG)
+                except ChildProcessError:
+                    children.clear()
+                    break
+                if pid == 0:
+                    break
+                children.discard(pid)
+    finally:
+        for pid in children:
+            for kill in (os.killpg, os.kill):
+                try:
+                    kill(pid, signal.SIGKILL)
+                except OSError:
+                    pass
+
+
+if __name__ == "__main__":
+    # Keep this file's directory (the package) off the module search path.
+    here = os.path.dirname(os.path.abspath(__file__))
+    sys.path[:] = [p for p in sys.path if os.path.abspath(p or ".") != here]
+    role, rest = sys.argv[1], sys.argv[2:]
+    if role == "client":
+        client(rest[0], rest[1:])
+    else:
+        serve(rest[0], int(rest[1]), rest[2], rest[3:])
@@ -0,0 +1,155 @@
+from __future__ import annotations
+
+import os
+import re
+import shutil
+import tempfile
+import threading
+from pathlib import Path
+
+RETENTION_MODES = ("never", "on-failure", "always")
+
+_SIZE_UNITS = {"": 1, "k": 1 << 10, "m": 1 << 20, "g": 1 << 30, "t": 1 << 40}
+_SIZE_RE = re.compile(r"^(\d+(?:\.\d+)?)\s*([kmgt]?)(?:i?b)?$", re.IGNORECASE)
+
+
+def parse_size(raw: str) -> int | None:
+    """
+    Parse a size such as ``500M``, ``2G`` or ``1048576`` into bytes.
+    Empty or ``0`` means no limit (None). Raises ValueError otherwise.
+    """
+    text = raw.strip()
+    if not text:
+        return None
+    match = _SIZE_RE.match(text)
+    if match is None:
+        raise ValueError(f"invalid size {raw!r}, expected e.g. 500M or 2G")
+    size = int(float(match.group(1)) * _SIZE_UNITS[match.group(2).lower()])
+    return size or None
+
+
+def _safe_name(nodeid: str) -> str:
+    return re.sub(r"[^A-Za-z0-9_.-]+", "_", nodeid).strip("_.") or "session"
+
+
+class ArtifactStore:
+    """
+    Where ansible-runner artifacts go, and which of them survive.
+
+    Every run writes into ``<scratch>/<ident>`` of one scratch dir created
+    on first use, instead of a fresh temp dir per run; under the ``never``
+    retention runs skip their per-event ``job_events`` files. When a run finishes
+    its dir is removed; under the ``on-failure`` (failed runs only) or
+    ``always`` retention it is first streamed into
+    ``<root>/<test>/<playbook>-<ident>.tar.gz``. If ``max_bytes`` is set,
+    the oldest archives under ``root`` are evicted until the total fits.
+    """
+
+    def __init__(
+        self,
+        root: str | os.PathLike[str] | None = None,
+        retention: str = "never",
+        max_bytes: int | None = None,
+    ) -> None:
+        if retention not in RETENTION_MODES:
+            raise ValueError(
+                f"retention must be one of {', '.join(RETENTION_MODES)}, "
+                f"got {retention!r}"
+            )
+        if retention != "never" and root is None:
+            raise ValueError(f"retention {retention!r} needs an archive root")
+        self.root = Path(root) if root is not None else None
+        self.retention = retention
+        self.max_bytes = max_bytes
+        self.archived: list[str] = []
+        self.evicted = 0
+        self._scratch: str | None = None
+        self._lock = threading.Lock()
+
+    def scratch(self) -> str:
+        """The shared dir to pass as ``artifact_dir``."""
+        with self._lock:
+            if self._scratch is None or not os.path.isdir(self._scratch):
+                self._scratch = tempfile.mkdtemp(prefix="kind-artifacts-")
+            return self._scratch
+
+    @property
+    def may_keep(self) -> bool:
+        """
+        Whether any run may be archived. If not, runs need not write their
+        job event files at all.
+        """
+        return self.retention != "never"
+
+    def keeps(self, failed: bool) -> bool:
+        return self.retention == "always" or (
+            failed and self.retention == "on-failure"
+        )
+
+    def finish(
+        self, ident: str, *, failed: bool, nodeid: str, playbook: str
+    ) -> str | None:
+        """
+        Archive run ``ident`` if the retention asks for it, then remove its
+        artifact dir. Returns the archive path, if one was written.
+        """
+        run_dir = os.path.join(self.scratch(), ident)
+        try:
+            if not self.keeps(failed) or not os.path.isdir(run_dir):
+                return None
+            return self._archive(run_dir, ident, nodeid, playbook)
+        finally:
+            shutil.rmtree(run_dir, ignore_errors=True)
+
+    def _archive(self, run_dir: str, ident: str, nodeid: str, playbook: str) -> str:
+        import tarfile
+
+        assert self.root is not None
+        target_dir = self.root / _safe_name(nodeid)
+        target_dir.mkdir(parents=True, exist_ok=True)
+        stem = Path(playbook).stem or "playbook"
+        target = target_dir / f"{stem}-{ident[:12]}.tar.gz"
+        tmp = target.with_name(f".{target.name}.tmp")
+        with tarfile.open(tmp, "w:gz", compresslevel=6) as tar:
+            tar.add(run_dir, arcname=ident)
+        os.replace(tmp, target)
+        with self._lock:
+            self.archived.append(str(target))
+        self._enforce_budget(keep=target)
+        return str(target)
+
+    def _enforce_budget(self, keep: Path) -> None:
+        """Evict the least recently written archives until under budget."""
+        if self.max_bytes is None or self.root is None:
+            return
+        entries: list[tuple[float, int, Path]] = []
+        for path in self.root.rglob("*.tar.gz"):
+            try:
+                st = path.stat()
+            except FileNotFoundError:
+                continue  # evicted by another worker meanwhile
+            entries.append((st.st_mtime, st.st_size, path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            if path == keep:
+                continue
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
+            total -= size
+            with self._lock:
+                self.evicted += 1
+            try:
+                path.parent.rmdir()
+            except OSError:
+                pass  # other archives of the same test remain
+
+    def close(self) -> None:
+        """Remove the scratch dir."""
+        with self._lock:
+            scratch, self._scratch = self._scratch, None
+        if scratch is not None:
+            shutil.rmtree(scratch, ignore_errors=True)
@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+from typing import Any, Iterable
+
+
+def _hash_file(h: "hashlib._Hash", path: str) -> None:
+    with open(path, "rb") as fh:
+        for chunk in iter(lambda: fh.read(1 << 16), b""):
+            h.update(chunk)
+
+
+def _hash_tree(h: "hashlib._Hash", root: str) -> None:
+    if not os.path.isdir(root):
+        h.update(b"<missing>")
+        return
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames.sort()
+        for fname in sorted(filenames):
+            full = os.path.join(dirpath, fname)
+            h.update(os.path.relpath(full, root).encode("utf-8"))
+            h.update(b"\0")
+            _hash_file(h, full)
+            h.update(b"\0")
+
+
+def playbook_cache_key(
+    *,
+    playbook: str,
+    roles_path: str,
+    inventory: str,
+    extravars: dict[str, Any] | None,
+    cluster: str,
+    generation: str | None,
+    dependencies: Iterable[str] = (),
+) -> str:
+    """
+    Content-addressed key for one playbook run.
+
+    Covers the playbook file, every file under ``roles_path``, the inventory
+    content, the extravars, the target cluster's name and generation
+    (the hash of its kubeconfig, which changes whenever KIND recreates it)
+    and the other files and dirs the playbook reads, ``dependencies`` (see
+    ``ProjectIndex.dependencies``).
+    """
+    h = hashlib.sha256()
+    for label, value in (
+        ("cluster", cluster),
+        ("generation", generation or ""),
+        ("inventory", inventory),
+        ("extravars", json.dumps(extravars or {}, sort_keys=True, default=str)),
+    ):
+        h.update(f"{label}={value}\0".encode("utf-8"))
+    h.update(b"playbook=")
+    _hash_file(h, playbook)
+    h.update(b"\0roles=")
+    _hash_tree(h, roles_path)
+    for path in sorted(dependencies):
+        h.update(f"\0{path}=".encode("utf-8"))
+        if os.path.isfile(path):
+            _hash_file(h, path)
+        else:
+            _hash_tree(h, path)
+    return h.hexdigest()
+
+
+class PlaybookCache:
+    """
+    On-disk record of successful playbook runs, one JSON file per key.
+
+    Lives under the pytest cache dir so it survives between runs. Entries for
+    a cluster are removed with :meth:`invalidate_cluster` when the plugin
+    creates or deletes that cluster.
+    """
+
+    def __init__(self, directory: str | os.PathLike[str]) -> None:
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.hits = 0
+        self.misses = 0
+
+    def _entry(self, key: str) -> Path:
+        return self.directory / f"{key}.json"
+
+    def lookup(self, key: str) -> dict[str, Any] | None:
+        try:
+            with open(self._entry(key), "r", encoding="utf-8") as fh:
+                entry = json.load(fh)
+        except (OSError, ValueError):
+            self.misses += 1
+            return None
+        self.hits += 1
+        return entry
+
+    def store(
+        self, key: str, *, playbook: str, cluster: str, status: str, rc: int
+    ) -> None:
+        entry = {
+            "playbook": playbook,
+            "cluster": cluster,
+            "status": status,
+            "rc": rc,
+            "created": time.time(),
+        }
+        path = self._entry(key)
+        tmp = path.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp, "w", encoding="utf-8") as fh:
+            json.dump(entry, fh)
+        os.replace(tmp, path)
+
+    def invalidate_cluster(self, cluster: str) -> None:
+        for path in self.directory.glob("*.json"):
+            try:
+                with open(path, "r", encoding="utf-8") as fh:
+                    entry = json.load(fh)
+            except (OSError, ValueError):
+                entry = {}
+            if entry.get("cluster") in (cluster, None):
+                path.unlink(missing_ok=True)
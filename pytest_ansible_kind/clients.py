@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import os
+import threading
+from typing import TYPE_CHECKING
+
+from .tracing import phase
+
+if TYPE_CHECKING:
+    from kubernetes import client
+
+
+class ApiClientPool:
+    """
+    One kubernetes ``ApiClient`` per cluster generation, shared by every
+    ``KindRunner`` call that targets it.
+
+    Clients are built from their own ``Configuration`` loaded from the
+    cluster's kubeconfig (from memory when its ``content`` is given), so the
+    process-wide default configuration is never touched and several
+    clusters can be used side by side. Reusing a client
+    keeps its urllib3 connections warm; ``pool_maxsize`` bounds how many
+    connections it keeps per host (``None`` keeps the kubernetes default).
+    """
+
+    def __init__(self, pool_maxsize: int | None = None) -> None:
+        self.pool_maxsize = pool_maxsize
+        self._lock = threading.Lock()
+        self._clients: dict[tuple[str, str], client.ApiClient] = {}
+
+    def _build(self, kubeconfig: str, content: str | None = None) -> client.ApiClient:
+        from kubernetes import client, config
+
+        configuration = client.Configuration()
+        if content is None:
+            config.load_kube_config(
+                config_file=kubeconfig,
+                client_configuration=configuration,
+                persist_config=False,
+            )
+        else:
+            import yaml
+            from kubernetes.config.kube_config import KubeConfigLoader
+
+            # Relative certificate paths resolve as if loaded from the file.
+            KubeConfigLoader(
+                config_dict=yaml.safe_load(content),
+                config_base_path=os.path.dirname(kubeconfig),
+            ).load_and_set(configuration)
+        if self.pool_maxsize is not None:
+            configuration.connection_pool_maxsize = self.pool_maxsize
+        return client.ApiClient(configuration=configuration)
+
+    def get(
+        self,
+        cluster: str,
+        generation: str,
+        kubeconfig: str,
+        content: str | None = None,
+    ) -> client.ApiClient:
+        """Return the client for ``cluster`` at ``generation``, building it once."""
+        key = (cluster, generation)
+        with self._lock:
+            api_client = self._clients.get(key)
+            if api_client is not None:
+                return api_client
+            with phase("api_client"):
+                api_client = self._build(kubeconfig, content)
+            stale = [k for k in self._clients if k[0] == cluster]
+            for k in stale:
+                self._clients.pop(k).close()
+            self._clients[key] = api_client
+            return api_client
+
+    def invalidate_cluster(self, cluster: str) -> None:
+        """Close and drop the clients of a created or deleted cluster."""
+        with self._lock:
+            stale = [k for k in self._clients if k[0] == cluster]
+            clients = [self._clients.pop(k) for k in stale]
+        for api_client in clients:
+            api_client.close()
+
+    def close(self) -> None:
+        with self._lock:
+            clients, self._clients = list(self._clients.values()), {}
+        for api_client in clients:
+            api_client.close()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._clients)
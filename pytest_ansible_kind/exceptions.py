@@ -78,13 +78,21 @@ class PlaybookFailedError(KindError):
     """Raised when an Ansible playbook execution fails."""
 
     def __init__(
-        self, playbook: str, status: str, rc: int, output: str | None = None
+        self,
+        playbook: str,
+        status: str,
+        rc: int,
+        output: str | None = None,
+        artifacts: str | None = None,
     ) -> None:
         self.playbook = playbook
         self.status = status
         self.rc = rc
         self.output = output
+        self.artifacts = artifacts
         msg = f"Playbook failed: {playbook!r}, status={status}, rc={rc}"
+        if artifacts:
+            msg += f", artifacts={artifacts!r}"
         if output:
             msg += f"\n--- output ---\n{output.rstrip()}"
         super().__init__(msg)
@@ -103,6 +111,16 @@ class InventoryNotFoundError(KindError):
         super().__init__(msg)
 
 
+class WaitError(KindError):
+    """Raised when a Kubernetes object does not reach a condition in time."""
+
+    def __init__(self, what: str, reason: str, last: dict | None = None) -> None:
+        self.what = what
+        self.reason = reason
+        self.last = last
+        super().__init__(f"Waiting for {what} failed: {reason}")
+
+
 class ProjectDirError(KindError):
     """Raised when project directory is invalid or has bad structure."""
 
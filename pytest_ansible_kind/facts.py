@@ -0,0 +1,153 @@
+from __future__ import annotations
+
+import glob
+import os
+import re
+import shutil
+import tempfile
+import threading
+from pathlib import Path
+from typing import Any
+
+FACT_CACHE_MODES = ("none", "session", "persistent")
+
+# Name ansible gives the implicit fact gathering task of a play.
+_GATHER_TASK = "Gathering Facts"
+_RESULT_EVENTS = frozenset(
+    {"runner_on_ok", "runner_on_failed", "runner_on_unreachable"}
+)
+
+
+def _safe_name(cluster: str) -> str:
+    return re.sub(r"[^A-Za-z0-9_.-]+", "_", cluster)
+
+
+class FactRun:
+    """
+    Event handler counting the fact gathers of one playbook run.
+
+    ``expected`` is how many plays would gather facts without a cache; the
+    ones that did not emit a gathering task were served from the cache.
+    """
+
+    def __init__(self, cache: FactCache, expected: int) -> None:
+        self._cache = cache
+        self._expected = expected
+        self._gathers = 0
+        self._durations: dict[str, float] = {}
+
+    def __call__(self, event: dict[str, Any]) -> None:
+        data = event.get("event_data") or {}
+        if data.get("task") != _GATHER_TASK:
+            return
+        kind = event.get("event")
+        if kind == "playbook_on_task_start":
+            self._gathers += 1
+        elif kind in _RESULT_EVENTS:
+            # Hosts gather in parallel: the slowest one is the task's cost.
+            uuid = str(data.get("task_uuid", ""))
+            duration = float(data.get("duration") or 0.0)
+            self._durations[uuid] = max(self._durations.get(uuid, 0.0), duration)
+
+    def finish(self) -> None:
+        self._cache._record(
+            gathered=self._gathers,
+            seconds=sum(self._durations.values()),
+            skipped=max(self._expected - self._gathers, 0),
+        )
+
+
+class FactCache:
+    """
+    Ansible ``jsonfile`` fact cache shared by every playbook run.
+
+    Runs get ``smart`` gathering and a cache directory per cluster
+    generation, so facts gathered once are reused until the cluster is
+    recreated (:meth:`invalidate_cluster` drops its directories). With
+    ``root`` None the cache lives in a temp dir removed by :meth:`close`;
+    otherwise it persists in ``root`` across sessions.
+
+    ``gathered``/``gather_seconds`` count the gathers that ran and their
+    cost, ``skipped`` the ones the cache made unnecessary.
+    """
+
+    def __init__(self, root: str | os.PathLike[str] | None = None) -> None:
+        self.persistent = root is not None
+        self._root = Path(root) if root is not None else None
+        self._lock = threading.Lock()
+        self.gathered = 0
+        self.skipped = 0
+        self.gather_seconds = 0.0
+
+    def _base(self) -> Path:
+        with self._lock:
+            if self._root is None:
+                self._root = Path(tempfile.mkdtemp(prefix="kind-facts-"))
+            return self._root
+
+    def directory(self, cluster: str, generation: str | None) -> str:
+        gen = (generation or "none")[:12]
+        path = self._base() / f"{_safe_name(cluster)}@{gen}"
+        path.mkdir(parents=True, exist_ok=True)
+        return str(path)
+
+    def runner_kwargs(self, cluster: str, generation: str | None) -> dict[str, Any]:
+        """
+        ``ansible_runner.run`` arguments pointing a run at ``cluster``'s fact
+        cache. The directory must go through ``fact_cache``: ansible-runner
+        overrides ``ANSIBLE_CACHE_PLUGIN_CONNECTION`` with its own per-run
+        directory under the artifacts otherwise.
+        """
+        return {
+            "fact_cache": self.directory(cluster, generation),
+            "fact_cache_type": "jsonfile",
+        }
+
+    def envvars(self) -> dict[str, str]:
+        """Ansible settings making runs gather facts only when not cached."""
+        return {
+            "ANSIBLE_GATHERING": "smart",
+            # A session cache dies with the session; 0 never expires entries.
+            "ANSIBLE_CACHE_PLUGIN_TIMEOUT": "86400" if self.persistent else "0",
+        }
+
+    def run(self, expected: int) -> FactRun:
+        return FactRun(self, expected)
+
+    def _record(self, *, gathered: int, seconds: float, skipped: int) -> None:
+        with self._lock:
+            self.gathered += gathered
+            self.gather_seconds += seconds
+            self.skipped += skipped
+
+    @property
+    def saved_seconds(self) -> float:
+        """Estimated time saved: skipped gathers at the mean gather cost."""
+        if not self.gathered:
+            return 0.0
+        return self.skipped * self.gather_seconds / self.gathered
+
+    def summary_line(self) -> str:
+        return (
+            f"kind: fact cache skipped {self.skipped} fact gathers "
+            f"(~{self.saved_seconds:.1f}s saved), {self.gathered} gathered in "
+            f"{self.gather_seconds:.1f}s"
+        )
+
+    def invalidate_cluster(self, cluster: str) -> None:
+        with self._lock:
+            root = self._root
+        if root is None:
+            return
+        prefix = glob.escape(_safe_name(cluster))
+        for path in glob.glob(os.path.join(glob.escape(str(root)), f"{prefix}@*")):
+            shutil.rmtree(path, ignore_errors=True)
+
+    def close(self) -> None:
+        """Remove a session cache; a persistent one is kept."""
+        if self.persistent:
+            return
+        with self._lock:
+            root, self._root = self._root, None
+        if root is not None:
+            shutil.rmtree(root, ignore_errors=True)
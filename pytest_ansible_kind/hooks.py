@@ -0,0 +1,19 @@
+"""Hook specifications added by pytest-ansible-kind."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .tracing import Span
+
+
+def pytest_kind_phase(span: "Span") -> None:
+    """
+    Called after each timed phase of a KindRunner call (cluster checks and
+    creation, kubeconfig fetch, inventory, ansible run, ApiClient, shutdown)
+    when ``--kind-durations`` or ``--kind-trace`` is active.
+
+    ``span`` carries the phase name, wall-clock start, duration, pid/thread
+    id and the cluster, playbook and test nodeid it belongs to.
+    """
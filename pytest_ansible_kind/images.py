@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import subprocess
+import threading
+from pathlib import Path
+from typing import Callable
+
+from .exceptions import KindClusterError
+from .runner import _run_kind_checked
+from .tracing import phase
+
+_ARCHIVE_SUFFIXES = (".tar", ".tar.gz", ".tgz")
+
+
+def is_archive(image: str) -> bool:
+    return image.endswith(_ARCHIVE_SUFFIXES) or os.path.isfile(image)
+
+
+def image_digest(image: str) -> str:
+    """
+    Content digest of an image archive (sha256 of the file) or of a local
+    docker image (its image id from ``docker image inspect``).
+    """
+    if is_archive(image):
+        h = hashlib.sha256()
+        with open(image, "rb") as fh:
+            for chunk in iter(lambda: fh.read(1 << 20), b""):
+                h.update(chunk)
+        return f"sha256:{h.hexdigest()}"
+
+    cmd = ["docker", "image", "inspect", "--format", "{{.Id}}", image]
+    try:
+        out = subprocess.run(cmd, check=True, capture_output=True, text=True)
+    except subprocess.CalledProcessError as exc:
+        raise KindClusterError(
+            message=f"Cannot inspect image {image!r}",
+            cmd=exc.cmd,
+            returncode=exc.returncode,
+            stdout=exc.stdout,
+            stderr=exc.stderr,
+        ) from exc
+    return out.stdout.strip()
+
+
+class ImageLoader:
+    """
+    Load images into KIND clusters once per cluster generation.
+
+    For every cluster a manifest of ``{image: digest}`` is kept in
+    ``manifest_dir`` together with the cluster generation it applies to.
+    An image is only (re)loaded when the generation changed or its digest
+    differs from the manifest; within a session, images already handled for
+    a generation are skipped without even computing the digest.
+
+    ``manifest_dir`` may be a callable returning the directory; it is only
+    called, and the directory only created, once an image is loaded.
+    """
+
+    def __init__(
+        self,
+        manifest_dir: str | os.PathLike[str] | Callable[[], str | os.PathLike[str]],
+    ) -> None:
+        self._manifest_source = manifest_dir
+        self._manifest_dir: Path | None = None
+        self._lock = threading.Lock()
+        self._cluster_locks: dict[str, threading.Lock] = {}
+        self._done: set[tuple[str, str, str]] = set()
+
+    @property
+    def manifest_dir(self) -> Path:
+        with self._lock:
+            if self._manifest_dir is None:
+                source = self._manifest_source
+                path = Path(source() if callable(source) else source)
+                path.mkdir(parents=True, exist_ok=True)
+                self._manifest_dir = path
+            return self._manifest_dir
+
+    def _manifest_path(self, cluster: str) -> Path:
+        return self.manifest_dir / f"{cluster}.json"
+
+    def _read_manifest(self, cluster: str, generation: str) -> dict[str, str]:
+        try:
+            with open(self._manifest_path(cluster), "r", encoding="utf-8") as fh:
+                data = json.load(fh)
+        except (OSError, ValueError):
+            return {}
+        if data.get("generation") != generation:
+            return {}
+        return dict(data.get("images") or {})
+
+    def _write_manifest(
+        self, cluster: str, generation: str, images: dict[str, str]
+    ) -> None:
+        path = self._manifest_path(cluster)
+        tmp = path.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp, "w", encoding="utf-8") as fh:
+            json.dump({"generation": generation, "images": images}, fh, indent=2)
+        os.replace(tmp, path)
+
+    def _cluster_lock(self, cluster: str) -> threading.Lock:
+        with self._lock:
+            return self._cluster_locks.setdefault(cluster, threading.Lock())
+
+    def load(self, cluster: str, generation: str, images: list[str]) -> list[str]:
+        """Load ``images`` into ``cluster`` as needed; return those loaded."""
+        with self._lock:
+            done = self._done
+            pending = [i for i in images if (cluster, generation, i) not in done]
+        if not pending:
+            return []
+
+        with self._cluster_lock(cluster), phase("load_images"):
+            manifest = self._read_manifest(cluster, generation)
+            digests = {image: image_digest(image) for image in pending}
+            stale = [i for i in pending if manifest.get(i) != digests[i]]
+
+            docker_images = [i for i in stale if not is_archive(i)]
+            if docker_images:
+                _run_kind_checked(
+                    ["kind", "load", "docker-image", *docker_images]
+                    + [f"--name={cluster}"]
+                )
+            for archive in (i for i in stale if is_archive(i)):
+                _run_kind_checked(
+                    ["kind", "load", "image-archive", archive, f"--name={cluster}"]
+                )
+
+            if stale:
+                manifest.update({i: digests[i] for i in stale})
+                self._write_manifest(cluster, generation, manifest)
+
+        with self._lock:
+            self._done.update((cluster, generation, i) for i in pending)
+        return stale
+
+    def invalidate_cluster(self, cluster: str) -> None:
+        with self._lock:
+            self._done = {d for d in self._done if d[0] != cluster}
+            manifest_dir = self._manifest_dir
+        # Without a load this session there is no directory to clean up yet;
+        # a manifest left by an earlier session names the old generation.
+        if manifest_dir is not None:
+            (manifest_dir / f"{cluster}.json").unlink(missing_ok=True)
@@ -0,0 +1,470 @@
+from __future__ import annotations
+
+import ast
+import hashlib
+import os
+import shutil
+import tempfile
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Callable, Iterable, Iterator
+
+from .exceptions import InventoryNotFoundError, KindConfigError, PlaybookNotFoundError
+
+
+def _yaml_loader() -> Any:
+    import yaml
+
+    # libyaml's loader is several times faster; fall back where it is missing.
+    return getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+
+def read_yaml(path: str) -> Any:
+    """Parse ``path`` with the safe (preferably C) YAML loader."""
+    import yaml
+
+    with open(path, "rb") as fh:
+        return yaml.load(fh, Loader=_yaml_loader())
+
+
+def _resolve_playbook_path(project_dir: str, playbook: str) -> str:
+    if os.path.isabs(playbook):
+        if os.path.exists(playbook):
+            return playbook
+        raise PlaybookNotFoundError(playbook)
+    candidate = os.path.join(project_dir, playbook)
+    if os.path.exists(candidate):
+        return candidate
+    raise PlaybookNotFoundError(playbook, project_dir=project_dir, tried=candidate)
+
+
+def _resolve_inventory_path(project_dir: str, inventory: str) -> str:
+    path = inventory
+    if not os.path.isabs(path):
+        path = os.path.join(project_dir, inventory)
+    if not os.path.exists(path):
+        raise InventoryNotFoundError(inventory, project_dir=project_dir)
+    return path
+
+
+def _derive_name_from_cfg(
+    cfg_path: str | None, load: Callable[[str], Any] = read_yaml
+) -> str:
+    if cfg_path is None:
+        return "kind"
+
+    import yaml
+
+    if not os.path.exists(cfg_path):
+        raise KindConfigError("KIND config file not found", config_path=cfg_path)
+
+    try:
+        data = load(cfg_path)
+    except yaml.YAMLError as exc:
+        raise KindConfigError(
+            f"Invalid YAML in KIND config: {exc}", config_path=cfg_path
+        ) from exc
+
+    if isinstance(data, dict):
+        name = data.get("name")
+        if isinstance(name, str) and name.strip():
+            return name.strip()
+
+    return "kind"
+
+
+def _extract_play_hosts(
+    playbook_path: str, load: Callable[[str], Any] = read_yaml
+) -> list[str]:
+    data = load(playbook_path)
+
+    if isinstance(data, list):
+        plays = [p for p in data if isinstance(p, dict)]
+    elif isinstance(data, dict):
+        plays = [data]
+    else:
+        return []
+
+    seen: set[str] = set()
+    out: list[str] = []
+    for p in plays:
+        h = p.get("hosts")
+        if isinstance(h, str):
+            hv = h.strip()
+            if hv and hv not in seen:
+                seen.add(hv)
+                out.append(hv)
+    return out
+
+
+def _plays(
+    playbook_path: str, load: Callable[[str], Any], seen: set[str]
+) -> Iterator[tuple[str, dict[str, Any]]]:
+    """
+    The plays of ``playbook_path`` and the playbooks it imports, each with
+    the file it is in. Every playbook file visited is added to ``seen``,
+    including imports that do not exist.
+    """
+    key = os.path.abspath(playbook_path)
+    if key in seen:
+        return
+    seen.add(key)
+    if not os.path.exists(playbook_path):
+        return
+    data = load(playbook_path)
+    if not isinstance(data, list):
+        data = [data]
+
+    for play in data:
+        if not isinstance(play, dict):
+            continue
+        imported = play.get("import_playbook") or play.get(
+            "ansible.builtin.import_playbook"
+        )
+        if isinstance(imported, str):
+            path = os.path.join(os.path.dirname(playbook_path), imported)
+            yield from _plays(path, load, seen)
+            continue
+        yield playbook_path, play
+
+
+def _count_gathering_plays(
+    playbook_path: str, load: Callable[[str], Any], seen: set[str]
+) -> int:
+    count = 0
+    for _, play in _plays(playbook_path, load, seen):
+        gather = play.get("gather_facts", True)
+        if isinstance(gather, str):
+            gather = gather.strip().lower() not in ("no", "false", "0", "off")
+        if gather:
+            count += 1
+    return count
+
+
+def _actions(*names: str) -> frozenset[str]:
+    return frozenset(
+        f"{prefix}{name}"
+        for name in names
+        for prefix in ("", "ansible.builtin.", "ansible.legacy.")
+    )
+
+
+_TASK_INCLUDES = _actions("include_tasks", "import_tasks", "include")
+_VARS_INCLUDES = _actions("include_vars")
+_ROLE_INCLUDES = _actions("include_role", "import_role")
+_TASK_LISTS = ("pre_tasks", "tasks", "post_tasks", "handlers")
+_VARS_DIRS = ("group_vars", "host_vars")
+
+
+class _Unresolvable(Exception):
+    """A reference the dependency scan cannot follow to a file."""
+
+
+def _resolve(ref: Any, dirs: Iterable[str]) -> str:
+    if not isinstance(ref, str) or "{{" in ref:
+        raise _Unresolvable(ref)
+    for base in dirs:
+        path = os.path.join(base, ref)
+        if os.path.isfile(path):
+            return path
+    raise _Unresolvable(ref)
+
+
+class _Dependencies:
+    """The files and dirs one playbook run reads, beyond the ``roles/`` tree."""
+
+    def __init__(self, load: Callable[[str], Any], roles_path: str) -> None:
+        self.load = load
+        self.roles_path = roles_path
+        self.paths: set[str] = set()
+
+    def _parse(self, path: str) -> Any:
+        import yaml
+
+        try:
+            return self.load(path)
+        except (OSError, yaml.YAMLError) as exc:
+            raise _Unresolvable(path) from exc
+
+    def vars_dirs(self, base: str) -> None:
+        for name in _VARS_DIRS:
+            path = os.path.join(base, name)
+            if os.path.isdir(path):
+                self.paths.add(path)
+
+    def _role(self, ref: Any, playbook_dir: str) -> None:
+        if isinstance(ref, dict):
+            ref = ref.get("role") or ref.get("name")
+        if not isinstance(ref, str) or "{{" in ref:
+            raise _Unresolvable(ref)
+        if os.path.isdir(os.path.join(self.roles_path, ref)):
+            return
+        path = os.path.join(playbook_dir, "roles", ref)
+        if not os.path.isdir(path):
+            # A collection or other roles_path role: not ours to hash.
+            raise _Unresolvable(ref)
+        self.paths.add(path)
+
+    def tasks(self, tasks: Any, dirs: tuple[str, ...]) -> None:
+        """``dirs`` are where relative includes are looked up, in order."""
+        if not isinstance(tasks, list):
+            return
+        for task in tasks:
+            if not isinstance(task, dict):
+                continue
+            for section in ("block", "rescue", "always"):
+                self.tasks(task.get(section), dirs)
+            for action, arg in task.items():
+                if action in _ROLE_INCLUDES:
+                    self._role(arg, dirs[-1])
+                elif action in _TASK_INCLUDES or action in _VARS_INCLUDES:
+                    ref = arg.get("file") if isinstance(arg, dict) else arg
+                    path = _resolve(ref, dirs)
+                    if action in _TASK_INCLUDES and path not in self.paths:
+                        self.paths.add(path)
+                        self.tasks(self._parse(path), (os.path.dirname(path), *dirs))
+                    self.paths.add(path)
+
+    def playbook(self, playbook_path: str) -> None:
+        seen: set[str] = set()
+        for path, play in _plays(playbook_path, self._parse, seen):
+            base = os.path.dirname(path)
+            vars_files = play.get("vars_files") or []
+            if isinstance(vars_files, str):
+                vars_files = [vars_files]
+            # A nested list picks the first file found; _resolve refuses it.
+            for entry in vars_files:
+                self.paths.add(_resolve(entry, (base,)))
+            roles = play.get("roles")
+            for role in roles if isinstance(roles, list) else []:
+                self._role(role, base)
+            for section in _TASK_LISTS:
+                self.tasks(play.get(section), (base,))
+        for path in seen:
+            if not os.path.isfile(path):
+                raise _Unresolvable(path)
+            self.paths.add(path)
+            self.vars_dirs(os.path.dirname(path))
+
+
+def inventory_text(host_aliases: Iterable[str]) -> str:
+    """Inventory running every alias against the local connection."""
+    return "".join(f"{alias} ansible_connection=local\n" for alias in host_aliases)
+
+
+class ProjectIndex:
+    """
+    Session-wide index of the YAML a project's playbook runs read.
+
+    Playbooks and KIND configs are parsed once with the C YAML loader and
+    re-parsed only when their mtime or size changes, so repeated calls stop
+    paying for YAML. Inventories generated from play hosts are written once
+    per distinct content, into a directory removed by :meth:`close`.
+    """
+
+    def __init__(self) -> None:
+        self._docs: dict[str, tuple[tuple[int, int], Any]] = {}
+        self._inventories: dict[str, str] = {}
+        self._inventory_dir: str | None = None
+        self._lock = threading.Lock()
+        self.parses = 0
+        self.hits = 0
+
+    def load(self, path: str) -> Any:
+        """Parsed content of ``path``, cached until the file changes."""
+        st = os.stat(path)
+        key = os.path.abspath(path)
+        stamp = (st.st_mtime_ns, st.st_size)
+        with self._lock:
+            cached = self._docs.get(key)
+            if cached is not None and cached[0] == stamp:
+                self.hits += 1
+                return cached[1]
+        data = read_yaml(path)
+        with self._lock:
+            self._docs[key] = (stamp, data)
+            self.parses += 1
+        return data
+
+    def playbook(self, project_dir: str, playbook: str) -> str:
+        return _resolve_playbook_path(project_dir, playbook)
+
+    def play_hosts(self, playbook_path: str) -> list[str]:
+        return _extract_play_hosts(playbook_path, load=self.load)
+
+    def gathering_plays(self, playbook_path: str) -> int:
+        """
+        Number of plays in ``playbook_path`` (following ``import_playbook``)
+        that gather facts, i.e. do not set ``gather_facts`` to false.
+        """
+        return _count_gathering_plays(playbook_path, self.load, set())
+
+    def dependencies(
+        self, playbook_path: str, roles_path: str, inventory: str | None = None
+    ) -> list[str] | None:
+        """
+        Files and dirs a run of ``playbook_path`` reads besides ``roles_path``:
+        imported playbooks, ``vars_files``, included task and vars files,
+        roles found next to the playbook, and the ``group_vars``/``host_vars``
+        dirs next to the playbooks and ``inventory``. ``None`` if a reference
+        cannot be followed to a file, e.g. a templated path or a role from a
+        collection.
+        """
+        deps = _Dependencies(self.load, roles_path)
+        try:
+            deps.playbook(playbook_path)
+        except _Unresolvable:
+            return None
+        if inventory is not None:
+            deps.vars_dirs(os.path.dirname(os.path.abspath(inventory)))
+        return sorted(deps.paths)
+
+    def cluster_name(self, cfg_path: str | None) -> str:
+        return _derive_name_from_cfg(cfg_path, load=self.load)
+
+    def inventory(self, host_aliases: Iterable[str]) -> str:
+        """
+        Path of an inventory for ``host_aliases``. Identical host lists share
+        one file, keyed by a hash of its content; the caller must not remove it.
+        """
+        text = inventory_text(host_aliases)
+        digest = hashlib.sha256(text.encode("utf-8")).hexdigest()[:16]
+        with self._lock:
+            path = self._inventories.get(digest)
+            if path is not None and os.path.exists(path):
+                return path
+            if self._inventory_dir is None or not os.path.isdir(self._inventory_dir):
+                self._inventory_dir = tempfile.mkdtemp(prefix="kind-inv-")
+            path = os.path.join(self._inventory_dir, f"{digest}.ini")
+            tmp = f"{path}.tmp"
+            with open(tmp, "w", encoding="utf-8") as fh:
+                fh.write(text)
+            os.replace(tmp, path)
+            self._inventories[digest] = path
+            return path
+
+    def validate(
+        self,
+        project_dir: str,
+        playbooks: Iterable[str] = (),
+        configs: Iterable[str] = (),
+        inventories: Iterable[str] = (),
+    ) -> None:
+        """
+        Check that referenced files exist, without parsing them. Raises the
+        error the run itself would raise, before any cluster is created.
+        """
+        for playbook in playbooks:
+            self.playbook(project_dir, playbook)
+        for cfg in configs:
+            path = cfg if os.path.isabs(cfg) else os.path.join(project_dir, cfg)
+            if not os.path.exists(path):
+                raise KindConfigError("KIND config file not found", config_path=path)
+        for inventory in inventories:
+            _resolve_inventory_path(project_dir, inventory)
+
+    def close(self) -> None:
+        """Remove the generated inventories and forget parsed files."""
+        with self._lock:
+            inventory_dir, self._inventory_dir = self._inventory_dir, None
+            self._inventories.clear()
+            self._docs.clear()
+        if inventory_dir is not None:
+            shutil.rmtree(inventory_dir, ignore_errors=True)
+
+
+@dataclass
+class References:
+    """Literal file references made through ``kind_runner`` in test code."""
+
+    playbooks: list[str] = field(default_factory=list)
+    configs: list[str] = field(default_factory=list)
+    inventories: list[str] = field(default_factory=list)
+
+    def extend(self, other: References) -> None:
+        self.playbooks += other.playbooks
+        self.configs += other.configs
+        self.inventories += other.inventories
+
+
+_RUNNER_FIXTURES = frozenset({"kind_runner", "kind_matrix"})
+_SINGLE_CALLS = {None, "submit", "run_async", "run_matrix"}
+
+
+def _literal(node: ast.AST | None) -> str | None:
+    if isinstance(node, ast.Constant) and isinstance(node.value, str):
+        return node.value
+    return None
+
+
+def _runner_method(func: ast.AST) -> tuple[bool, str | None]:
+    if isinstance(func, ast.Name):
+        return func.id in _RUNNER_FIXTURES, None
+    if isinstance(func, ast.Attribute) and isinstance(func.value, ast.Name):
+        return func.value.id in _RUNNER_FIXTURES, func.attr
+    return False, None
+
+
+def _call_references(call: ast.Call) -> References | None:
+    is_runner, method = _runner_method(call.func)
+    if not is_runner or (method not in _SINGLE_CALLS and method != "run_many"):
+        return None
+    kwargs = {kw.arg: kw.value for kw in call.keywords if kw.arg}
+    if "project_dir" in kwargs:
+        # Relative paths depend on a value only known at run time.
+        return None
+
+    refs = References()
+    first = call.args[0] if call.args else None
+    if first is None:
+        first = kwargs.get("playbooks" if method == "run_many" else "playbook")
+    if method == "run_many":
+        if isinstance(first, (ast.List, ast.Tuple)):
+            for entry in first.elts:
+                if isinstance(entry, ast.Tuple) and entry.elts:
+                    entry = entry.elts[0]
+                if (path := _literal(entry)) is not None:
+                    refs.playbooks.append(path)
+    elif (path := _literal(first)) is not None:
+        refs.playbooks.append(path)
+    if (cfg := _literal(kwargs.get("kind_config"))) is not None:
+        refs.configs.append(cfg)
+    if method == "run_matrix":
+        configs = call.args[1] if len(call.args) > 1 else kwargs.get("kind_configs")
+        if isinstance(configs, (ast.List, ast.Tuple)):
+            refs.configs.extend(
+                cfg for entry in configs.elts if (cfg := _literal(entry)) is not None
+            )
+    if (inventory := _literal(kwargs.get("inventory_file"))) is not None:
+        refs.inventories.append(inventory)
+    if not (refs.playbooks or refs.configs or refs.inventories):
+        return None
+    return refs
+
+
+def scan_references(source: str) -> dict[str, References]:
+    """
+    Find literal playbook, KIND config and inventory paths passed to
+    ``kind_runner`` or ``kind_matrix`` in a test module's ``source``.
+
+    Keys are the enclosing function (``Class.test`` for methods), or ``""``
+    for module-level code. Only calls on those two names with string
+    literals are recognised; paths computed at run time are left alone.
+    """
+    found: dict[str, References] = {}
+
+    def visit(node: ast.AST, scope: str, prefix: str) -> None:
+        for child in ast.iter_child_nodes(node):
+            if isinstance(child, ast.ClassDef):
+                visit(child, scope, f"{prefix}{child.name}.")
+            elif isinstance(child, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                visit(child, scope or f"{prefix}{child.name}", prefix)
+            else:
+                if isinstance(child, ast.Call):
+                    refs = _call_references(child)
+                    if refs is not None:
+                        found.setdefault(scope, References()).extend(refs)
+                visit(child, scope, prefix)
+
+    visit(ast.parse(source), "", "")
+    return found
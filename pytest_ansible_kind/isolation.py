@@ -0,0 +1,179 @@
+from __future__ import annotations
+
+import hashlib
+import os
+import re
+import subprocess
+import threading
+from typing import Any
+
+from .exceptions import KindClusterError
+
+ISOLATION_MODES = ("none", "namespace")
+
+ISOLATION_LABEL = "pytest-ansible-kind/test"
+
+# Cluster-scoped kinds swept by label when a test's namespaces are removed.
+CLUSTER_SCOPED_KINDS = (
+    "clusterroles",
+    "clusterrolebindings",
+    "customresourcedefinitions",
+    "persistentvolumes",
+    "storageclasses",
+    "priorityclasses",
+    "mutatingwebhookconfigurations",
+    "validatingwebhookconfigurations",
+)
+
+
+def _kubectl(
+    args: list[str], kubeconfig: str, input: str | None = None
+) -> subprocess.CompletedProcess[str]:
+    cmd = ["kubectl", *args]
+    try:
+        return subprocess.run(
+            cmd,
+            check=True,
+            capture_output=True,
+            text=True,
+            input=input,
+            env={**os.environ, "KUBECONFIG": kubeconfig},
+        )
+    except subprocess.CalledProcessError as exc:
+        raise KindClusterError(
+            message="kubectl command failed",
+            cmd=exc.cmd,
+            returncode=exc.returncode,
+            stdout=exc.stdout,
+            stderr=exc.stderr,
+        ) from exc
+
+
+def nodeid_label(nodeid: str) -> str:
+    """Stable, label-safe id for a test node."""
+    return hashlib.sha1(nodeid.encode("utf-8")).hexdigest()[:16]
+
+
+def namespace_name(nodeid: str) -> str:
+    """
+    Namespace generated for ``nodeid``: a DNS-1123 label made of a readable
+    slug of the test name and a hash of the full node id.
+    """
+    test_name = nodeid.rsplit("::", 1)[-1]
+    slug = re.sub(r"[^a-z0-9]+", "-", test_name.lower()).strip("-")[:40]
+    return "-".join(p for p in ("kt", slug, nodeid_label(nodeid)[:8]) if p)
+
+
+class NamespaceIsolation:
+    """
+    Per-test namespaces as a cheap alternative to recreating the cluster.
+
+    The first playbook run of a test on a cluster creates the test's
+    namespace, labelled ``pytest-ansible-kind/test=<id>``. Its name and the
+    label are handed to playbooks as the ``kind_namespace`` and
+    ``kind_isolation_labels`` extravars. :meth:`cleanup` deletes the
+    namespaces and any cluster-scoped objects carrying the label without
+    waiting per object, then blocks once on a single watch-based
+    ``kubectl wait --for=delete`` until finalizers are done. Namespaces on
+    a cluster the plugin deletes or recreates went with it; subscribed to
+    the registry, :meth:`invalidate_cluster` forgets them.
+    """
+
+    def __init__(self, timeout: str = "120s") -> None:
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        # nodeid -> {kubeconfig: namespace}
+        self._created: dict[str, dict[str, str]] = {}
+        # kubeconfig -> cluster name
+        self._clusters: dict[str, str] = {}
+
+    def extravars(
+        self, nodeid: str, kubeconfig: str, cluster: str | None = None
+    ) -> dict[str, Any]:
+        """
+        Ensure the namespace for ``nodeid`` exists on the cluster behind
+        ``kubeconfig`` (named ``cluster``); return its extravars.
+        """
+        namespace = namespace_name(nodeid)
+        label = nodeid_label(nodeid)
+
+        with self._lock:
+            known = self._created.setdefault(nodeid, {})
+            created = kubeconfig in known
+            known[kubeconfig] = namespace
+            if cluster is not None:
+                self._clusters[kubeconfig] = cluster
+
+        if not created:
+            _kubectl(
+                ["apply", "-f", "-"],
+                kubeconfig,
+                input=(
+                    "apiVersion: v1\n"
+                    "kind: Namespace\n"
+                    "metadata:\n"
+                    f"  name: {namespace}\n"
+                    "  labels:\n"
+                    f"    {ISOLATION_LABEL}: {label}\n"
+                ),
+            )
+
+        return {
+            "kind_namespace": namespace,
+            "kind_isolation_labels": {ISOLATION_LABEL: label},
+        }
+
+    def invalidate_cluster(self, cluster: str) -> None:
+        """Forget the namespaces on ``cluster``, which was deleted or recreated."""
+        with self._lock:
+            gone = {kc for kc, name in self._clusters.items() if name == cluster}
+            for kubeconfig in gone:
+                del self._clusters[kubeconfig]
+            for known in self._created.values():
+                for kubeconfig in gone:
+                    known.pop(kubeconfig, None)
+
+    def cleanup(self, nodeid: str) -> None:
+        """Remove everything created for ``nodeid`` on every cluster it used."""
+        with self._lock:
+            created = self._created.pop(nodeid, {})
+
+        selector = f"{ISOLATION_LABEL}={nodeid_label(nodeid)}"
+        for kubeconfig, namespace in created.items():
+            _kubectl(
+                [
+                    "delete",
+                    "namespace",
+                    namespace,
+                    "--wait=false",
+                    "--ignore-not-found",
+                ],
+                kubeconfig,
+            )
+            _kubectl(
+                [
+                    "delete",
+                    ",".join(CLUSTER_SCOPED_KINDS),
+                    "-l",
+                    selector,
+                    "--wait=false",
+                    "--ignore-not-found",
+                ],
+                kubeconfig,
+            )
+
+        for kubeconfig, namespace in created.items():
+            try:
+                _kubectl(
+                    [
+                        "wait",
+                        "--for=delete",
+                        f"namespace/{namespace}",
+                        f"--timeout={self.timeout}",
+                    ],
+                    kubeconfig,
+                )
+            except KindClusterError as exc:
+                # kubectl wait fails with NotFound if deletion already finished.
+                if "not found" not in (exc.stderr or "").lower():
+                    raise
@@ -0,0 +1,154 @@
+from __future__ import annotations
+
+import json
+import os
+import tempfile
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from typing import Any, Callable, Iterator
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - non-POSIX platforms
+    fcntl = None  # type: ignore[assignment]
+
+_held = threading.local()
+
+
+def _lock_path(name: str) -> str:
+    return os.path.join(tempfile.gettempdir(), f"pytest-ansible-kind-{name}.lock")
+
+
+def _lease_path(name: str) -> str:
+    return os.path.join(tempfile.gettempdir(), f"pytest-ansible-kind-{name}.lease")
+
+
+@contextmanager
+def cluster_lock(name: str) -> Iterator[None]:
+    """
+    Hold an exclusive, cross-process lock for cluster ``name``.
+
+    Used to serialize create/check/delete sequences between pytest-xdist
+    workers (or separate pytest processes) that target the same cluster.
+    Workers using different clusters never contend. Re-entrant within a
+    thread, so lease bookkeeping can wrap cluster creation.
+    """
+    held: dict[str, int] = _held.__dict__.setdefault("names", {})
+    if fcntl is None or held.get(name):
+        held[name] = held.get(name, 0) + 1
+        try:
+            yield
+        finally:
+            held[name] -= 1
+        return
+
+    with open(_lock_path(name), "a", encoding="utf-8") as fh:
+        fcntl.flock(fh.fileno(), fcntl.LOCK_EX)
+        held[name] = 1
+        try:
+            yield
+        finally:
+            held[name] = 0
+            fcntl.flock(fh.fileno(), fcntl.LOCK_UN)
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class LeaseManager:
+    """
+    Reference-count the processes using each cluster.
+
+    Every :class:`~pytest_ansible_kind.registry.ClusterRegistry` holds at
+    most one lease per cluster, recorded (with its pid) in
+    ``pytest-ansible-kind-<name>.lease`` in the temp dir, next to the
+    cluster's lock file. Leases of processes that died are pruned whenever
+    the file is touched. All reads and writes happen under
+    :func:`cluster_lock`, so a cluster is only deleted by the last holder
+    and never while another process is about to reuse it.
+    """
+
+    def __init__(self, holder: str | None = None) -> None:
+        self.holder = holder or f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        self._held: set[str] = set()
+        self._lock = threading.Lock()
+
+    def _read(self, name: str) -> dict[str, dict[str, Any]]:
+        try:
+            with open(_lease_path(name), "r", encoding="utf-8") as fh:
+                holders = json.load(fh).get("holders") or {}
+        except (OSError, ValueError):
+            return {}
+        return {h: v for h, v in holders.items() if _pid_alive(int(v.get("pid", 0)))}
+
+    def _write(self, name: str, holders: dict[str, dict[str, Any]]) -> None:
+        path = _lease_path(name)
+        if not holders:
+            try:
+                os.unlink(path)
+            except FileNotFoundError:
+                pass
+            return
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as fh:
+            json.dump({"holders": holders}, fh, indent=2, sort_keys=True)
+        os.replace(tmp, path)
+
+    def holders(self, name: str) -> list[str]:
+        """Live holders of ``name``."""
+        with cluster_lock(name):
+            return sorted(self._read(name))
+
+    def acquire(self, name: str, ensure: Callable[[], bool]) -> bool:
+        """
+        Run ``ensure`` (create-or-reuse) and take a lease on ``name`` as one
+        step under the cluster lock. Returns what ``ensure`` returned.
+        """
+        with cluster_lock(name):
+            created = ensure()
+            with self._lock:
+                held = name in self._held
+            if not held:
+                holders = self._read(name)
+                holders[self.holder] = {"pid": os.getpid(), "since": time.time()}
+                self._write(name, holders)
+                with self._lock:
+                    self._held.add(name)
+            return created
+
+    def release(self, name: str, delete: Callable[[], None]) -> bool:
+        """
+        Drop this holder's lease on ``name`` and run ``delete`` if no live
+        holder is left. Returns True if the cluster was deleted.
+        """
+        with cluster_lock(name):
+            holders = self._read(name)
+            holders.pop(self.holder, None)
+            with self._lock:
+                self._held.discard(name)
+            self._write(name, holders)
+            if holders:
+                return False
+            delete()
+            return True
+
+    def release_all(self) -> None:
+        """Give up every lease without deleting anything (session end)."""
+        with self._lock:
+            names = list(self._held)
+        for name in names:
+            with cluster_lock(name):
+                holders = self._read(name)
+                holders.pop(self.holder, None)
+                self._write(name, holders)
+            with self._lock:
+                self._held.discard(name)
@@ -1,15 +1,73 @@
 from __future__ import annotations
 
+import glob
+import os
+import tempfile
+from pathlib import Path
 from typing import Generator
 
 import pytest
 
-from .runner import KindRunner, kind_session
+from .artifacts import RETENTION_MODES, ArtifactStore
+from .cache import PlaybookCache
+from .clients import ApiClientPool
+from .exceptions import KindError
+from .facts import FACT_CACHE_MODES, FactCache
+from .images import ImageLoader
+from .index import ProjectIndex, References, scan_references
+from .isolation import ISOLATION_MODES, NamespaceIsolation, namespace_name
+from .matrix import KindMatrix
+from .output import OUTPUT_MODES
+from .profiling import TaskProfiler
+from .providers import PROVIDERS
+from .tracing import PhaseTracer, read_chrome_trace, write_chrome_trace
+from .workers import AnsibleWorkerPool
+from .provision import ClusterProvisioner
+from .registry import SHUTDOWN_POLICIES, ClusterRegistry
+from .runner import KindRunner, _cluster_name, kind_session
 from .utilities import (
+    _parse_bool,
+    bool_option,
+    default_kind_config,
     default_kind_config_from_pytest,
+    kind_config_from_marker,
+    matrix_configs_from_marker,
+    resolve_ansible_workers,
+    resolve_api_pool_maxsize,
+    resolve_artifacts,
+    resolve_cluster_name_suffix,
+    resolve_fact_cache,
+    resolve_images,
+    resolve_isolation,
+    resolve_output,
+    resolve_project_dir,
     resolve_project_dir_and_shutdown,
+    resolve_provider,
+    resolve_snapshot,
+    worker_output_path,
+    xdist_worker_id,
 )
 
+registry_key = pytest.StashKey[ClusterRegistry]()
+playbook_cache_key = pytest.StashKey[PlaybookCache]()
+provisioner_key = pytest.StashKey[ClusterProvisioner]()
+profiler_key = pytest.StashKey[TaskProfiler]()
+tracer_key = pytest.StashKey[PhaseTracer]()
+isolation_key = pytest.StashKey[NamespaceIsolation]()
+image_loader_key = pytest.StashKey[ImageLoader]()
+api_clients_key = pytest.StashKey[ApiClientPool]()
+index_key = pytest.StashKey[ProjectIndex]()
+artifacts_key = pytest.StashKey[ArtifactStore]()
+facts_key = pytest.StashKey[FactCache]()
+workers_key = pytest.StashKey[AnsibleWorkerPool]()
+reference_error_key = pytest.StashKey[KindError]()
+
+
+def pytest_addhooks(pluginmanager: pytest.PytestPluginManager) -> None:
+    from . import hooks
+
+    pluginmanager.add_hookspecs(hooks)
+
 
 def pytest_addoption(parser: pytest.Parser) -> None:
     parser.addini(
@@ -19,7 +77,8 @@ def pytest_addoption(parser: pytest.Parser) -> None:
     )
     parser.addini(
         "kind_shutdown",
-        "Shutdown KIND cluster when tests complete (true/false).",
+        "When to delete clusters: call, module, session or never. true means "
+        "session (once the last user is done), false means never.",
         default="false",
     )
     parser.addini(
@@ -27,6 +86,120 @@ def pytest_addoption(parser: pytest.Parser) -> None:
         "Base project dir containing roles/ and tests/. If empty, inferred from test path.",
         default="",
     )
+    parser.addini(
+        "kind_provider",
+        "Where clusters come from: kind (created with the kind CLI), kubeconfig "
+        "(an existing cluster) or fake (in-process, for tests).",
+        default="kind",
+    )
+    parser.addini(
+        "kind_kubeconfig",
+        "Kubeconfig used by the kubeconfig provider. Empty means $KUBECONFIG "
+        "or ~/.kube/config.",
+        default="",
+    )
+    parser.addini(
+        "kind_context",
+        "Context the kubeconfig provider selects. Empty keeps current-context.",
+        default="",
+    )
+    parser.addini(
+        "kind_xdist_isolation",
+        "Give each pytest-xdist worker its own KIND cluster (true/false).",
+        default="false",
+    )
+    parser.addini(
+        "kind_playbook_cache",
+        "Skip playbook runs whose content, inputs and target cluster are unchanged "
+        "since a previous successful run (true/false).",
+        default="false",
+    )
+    parser.addini(
+        "kind_preprovision",
+        "Create every cluster the session needs in parallel right after "
+        "collection instead of on first use (true/false).",
+        default="false",
+    )
+    parser.addini(
+        "kind_fact_cache",
+        "Share gathered Ansible facts between playbook runs on the same cluster: "
+        "none, session (for this run) or persistent (kept in the pytest cache).",
+        default="none",
+    )
+    parser.addini(
+        "kind_output",
+        "Playbook output: full, summary (failures and recap), on-failure or silent.",
+        default="full",
+    )
+    parser.addini(
+        "kind_output_tail",
+        "Number of trailing output lines attached to PlaybookFailedError.",
+        default="200",
+    )
+    parser.addini(
+        "kind_artifacts",
+        "Keep ansible-runner artifacts as compressed per-test archives: never, "
+        "on-failure or always.",
+        default="never",
+    )
+    parser.addini(
+        "kind_artifacts_dir",
+        "Where kept artifact archives go (relative to rootpath). Empty uses the "
+        "pytest cache dir.",
+        default="",
+    )
+    parser.addini(
+        "kind_artifacts_max_size",
+        "Total size of kept artifact archives (e.g. 500M, 2G); the oldest are "
+        "evicted beyond it. Empty or 0 means no limit.",
+        default="1G",
+    )
+    parser.addini(
+        "kind_api_pool_maxsize",
+        "Connections kept per cluster by the shared kubernetes ApiClient. "
+        "Empty uses the kubernetes client default.",
+        default="",
+    )
+    parser.addini(
+        "kind_images",
+        "Docker images or image archives (.tar, .tar.gz, .tgz) to load into every "
+        "cluster after creation. Archive paths are relative to rootpath.",
+        type="linelist",
+        default=[],
+    )
+    parser.addini(
+        "kind_snapshot",
+        "Resource types (e.g. v1/configmaps, apps/v1/deployments) listed before "
+        "and after every playbook run; the runner's last_diff holds what the "
+        "calling thread's last run changed.",
+        type="linelist",
+        default=[],
+    )
+    parser.addini(
+        "kind_ansible_workers",
+        "Run playbooks on N pre-forked workers per project that keep ansible "
+        "imported, instead of a fresh ansible-playbook per run. 0 disables.",
+        default="0",
+    )
+    parser.addini(
+        "kind_validate_references",
+        "Check literal playbook, KIND config and inventory paths passed to "
+        "kind_runner at collection time, failing bad ones before any cluster "
+        "is created (true/false). Off by default: a test may expect a path to "
+        "be missing or create the file itself.",
+        default="false",
+    )
+    parser.addini(
+        "kind_isolation",
+        "Per-test isolation: none, or namespace (a fresh namespace per test, "
+        "deleted at teardown).",
+        default="none",
+    )
+    parser.addini(
+        "kind_isolation_timeout",
+        "How long teardown waits for a test's namespaces to finish deleting.",
+        default="120s",
+    )
 
     group = parser.getgroup("kind")
     group.addoption(
@@ -37,9 +210,20 @@ def pytest_addoption(parser: pytest.Parser) -> None:
     )
     group.addoption(
         "--kind-shutdown",
-        action="store_false",
+        action="store_const",
+        const="session",
         default=None,
-        help="Shutdown KIND cluster when tests complete. Overrides [pytest] kind_shutdown.",
+        help="Delete clusters once the session ends. Overrides [pytest] "
+        "kind_shutdown.",
+    )
+    group.addoption(
+        "--kind-shutdown-policy",
+        action="store",
+        default=None,
+        choices=SHUTDOWN_POLICIES,
+        metavar="POLICY",
+        help="When to delete clusters: call, module, session or never. "
+        "Overrides --kind-shutdown and [pytest] kind_shutdown.",
     )
     group.addoption(
         "--kind-project-dir",
@@ -47,6 +231,446 @@ def pytest_addoption(parser: pytest.Parser) -> None:
         default=None,
         help="Ansible project dir containing roles/ and tests/. Overrides [pytest] kind_project_dir.",
     )
+    group.addoption(
+        "--kind-provider",
+        action="store",
+        default=None,
+        choices=PROVIDERS,
+        help="Cluster provider. Overrides [pytest] kind_provider.",
+    )
+    group.addoption(
+        "--kind-xdist-isolation",
+        action="store_true",
+        default=None,
+        help="Suffix cluster names with the xdist worker id so workers never share a "
+        "cluster. Overrides [pytest] kind_xdist_isolation.",
+    )
+    group.addoption(
+        "--kind-playbook-cache",
+        action="store_true",
+        default=None,
+        help="Reuse results of unchanged playbook runs from the pytest cache. "
+        "Overrides [pytest] kind_playbook_cache.",
+    )
+    group.addoption(
+        "--kind-preprovision",
+        action="store_true",
+        default=None,
+        help="Create needed clusters concurrently after collection. "
+        "Overrides [pytest] kind_preprovision.",
+    )
+    group.addoption(
+        "--kind-fact-cache",
+        action="store",
+        default=None,
+        choices=FACT_CACHE_MODES,
+        help="Ansible fact cache mode. Overrides [pytest] kind_fact_cache.",
+    )
+    group.addoption(
+        "--kind-output",
+        action="store",
+        default=None,
+        choices=OUTPUT_MODES,
+        help="How much playbook output to show. Overrides [pytest] kind_output.",
+    )
+    group.addoption(
+        "--kind-artifacts",
+        action="store",
+        default=None,
+        choices=RETENTION_MODES,
+        help="Which runs' ansible artifacts to keep. Overrides [pytest] "
+        "kind_artifacts.",
+    )
+    group.addoption(
+        "--kind-artifacts-dir",
+        action="store",
+        default=None,
+        metavar="DIR",
+        help="Directory for kept artifact archives. Overrides [pytest] "
+        "kind_artifacts_dir.",
+    )
+    group.addoption(
+        "--kind-isolation",
+        action="store",
+        default=None,
+        choices=ISOLATION_MODES,
+        help="Per-test isolation mode. Overrides [pytest] kind_isolation.",
+    )
+    group.addoption(
+        "--kind-ansible-workers",
+        action="store",
+        type=int,
+        default=None,
+        metavar="N",
+        help="Keep N warm ansible-playbook workers per project (0 disables). "
+        "Overrides [pytest] kind_ansible_workers.",
+    )
+    group.addoption(
+        "--kind-profile",
+        action="store_true",
+        default=False,
+        help="Time every Ansible task and list the slowest tasks and roles in "
+        "the terminal summary.",
+    )
+    group.addoption(
+        "--kind-profile-top",
+        action="store",
+        type=int,
+        default=10,
+        metavar="N",
+        help="How many tasks and roles --kind-profile lists (default 10).",
+    )
+    group.addoption(
+        "--kind-profile-json",
+        action="store",
+        default=None,
+        metavar="PATH",
+        help="Write per-task, per-role and per-playbook timings as JSON to PATH.",
+    )
+    group.addoption(
+        "--kind-durations",
+        action="store_true",
+        default=False,
+        help="Time each KindRunner phase (cluster checks, creation, ansible run, ...) "
+        "and show totals plus the slowest phases.",
+    )
+    group.addoption(
+        "--kind-durations-top",
+        action="store",
+        type=int,
+        default=10,
+        metavar="N",
+        help="How many phases --kind-durations lists (default 10).",
+    )
+    group.addoption(
+        "--kind-trace",
+        action="store",
+        default=None,
+        metavar="PATH",
+        help="Write KindRunner phases to PATH as a Chrome trace-event file "
+        "(chrome://tracing, Perfetto). xdist workers are merged into one file.",
+    )
+
+
+def pytest_configure(config: pytest.Config) -> None:
+    config.addinivalue_line(
+        "markers",
+        "kind_cluster(config): declare the KIND config a test needs, so it can be "
+        "pre-provisioned. On a module it also sets the kind_runner default config.",
+    )
+    config.addinivalue_line(
+        "markers",
+        "kind_images(*images): docker images or image archives to load into the "
+        "module's cluster, in addition to the kind_images ini list.",
+    )
+    config.addinivalue_line(
+        "markers",
+        "kind_matrix(*configs): KIND configs the kind_matrix fixture runs "
+        "playbooks on, one cluster each, all in parallel.",
+    )
+    config.addinivalue_line(
+        "markers",
+        "kind_snapshot(*types): resource types the module's kind_runner diffs "
+        "around each playbook run, in addition to the kind_snapshot ini list.",
+    )
+
+    # Reject bad kind_snapshot entries at startup, not in every module.
+    resolve_snapshot(config, None)
+    registry = ClusterRegistry(provider=resolve_provider(config))
+    config.stash[registry_key] = registry
+
+    api_clients = ApiClientPool(pool_maxsize=resolve_api_pool_maxsize(config))
+    registry.subscribe(api_clients.invalidate_cluster)
+    config.stash[api_clients_key] = api_clients
+    config.stash[index_key] = ProjectIndex()
+
+    tracer: PhaseTracer | None = None
+    if config.getoption("kind_durations") or config.getoption("kind_trace"):
+        tracer = PhaseTracer()
+        tracer.subscribe(lambda span: config.hook.pytest_kind_phase(span=span))
+        config.stash[tracer_key] = tracer
+
+    pytest_cache = getattr(config, "cache", None)
+    if pytest_cache is not None:
+        # Created on the first image load, not in every run using the plugin.
+        image_loader = ImageLoader(
+            lambda: pytest_cache.mkdir("pytest-ansible-kind-images")
+        )
+    else:
+        image_loader = ImageLoader(
+            Path(tempfile.gettempdir()) / "pytest-ansible-kind-images"
+        )
+    registry.subscribe(image_loader.invalidate_cluster)
+    config.stash[image_loader_key] = image_loader
+
+    retention, artifacts_dir, max_bytes = resolve_artifacts(config)
+    if retention != "never" and artifacts_dir is None:
+        if pytest_cache is not None:
+            artifacts_dir = pytest_cache.mkdir("pytest-ansible-kind-artifacts")
+        else:
+            artifacts_dir = (
+                Path(tempfile.gettempdir()) / "pytest-ansible-kind-artifacts"
+            )
+    config.stash[artifacts_key] = ArtifactStore(
+        artifacts_dir, retention=retention, max_bytes=max_bytes
+    )
+
+    if bool_option(config, "kind_preprovision"):
+        config.stash[provisioner_key] = ClusterProvisioner(
+            registry, tracer=tracer, image_loader=image_loader
+        )
+
+    if resolve_isolation(config) == "namespace":
+        timeout = (config.getini("kind_isolation_timeout") or "120s").strip()
+        isolation = NamespaceIsolation(timeout=timeout)
+        registry.subscribe(isolation.invalidate_cluster)
+        config.stash[isolation_key] = isolation
+
+    if config.getoption("kind_profile") or config.getoption("kind_profile_json"):
+        config.stash[profiler_key] = TaskProfiler()
+
+    fact_cache_mode = resolve_fact_cache(config)
+    if fact_cache_mode != "none":
+        facts_dir: Path | None = None
+        if fact_cache_mode == "persistent":
+            if pytest_cache is not None:
+                facts_dir = pytest_cache.mkdir("pytest-ansible-kind-facts")
+            else:
+                facts_dir = Path(tempfile.gettempdir()) / "pytest-ansible-kind-facts"
+        facts = FactCache(facts_dir)
+        registry.subscribe(facts.invalidate_cluster)
+        config.stash[facts_key] = facts
+
+    ansible_workers = resolve_ansible_workers(config)
+    if ansible_workers:
+        config.stash[workers_key] = AnsibleWorkerPool(ansible_workers)
+
+    if bool_option(config, "kind_playbook_cache") and pytest_cache is not None:
+        cache = PlaybookCache(pytest_cache.mkdir("pytest-ansible-kind-playbooks"))
+        registry.subscribe(cache.invalidate_cluster)
+        config.stash[playbook_cache_key] = cache
+
+
+def pytest_collection_modifyitems(
+    session: pytest.Session, config: pytest.Config, items: list[pytest.Item]
+) -> None:
+    """Validate the files tests refer to, so bad paths fail before setup."""
+    if not _parse_bool(config.getini("kind_validate_references"), "false"):
+        return
+
+    index = config.stash[index_key]
+    modules: dict[Path, tuple[str, dict[str, References]] | None] = {}
+    for item in items:
+        if "kind_runner" not in getattr(item, "fixturenames", ()):
+            continue
+        path = Path(str(item.path))
+        if path not in modules:
+            modules[path] = _module_references(config, path)
+        if modules[path] is None:
+            continue
+        project_dir, found = modules[path]
+
+        refs = References()
+        refs.extend(found.get("", References()))
+        cls = getattr(item, "cls", None)
+        name = getattr(item, "originalname", item.name)
+        scope = f"{cls.__qualname__}.{name}" if cls is not None else name
+        refs.extend(found.get(scope, References()))
+        marker_cfg = kind_config_from_marker(
+            item.get_closest_marker("kind_cluster"), project_dir
+        )
+        if marker_cfg:
+            refs.configs.append(marker_cfg)
+        refs.configs += matrix_configs_from_marker(
+            item.get_closest_marker("kind_matrix"), project_dir
+        )
+        try:
+            index.validate(project_dir, refs.playbooks, refs.configs, refs.inventories)
+        except KindError as exc:
+            item.stash[reference_error_key] = exc
+
+
+def _module_references(
+    config: pytest.Config, path: Path
+) -> tuple[str, dict[str, References]] | None:
+    try:
+        project_dir = resolve_project_dir(config, path)
+        source = path.read_text(encoding="utf-8")
+        return project_dir, scan_references(source)
+    except (KindError, OSError, SyntaxError, ValueError):
+        return None
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_runtest_setup(item: pytest.Item) -> None:
+    """Fail tests with a broken file reference before any cluster work."""
+    error = item.stash.get(reference_error_key, None)
+    if error is not None:
+        raise error
+
+
+def pytest_collection_finish(session: pytest.Session) -> None:
+    """Start creating every cluster the collected tests need, in parallel."""
+    config = session.config
+    provisioner = config.stash.get(provisioner_key, None)
+    if provisioner is None or config.option.collectonly:
+        return
+
+    suffix = resolve_cluster_name_suffix(config)
+    default_cfg = default_kind_config(config)
+    index = config.stash[index_key]
+    project_dirs: dict[Path, str] = {}
+
+    for item in session.items:
+        marker = item.get_closest_marker("kind_cluster")
+        if marker is None and "kind_runner" not in getattr(item, "fixturenames", ()):
+            continue
+        try:
+            path = Path(str(item.path))
+            if path not in project_dirs:
+                project_dirs[path] = resolve_project_dir(config, path)
+            marker_cfg = kind_config_from_marker(marker, project_dirs[path])
+            cfg_paths: list[str | None] = [marker_cfg or default_cfg]
+            if "kind_matrix" in getattr(item, "fixturenames", ()):
+                # A matrix test needs its matrix clusters, not the default.
+                cfg_paths = [marker_cfg] if marker_cfg else []
+                cfg_paths += matrix_configs_from_marker(
+                    item.get_closest_marker("kind_matrix"), project_dirs[path]
+                )
+            names = [_cluster_name(c, suffix=suffix, index=index) for c in cfg_paths]
+            images = resolve_images(
+                config, item.get_closest_marker("kind_images"), project_dirs[path]
+            )
+        except KindError:
+            # Leave it to the test itself to report the problem.
+            continue
+        for name, cfg_path in zip(names, cfg_paths):
+            provisioner.submit(
+                name, cfg_path=cfg_path, use_name_arg=bool(suffix), images=images
+            )
+
+
+@pytest.hookimpl(trylast=True)
+def pytest_runtest_teardown(item: pytest.Item) -> None:
+    """Drop the namespaces (and labelled objects) the test created."""
+    isolation = item.config.stash.get(isolation_key, None)
+    if isolation is not None:
+        isolation.cleanup(item.nodeid)
+
+
+def pytest_sessionfinish(session: pytest.Session) -> None:
+    config = session.config
+    profiler = config.stash.get(profiler_key, None)
+    json_path = config.getoption("kind_profile_json")
+    if profiler is not None and json_path:
+        profiler.write_json(worker_output_path(json_path))
+
+    trace_path = config.getoption("kind_trace")
+    tracer = config.stash.get(tracer_key, None)
+    if tracer is not None and trace_path:
+        _write_trace(tracer, trace_path)
+
+
+def _write_trace(tracer: PhaseTracer, path: str) -> None:
+    """
+    Write this process' spans. xdist workers write ``<path>.<worker>``
+    fragments, which the controller folds into ``path`` once they finish.
+    """
+    worker = xdist_worker_id()
+    events = tracer.chrome_events(process_name=worker or "pytest")
+    if worker:
+        write_chrome_trace(worker_output_path(path), events)
+        return
+
+    for fragment in sorted(glob.glob(f"{glob.escape(path)}.gw*")):
+        events.extend(read_chrome_trace(fragment))
+        os.unlink(fragment)
+    write_chrome_trace(path, events)
+
+
+def pytest_unconfigure(config: pytest.Config) -> None:
+    provisioner = config.stash.get(provisioner_key, None)
+    if provisioner is not None:
+        provisioner.shutdown()
+    api_clients = config.stash.get(api_clients_key, None)
+    if api_clients is not None:
+        api_clients.close()
+    registry = config.stash.get(registry_key, None)
+    if registry is not None:
+        registry.close()
+    index = config.stash.get(index_key, None)
+    if index is not None:
+        index.close()
+    artifacts = config.stash.get(artifacts_key, None)
+    if artifacts is not None:
+        artifacts.close()
+    facts = config.stash.get(facts_key, None)
+    if facts is not None:
+        facts.close()
+    workers = config.stash.get(workers_key, None)
+    if workers is not None:
+        workers.close()
+
+
+def pytest_terminal_summary(
+    terminalreporter: pytest.TerminalReporter, config: pytest.Config
+) -> None:
+    profiler = config.stash.get(profiler_key, None)
+    top_n = config.getoption("kind_profile_top")
+    if (
+        profiler is not None
+        and config.getoption("kind_profile")
+        and top_n > 0
+        and profiler.tasks
+    ):
+        terminalreporter.write_sep("-", "kind profile")
+        for line in profiler.summary_lines(top_n):
+            terminalreporter.write_line(line)
+
+    tracer = config.stash.get(tracer_key, None)
+    top_n = config.getoption("kind_durations_top")
+    if (
+        tracer is not None
+        and config.getoption("kind_durations")
+        and top_n > 0
+        and tracer.spans
+    ):
+        terminalreporter.write_sep("-", "kind durations")
+        for line in tracer.summary_lines(top_n):
+            terminalreporter.write_line(line)
+
+    artifacts = config.stash.get(artifacts_key, None)
+    if artifacts is not None and artifacts.archived:
+        terminalreporter.write_line(
+            f"kind: kept {len(artifacts.archived)} artifact archives in "
+            f"{artifacts.root}"
+            + (f" ({artifacts.evicted} older evicted)" if artifacts.evicted else "")
+        )
+
+    facts = config.stash.get(facts_key, None)
+    if facts is not None and (facts.gathered or facts.skipped):
+        terminalreporter.write_line(facts.summary_line())
+
+    workers = config.stash.get(workers_key, None)
+    if workers is not None:
+        for error in workers.errors.values():
+            terminalreporter.write_line(
+                f"kind: ran ansible-playbook without workers: {error}"
+            )
+
+    registry = config.stash.get(registry_key, None)
+    if registry is None or config.option.verbose <= 0:
+        return
+    if registry.subprocesses_avoided:
+        terminalreporter.write_line(
+            f"kind: cluster registry avoided {registry.subprocesses_avoided} "
+            "kind subprocess calls"
+        )
+    cache = config.stash.get(playbook_cache_key, None)
+    if cache is not None and (cache.hits or cache.misses):
+        terminalreporter.write_line(
+            f"kind: playbook cache {cache.hits} hits, {cache.misses} misses"
+        )
 
 
 @pytest.fixture(scope="module")
@@ -59,13 +683,86 @@ def kind_runner(request: pytest.FixtureRequest) -> Generator[KindRunner, None, N
       location of the test file.
     - Shutdown defaults to false unless enabled via CLI or ini.
     - KIND config (if provided via CLI/ini) is resolved relative to rootpath.
+    - A module-level ``kind_cluster`` marker overrides the CLI/ini config.
+    - Images from the ``kind_images`` ini list and marker are loaded into the
+      cluster once per cluster generation.
+    - The returned ApiClient is shared per cluster for the whole session.
+    - Playbooks and KIND configs are parsed once per session and generated
+      inventories are shared (see ``ProjectIndex``).
+    - Ansible artifacts are kept according to ``kind_artifacts``.
+    - With ``kind_fact_cache`` enabled, gathered facts are reused per cluster.
+    - Resource types from the ``kind_snapshot`` ini list and marker are
+      diffed around each run into ``kind_runner.last_diff`` (per thread).
+    - With ``kind_ansible_workers`` set, playbooks run on warm pre-forked
+      ansible-playbook workers.
+    - With xdist isolation enabled, cluster names get the worker id appended.
     """
     project_dir, shutdown = resolve_project_dir_and_shutdown(request)
-    kind_cfg = default_kind_config_from_pytest(request)
+    kind_cfg = kind_config_from_marker(
+        request.node.get_closest_marker("kind_cluster"), project_dir
+    ) or default_kind_config_from_pytest(request)
+    output, output_tail = resolve_output(request.config)
+    images = resolve_images(
+        request.config, request.node.get_closest_marker("kind_images"), project_dir
+    )
 
     with kind_session(
         project_dir=project_dir,
         shutdown=shutdown,
         kind_cfg=kind_cfg,
+        name_suffix=resolve_cluster_name_suffix(request.config),
+        registry=request.config.stash[registry_key],
+        playbook_cache=request.config.stash.get(playbook_cache_key, None),
+        provisioner=request.config.stash.get(provisioner_key, None),
+        output=output,
+        output_tail=output_tail,
+        profiler=request.config.stash.get(profiler_key, None),
+        tracer=request.config.stash.get(tracer_key, None),
+        isolation=request.config.stash.get(isolation_key, None),
+        images=images,
+        image_loader=request.config.stash[image_loader_key],
+        api_clients=request.config.stash[api_clients_key],
+        index=request.config.stash[index_key],
+        artifacts=request.config.stash[artifacts_key],
+        facts=request.config.stash.get(facts_key, None),
+        snapshot=resolve_snapshot(
+            request.config, request.node.get_closest_marker("kind_snapshot")
+        ),
+        workers=request.config.stash.get(workers_key, None),
     ) as runner:
         yield runner
+
+
+@pytest.fixture
+def kind_matrix(request: pytest.FixtureRequest, kind_runner: KindRunner) -> KindMatrix:
+    """
+    The module's ``kind_runner`` bound to the KIND configs of the test's
+    ``kind_matrix`` marker. Calling it with a playbook provisions one
+    cluster per config concurrently, runs the playbook on all of them in
+    parallel and returns a ``MatrixRun`` (cluster, API client, error,
+    seconds, diff) per config.
+
+    The test is not parametrized per cluster: it stays one test item, so
+    that the clusters can run side by side within it. A failing cluster
+    therefore fails the whole test, with the first failure in config order
+    raised once every run has finished. With ``raise_on_error=False`` the
+    call returns instead, and each ``MatrixRun.error`` says how its cluster
+    fared.
+    """
+    marker = request.node.get_closest_marker("kind_matrix")
+    if marker is None or not marker.args:
+        raise pytest.UsageError(
+            f"{request.node.nodeid}: kind_matrix needs a "
+            "@pytest.mark.kind_matrix(...) marker listing KIND configs"
+        )
+    return KindMatrix(kind_runner, [str(cfg) for cfg in marker.args])
+
+
+@pytest.fixture
+def kind_namespace(request: pytest.FixtureRequest) -> str:
+    """
+    Name of the namespace generated for the current test when
+    ``kind_isolation = namespace``; the same value playbooks receive as the
+    ``kind_namespace`` extravar.
+    """
+    return namespace_name(request.node.nodeid)
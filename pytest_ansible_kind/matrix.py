@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from kubernetes import client
+
+    from .runner import KindRunner
+    from .snapshot import ClusterDiff
+
+
+@dataclass
+class MatrixRun:
+    """Outcome of one playbook run of a cluster matrix."""
+
+    kind_config: str
+    cluster: str
+    seconds: float
+    api_client: client.ApiClient | None = None
+    error: BaseException | None = None
+    diff: ClusterDiff | None = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+class KindMatrix:
+    """
+    A ``KindRunner`` bound to a list of KIND configs, one cluster per
+    config. Calling it runs a playbook on every cluster at once (see
+    :meth:`KindRunner.run_matrix`) and returns the runs by config.
+    """
+
+    def __init__(self, runner: KindRunner, kind_configs: list[str]) -> None:
+        self.runner = runner
+        self.kind_configs = list(kind_configs)
+
+    def __call__(
+        self, playbook: str, *, raise_on_error: bool = True, **kwargs: Any
+    ) -> dict[str, MatrixRun]:
+        return self.runner.run_matrix(
+            playbook, self.kind_configs, raise_on_error=raise_on_error, **kwargs
+        )
+
+    def __len__(self) -> int:
+        return len(self.kind_configs)
@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+import sys
+from collections import deque
+from typing import Any
+
+OUTPUT_MODES = ("full", "summary", "on-failure", "silent")
+
+# Events whose output is still shown in "summary" mode.
+_SUMMARY_EVENTS = frozenset(
+    {
+        "runner_on_failed",
+        "runner_on_unreachable",
+        "playbook_on_stats",
+    }
+)
+
+
+class OutputPipeline:
+    """
+    Event handler that buffers ansible output for one playbook run.
+
+    Modes:
+
+    - ``full``: everything is written, in batches of ``batch_size`` lines.
+    - ``summary``: only failed/unreachable tasks and the play recap.
+    - ``on-failure``: nothing while running; the tail is written on failure.
+    - ``silent``: nothing is written.
+
+    In every mode the last ``tail_lines`` lines are kept in a ring buffer and
+    available from :meth:`tail`, e.g. for ``PlaybookFailedError.output``.
+    """
+
+    def __init__(
+        self, mode: str = "full", tail_lines: int = 200, batch_size: int = 64
+    ) -> None:
+        if mode not in OUTPUT_MODES:
+            expected = ", ".join(OUTPUT_MODES)
+            raise ValueError(f"Unknown output mode {mode!r}; expected {expected}")
+        self.mode = mode
+        self.batch_size = batch_size
+        self._tail: deque[str] = deque(maxlen=tail_lines)
+        self._pending: list[str] = []
+
+    def __call__(self, event: dict[str, Any]) -> None:
+        stdout = event.get("stdout")
+        if not stdout:
+            return
+        lines = stdout.splitlines()
+        self._tail.extend(lines)
+
+        if self.mode == "full" or (
+            self.mode == "summary"
+            and event.get("event") in _SUMMARY_EVENTS
+            and not (event.get("event_data") or {}).get("ignore_errors")
+        ):
+            self._pending.extend(lines)
+            if len(self._pending) >= self.batch_size:
+                self.flush()
+
+    def flush(self) -> None:
+        if not self._pending:
+            return
+        out = sys.stdout
+        out.write("\n".join(self._pending) + "\n")
+        out.flush()
+        self._pending.clear()
+
+    def finish(self, failed: bool) -> None:
+        """Write whatever is still buffered at the end of a run."""
+        if failed and self.mode == "on-failure":
+            self._pending = list(self._tail)
+        self.flush()
+
+    def tail(self) -> str:
+        return "\n".join(self._tail)
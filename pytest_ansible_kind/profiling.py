@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+import json
+import threading
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from typing import Any, Callable
+
+_RESULT_EVENTS = frozenset(
+    {
+        "runner_on_ok",
+        "runner_on_failed",
+        "runner_on_skipped",
+        "runner_on_unreachable",
+    }
+)
+
+
+@dataclass
+class Timing:
+    """Accumulated wall time of one task, role or playbook."""
+
+    total: float = 0.0
+    count: int = 0
+    max: float = 0.0
+
+    def add(self, seconds: float) -> None:
+        self.total += seconds
+        self.count += 1
+        self.max = max(self.max, seconds)
+
+
+def _created(event: dict[str, Any]) -> datetime | None:
+    raw = event.get("created")
+    if not raw:
+        return None
+    try:
+        return datetime.fromisoformat(raw)
+    except ValueError:
+        return None
+
+
+class TaskProfiler:
+    """
+    Aggregate per-task, per-role and per-playbook timings from ansible-runner
+    events across a whole session.
+
+    Durations come from the ``duration`` field ansible-runner adds to
+    ``runner_on_*`` events; if it is missing, the gap between the task start
+    event and the result event is used instead.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.tasks: dict[tuple[str, str, str], Timing] = {}
+        self.roles: dict[str, Timing] = {}
+        self.playbooks: dict[str, Timing] = {}
+
+    def handler(self, playbook: Callable[[], str]) -> Callable[[dict[str, Any]], None]:
+        """
+        Return an event handler for one run. ``playbook`` is called for each
+        result to name the playbook it belongs to.
+        """
+        task_started: dict[str, datetime] = {}
+
+        def _on_event(event: dict[str, Any]) -> None:
+            kind = event.get("event")
+            data = event.get("event_data") or {}
+            if kind == "playbook_on_task_start":
+                started = _created(event)
+                if started is not None:
+                    task_started[data.get("task_uuid", "")] = started
+                return
+            if kind not in _RESULT_EVENTS:
+                return
+
+            duration = data.get("duration")
+            if not isinstance(duration, (int, float)):
+                started = task_started.get(data.get("task_uuid", ""))
+                ended = _created(event)
+                if started is None or ended is None:
+                    return
+                duration = (ended - started).total_seconds()
+
+            self.record(
+                playbook=playbook(),
+                role=data.get("role") or "",
+                task=data.get("task") or data.get("task_action") or "?",
+                seconds=float(duration),
+            )
+
+        return _on_event
+
+    def record(self, *, playbook: str, role: str, task: str, seconds: float) -> None:
+        with self._lock:
+            self.tasks.setdefault((playbook, role, task), Timing()).add(seconds)
+            if role:
+                self.roles.setdefault(role, Timing()).add(seconds)
+            self.playbooks.setdefault(playbook, Timing()).add(seconds)
+
+    def slowest_tasks(self, n: int) -> list[tuple[tuple[str, str, str], Timing]]:
+        with self._lock:
+            items = list(self.tasks.items())
+        items.sort(key=lambda kv: kv[1].total, reverse=True)
+        return items[:n]
+
+    def as_dict(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "tasks": [
+                    {"playbook": pb, "role": role, "task": task, **asdict(t)}
+                    for (pb, role, task), t in self.tasks.items()
+                ],
+                "roles": {name: asdict(t) for name, t in self.roles.items()},
+                "playbooks": {name: asdict(t) for name, t in self.playbooks.items()},
+            }
+
+    def write_json(self, path: str) -> None:
+        with open(path, "w", encoding="utf-8") as fh:
+            json.dump(self.as_dict(), fh, indent=2, sort_keys=True)
+
+    def summary_lines(self, n: int) -> list[str]:
+        lines = [f"slowest {n} tasks:"]
+        for (pb, role, task), t in self.slowest_tasks(n):
+            label = f"{role} : {task}" if role else task
+            lines.append(f"{t.total:8.2f}s {t.count:4d}x  {label}  ({pb})")
+        with self._lock:
+            roles = sorted(self.roles.items(), key=lambda kv: kv[1].total, reverse=True)
+        if roles:
+            lines.append("roles:")
+            for name, t in roles[:n]:
+                lines.append(f"{t.total:8.2f}s {t.count:4d}x  {name}")
+        return lines
@@ -0,0 +1,170 @@
+from __future__ import annotations
+
+import os
+import subprocess
+import threading
+
+from .exceptions import KindConfigError
+from .tracing import phase
+
+PROVIDERS = ("kind", "kubeconfig", "fake")
+
+
+class ClusterProvider:
+    """
+    Where the clusters a ``KindRunner`` talks to come from.
+
+    :class:`~pytest_ansible_kind.registry.ClusterRegistry` caches what a
+    provider returns; the provider only knows how to make sure a cluster
+    exists, what its kubeconfig is, and how to delete it.
+    """
+
+    #: Provider name as used by the ``kind_provider`` option.
+    name = ""
+    #: Whether clusters are KIND clusters (``kind load`` etc. apply).
+    is_kind = False
+    #: Whether the registry may TCP-probe the API server of cached clusters.
+    probe_api_server = True
+
+    def ensure(
+        self, name: str, wait: str, cfg_path: str | None, use_name_arg: bool
+    ) -> bool:
+        """Make sure cluster ``name`` exists. Returns True if it was created."""
+        raise NotImplementedError
+
+    def kubeconfig(self, name: str) -> str:
+        """Return the kubeconfig of cluster ``name``, as YAML text."""
+        raise NotImplementedError
+
+    def kubeconfig_file(self, name: str) -> str | None:
+        """
+        A kubeconfig file to hand to playbooks as is, or None (the default)
+        to have the registry write a private copy of :meth:`kubeconfig`.
+        """
+        return None
+
+    def delete(self, name: str) -> None:
+        """Delete cluster ``name``, if this provider owns it."""
+        raise NotImplementedError
+
+
+class KindProvider(ClusterProvider):
+    """Clusters created and managed through the ``kind`` CLI."""
+
+    name = "kind"
+    is_kind = True
+
+    def ensure(
+        self, name: str, wait: str, cfg_path: str | None, use_name_arg: bool
+    ) -> bool:
+        from .runner import _ensure_kind
+
+        return _ensure_kind(
+            name=name, wait=wait, cfg_path=cfg_path, use_name_arg=use_name_arg
+        )
+
+    def kubeconfig(self, name: str) -> str:
+        from .runner import _kubeconfig
+
+        return _kubeconfig(name)
+
+    def delete(self, name: str) -> None:
+        subprocess.run(["kind", "delete", "cluster", f"--name={name}"], check=False)
+
+
+class KubeconfigProvider(ClusterProvider):
+    """
+    An already running cluster reached through an existing kubeconfig.
+
+    Nothing is created or deleted and no binaries are required. Without a
+    ``context`` playbooks use the kubeconfig file itself; with one, they and
+    the ``ApiClient`` get a copy with that context made current.
+    """
+
+    name = "kubeconfig"
+
+    def __init__(self, path: str | None = None, context: str | None = None) -> None:
+        self.path = path or os.environ.get("KUBECONFIG", "").split(os.pathsep)[0]
+        if not self.path:
+            self.path = os.path.expanduser("~/.kube/config")
+        self.context = context
+
+    def ensure(
+        self, name: str, wait: str, cfg_path: str | None, use_name_arg: bool
+    ) -> bool:
+        if not os.path.exists(self.path):
+            raise KindConfigError("kubeconfig not found", config_path=self.path)
+        return False
+
+    def kubeconfig(self, name: str) -> str:
+        with phase("fetch_kubeconfig"):
+            with open(self.path, "r", encoding="utf-8") as fh:
+                content = fh.read()
+        if not self.context:
+            return content
+
+        import yaml
+
+        data = yaml.safe_load(content) or {}
+        contexts = {c.get("name") for c in data.get("contexts") or []}
+        if self.context not in contexts:
+            raise KindConfigError(
+                f"context {self.context!r} not in kubeconfig",
+                config_path=self.path,
+            )
+        data["current-context"] = self.context
+        return yaml.safe_dump(data)
+
+    def kubeconfig_file(self, name: str) -> str | None:
+        # Relative certificate paths in the user's file keep working.
+        return None if self.context else self.path
+
+    def delete(self, name: str) -> None:
+        pass
+
+
+class FakeProvider(ClusterProvider):
+    """
+    In-process stand-in for tests: clusters are names in a set and their
+    kubeconfigs point at ``server``, which is never contacted.
+    """
+
+    name = "fake"
+    probe_api_server = False
+
+    def __init__(self, server: str = "https://127.0.0.1:6443") -> None:
+        self.server = server
+        self._lock = threading.Lock()
+        self.clusters: set[str] = set()
+        self.created: list[str] = []
+        self.deleted: list[str] = []
+
+    def ensure(
+        self, name: str, wait: str, cfg_path: str | None, use_name_arg: bool
+    ) -> bool:
+        with self._lock:
+            if name in self.clusters:
+                return False
+            self.clusters.add(name)
+            self.created.append(name)
+            return True
+
+    def kubeconfig(self, name: str) -> str:
+        import yaml
+
+        ctx = f"fake-{name}"
+        return yaml.safe_dump(
+            {
+                "apiVersion": "v1",
+                "kind": "Config",
+                "clusters": [{"name": ctx, "cluster": {"server": self.server}}],
+                "contexts": [{"name": ctx, "context": {"cluster": ctx, "user": ctx}}],
+                "current-context": ctx,
+                "users": [{"name": ctx, "user": {"token": "fake"}}],
+            }
+        )
+
+    def delete(self, name: str) -> None:
+        with self._lock:
+            self.clusters.discard(name)
+            self.deleted.append(name)
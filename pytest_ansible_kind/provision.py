@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import TYPE_CHECKING
+
+from .registry import ClusterRegistry
+from .tracing import PhaseTracer, phase, tracing
+
+if TYPE_CHECKING:
+    from .images import ImageLoader
+
+
+class ClusterProvisioner:
+    """
+    Create clusters in the background so tests only block on the one they use.
+
+    Clusters are submitted once per name (typically from
+    ``pytest_collection_finish``) and created concurrently on a thread pool
+    through the session :class:`ClusterRegistry`, followed by any images
+    requested for them. :meth:`wait` blocks until
+    the named cluster is ready and re-raises its creation error, if any;
+    names that were never submitted return immediately.
+    """
+
+    def __init__(
+        self,
+        registry: ClusterRegistry,
+        max_workers: int = 4,
+        tracer: PhaseTracer | None = None,
+        image_loader: ImageLoader | None = None,
+    ) -> None:
+        self._registry = registry
+        self._tracer = tracer
+        self._image_loader = image_loader
+        self._max_workers = max_workers
+        self._executor: ThreadPoolExecutor | None = None
+        self._futures: dict[str, Future[None]] = {}
+        self._lock = threading.Lock()
+
+    def _provision(
+        self,
+        name: str,
+        wait: str,
+        cfg_path: str | None,
+        use_name_arg: bool,
+        images: list[str],
+    ) -> None:
+        with tracing(self._tracer, cluster=name), phase("provision"):
+            self._registry.ensure(
+                name=name, wait=wait, cfg_path=cfg_path, use_name_arg=use_name_arg
+            )
+            self._registry.kubeconfig_path(name)
+            if (
+                images
+                and self._image_loader is not None
+                and self._registry.provider.is_kind
+            ):
+                state = self._registry.get(name)
+                self._image_loader.load(name, state.generation if state else "", images)
+
+    def submit(
+        self,
+        name: str,
+        *,
+        wait: str = "120s",
+        cfg_path: str | None = None,
+        use_name_arg: bool = False,
+        images: list[str] | None = None,
+    ) -> Future[None]:
+        with self._lock:
+            fut = self._futures.get(name)
+            if fut is not None:
+                return fut
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self._max_workers,
+                    thread_name_prefix="kind-provision",
+                )
+            fut = self._executor.submit(
+                self._provision, name, wait, cfg_path, use_name_arg, list(images or [])
+            )
+            self._futures[name] = fut
+            return fut
+
+    def wait(self, name: str) -> None:
+        with self._lock:
+            fut = self._futures.get(name)
+        if fut is not None:
+            fut.result()
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
@@ -0,0 +1,310 @@
+from __future__ import annotations
+
+import hashlib
+import os
+import shutil
+import socket
+import tempfile
+import threading
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Callable
+from urllib.parse import urlparse
+
+from .lease import LeaseManager, cluster_lock
+from .providers import ClusterProvider, KindProvider
+
+SHUTDOWN_POLICIES = ("call", "module", "session", "never")
+
+
+def shutdown_policy(value: bool | str | None) -> str:
+    """
+    Normalise a shutdown setting. Booleans and their ini spellings map to
+    ``session`` (delete once the last user is done) and ``never``.
+    """
+    if value is None or value is False:
+        return "never"
+    if value is True:
+        return "session"
+    raw = value.strip().lower()
+    if raw in ("1", "true", "yes", "on"):
+        return "session"
+    if raw in ("", "0", "false", "no", "off"):
+        return "never"
+    if raw not in SHUTDOWN_POLICIES:
+        raise ValueError(
+            f"shutdown must be a boolean or one of {', '.join(SHUTDOWN_POLICIES)}, "
+            f"got {value!r}"
+        )
+    return raw
+
+
+@dataclass
+class ClusterState:
+    """
+    What the registry knows about one cluster: its kubeconfig, held in
+    memory, and the file playbooks get it from.
+    """
+
+    name: str
+    kubeconfig_path: str | None = None
+    kubeconfig: str | None = None
+    generation: str | None = None
+
+
+def _server_address(kubeconfig: str) -> tuple[str, int] | None:
+    import yaml
+
+    try:
+        data = yaml.safe_load(kubeconfig)
+    except yaml.YAMLError:
+        return None
+    if not isinstance(data, dict):
+        return None
+
+    for entry in data.get("clusters") or []:
+        server = ((entry or {}).get("cluster") or {}).get("server")
+        if not server:
+            continue
+        parsed = urlparse(server)
+        if parsed.hostname:
+            return parsed.hostname, parsed.port or 443
+    return None
+
+
+def _scratch_root() -> str | None:
+    """tmpfs when available, so kubeconfigs never reach a disk."""
+    shm = "/dev/shm"
+    if os.path.isdir(shm) and os.access(shm, os.W_OK | os.X_OK):
+        return shm
+    return None
+
+
+def api_server_reachable(state: ClusterState, timeout: float = 0.5) -> bool:
+    """
+    Cheap liveness probe: open (and close) a TCP connection to the API server
+    named in the cached kubeconfig. No subprocess, no TLS handshake.
+    """
+    if not state.kubeconfig:
+        return False
+    addr = _server_address(state.kubeconfig)
+    if addr is None:
+        return False
+    try:
+        with socket.create_connection(addr, timeout=timeout):
+            return True
+    except OSError:
+        return False
+
+
+class ClusterRegistry:
+    """
+    Per-session cache of known KIND clusters and their kubeconfigs.
+
+    Entries are only dropped when the plugin itself creates or deletes a
+    cluster, or when the liveness probe fails; in every other case the
+    ``kind get clusters`` / ``kind get kubeconfig`` subprocesses are skipped
+    and counted in ``subprocesses_avoided``.
+
+    Callbacks registered with :meth:`subscribe` are told about every cluster
+    the plugin creates or deletes, so caches keyed on a cluster can drop
+    their entries.
+
+    Clusters come from ``provider`` (KIND by default); providers that opt
+    out of API server probing are never probed. Use of a cluster is leased
+    through ``leases``, shared on disk with every other process on the host,
+    so :meth:`delete` only removes a cluster nobody else holds. Within the
+    process, calls in flight on a cluster are counted with :meth:`hold`, so
+    the last of them is the one that deletes it.
+
+    Kubeconfigs are kept in memory; the files playbooks need are written
+    once per cluster generation, readable only by the owner, to a scratch
+    dir (on tmpfs where available) that :meth:`close` removes.
+    """
+
+    def __init__(
+        self,
+        probe: Callable[[ClusterState], bool] | None = api_server_reachable,
+        provider: ClusterProvider | None = None,
+        leases: LeaseManager | None = None,
+    ) -> None:
+        self.provider = provider if provider is not None else KindProvider()
+        self.leases = leases if leases is not None else LeaseManager()
+        self._probe = probe if self.provider.probe_api_server else None
+        self._lock = threading.Lock()
+        self._clusters: dict[str, ClusterState] = {}
+        self._listeners: list[Callable[[str], None]] = []
+        self._scheduled: set[str] = set()
+        self._users: dict[str, int] = {}
+        self._scratch: str | None = None
+        self._remove_scratch: weakref.finalize | None = None
+        self.subprocesses_avoided = 0
+
+    def subscribe(self, callback: Callable[[str], None]) -> None:
+        """Call ``callback(name)`` whenever the plugin creates or deletes ``name``."""
+        self._listeners.append(callback)
+
+    def _changed(self, name: str) -> None:
+        self.forget(name)
+        for callback in list(self._listeners):
+            callback(name)
+
+    def _avoided(self, n: int = 1) -> None:
+        with self._lock:
+            self.subprocesses_avoided += n
+
+    def _alive(self, name: str) -> ClusterState | None:
+        with self._lock:
+            state = self._clusters.get(name)
+        if state is None:
+            return None
+        if self._probe is not None and not self._probe(state):
+            self.forget(name)
+            return None
+        return state
+
+    def get(self, name: str) -> ClusterState | None:
+        with self._lock:
+            return self._clusters.get(name)
+
+    def forget(self, name: str) -> None:
+        with self._lock:
+            self._clusters.pop(name, None)
+
+    def ensure(
+        self, name: str, wait: str, cfg_path: str | None, use_name_arg: bool
+    ) -> None:
+        """Ensure cluster ``name`` exists, consulting the cache first."""
+        if self._alive(name) is not None:
+            self._avoided()
+            return
+
+        if self.leases.acquire(
+            name,
+            lambda: self.provider.ensure(
+                name=name, wait=wait, cfg_path=cfg_path, use_name_arg=use_name_arg
+            ),
+        ):
+            self._changed(name)
+        with self._lock:
+            self._clusters.setdefault(name, ClusterState(name=name))
+
+    def kubeconfig_path(self, name: str) -> str:
+        """
+        Return the kubeconfig file for ``name``, fetching the kubeconfig at
+        most once per cluster generation; cached calls touch no files.
+        """
+        state = self.get(name)
+        if state is not None and state.kubeconfig_path:
+            self._avoided()
+            return state.kubeconfig_path
+
+        content = self.provider.kubeconfig(name)
+        generation = hashlib.sha256(content.encode("utf-8")).hexdigest()
+        path = self.provider.kubeconfig_file(name)
+        if path is None:
+            path = self._write_private(name, generation, content)
+        with self._lock:
+            self._clusters[name] = ClusterState(
+                name=name,
+                kubeconfig_path=path,
+                kubeconfig=content,
+                generation=generation,
+            )
+        return path
+
+    def _write_private(self, name: str, generation: str, content: str) -> str:
+        with self._lock:
+            if self._scratch is None:
+                self._scratch = tempfile.mkdtemp(
+                    prefix="kind-kubeconfig-", dir=_scratch_root()
+                )
+                self._remove_scratch = weakref.finalize(
+                    self, shutil.rmtree, self._scratch, ignore_errors=True
+                )
+            scratch = self._scratch
+        path = os.path.join(scratch, f"{name}-{generation[:12]}")
+        if os.path.exists(path):
+            return path
+        # Write via rename so concurrent readers never see a partial file.
+        tmp = f"{path}.{threading.get_ident()}.tmp"
+        fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "w", encoding="utf-8") as fh:
+            fh.write(content)
+        os.replace(tmp, path)
+        return path
+
+    def delete(self, name: str) -> bool:
+        """
+        Release this session's lease on ``name`` and drop it from the cache;
+        the cluster is deleted only if no other process holds it. Returns
+        True if it was deleted.
+        """
+        deleted = self.leases.release(name, lambda: self.provider.delete(name))
+        if deleted:
+            self._changed(name)
+        else:
+            self.forget(name)
+        return deleted
+
+    def hold(self, name: str) -> None:
+        """Count a call in this process as using ``name`` until :meth:`unhold`."""
+        # Under the cluster lock: waits for a release deleting ``name``.
+        with cluster_lock(name), self._lock:
+            self._users[name] = self._users.get(name, 0) + 1
+
+    def unhold(self, name: str, delete: bool = False) -> bool:
+        """
+        End a use started with :meth:`hold`. With ``delete``, the last user
+        in this process deletes ``name`` (see :meth:`delete`). Returns True
+        if it was deleted.
+        """
+        with cluster_lock(name):
+            with self._lock:
+                users = self._users.get(name, 0) - 1
+                if users > 0:
+                    self._users[name] = users
+                else:
+                    self._users.pop(name, None)
+            if users > 0 or not delete:
+                return False
+            return self.delete(name)
+
+    def delete_many(self, names: set[str] | list[str], max_workers: int = 8) -> None:
+        """Release and, where this was the last holder, delete in parallel."""
+        names = sorted(names)
+        if len(names) <= 1:
+            for name in names:
+                self.delete(name)
+            return
+        with ThreadPoolExecutor(
+            max_workers=min(max_workers, len(names)),
+            thread_name_prefix="kind-shutdown",
+        ) as pool:
+            for fut in [pool.submit(self.delete, name) for name in names]:
+                fut.result()
+
+    def schedule_delete(self, name: str) -> None:
+        """Delete ``name`` (subject to its lease) when the registry is closed."""
+        with self._lock:
+            self._scheduled.add(name)
+
+    def close(self) -> None:
+        """
+        Delete the clusters scheduled with :meth:`schedule_delete`, in
+        parallel, then release every remaining lease without deleting and
+        remove the kubeconfig files.
+        """
+        with self._lock:
+            scheduled, self._scheduled = self._scheduled, set()
+        try:
+            self.delete_many(scheduled)
+        finally:
+            self.leases.release_all()
+            with self._lock:
+                self._clusters.clear()
+                remove, self._remove_scratch = self._remove_scratch, None
+                self._scratch = None
+            if remove is not None:
+                remove()
@@ -1,23 +1,51 @@
 from __future__ import annotations
 
+import functools
 import os
 import shutil
 import subprocess
 import tempfile
+import threading
+import time
+import uuid
+from concurrent.futures import Future, ThreadPoolExecutor
 from contextlib import contextmanager
-from typing import Any, Generator
-
-import yaml
-import ansible_runner
-from kubernetes import client, config
+from typing import TYPE_CHECKING, Any, Callable, Generator, Iterable
 
 from .exceptions import (
     KindBinaryMissingError,
     KindClusterError,
     KindConfigError,
     PlaybookFailedError,
-    PlaybookNotFoundError,
 )
+from .artifacts import ArtifactStore
+from .cache import PlaybookCache, playbook_cache_key
+from .clients import ApiClientPool
+from .facts import FactCache, FactRun
+from .index import (
+    ProjectIndex,
+    _derive_name_from_cfg,
+    _extract_play_hosts,
+    _resolve_inventory_path,
+    _resolve_playbook_path,
+)
+from .isolation import NamespaceIsolation
+from .lease import cluster_lock
+from .matrix import MatrixRun
+from .output import OutputPipeline
+from .profiling import TaskProfiler
+from .tracing import PhaseTracer, current_nodeid, phase, tag, tracing
+from .providers import ClusterProvider
+from .provision import ClusterProvisioner
+from .registry import ClusterRegistry, shutdown_policy
+from .snapshot import ClusterDiff, Snapshot, diff_snapshot, take_snapshot
+from .waits import Wait, wait_all
+from .workers import AnsibleWorkerPool
+
+if TYPE_CHECKING:
+    from kubernetes import client
+
+    from .images import ImageLoader
 
 
 def _require_bins(*bins: str) -> None:
@@ -61,89 +89,142 @@ def _kind_out(args: list[str]) -> str:
 
 
 def _cluster_exists(name: str) -> bool:
-    clusters = [ln.strip() for ln in _kind_out(["get", "clusters"]).splitlines()]
+    with phase("cluster_exists"):
+        clusters = [ln.strip() for ln in _kind_out(["get", "clusters"]).splitlines()]
     return name in clusters
 
 
-def _kubeconfig_path(name: str) -> str:
-    p = os.path.join(tempfile.gettempdir(), f"{name}-kubeconfig")
-    with open(p, "w", encoding="utf-8") as fh:
-        fh.write(_kind_out(["get", "kubeconfig", f"--name={name}"]))
-    return p
+def _kubeconfig(name: str) -> str:
+    with phase("fetch_kubeconfig"):
+        return _kind_out(["get", "kubeconfig", f"--name={name}"])
 
 
-def _derive_name_from_cfg(cfg_path: str | None) -> str:
-    if cfg_path is None:
-        return "kind"
+def _cluster_name(
+    cfg_path: str | None,
+    name: str | None = None,
+    suffix: str | None = None,
+    index: ProjectIndex | None = None,
+) -> str:
+    if name:
+        base = name
+    elif index is not None:
+        base = index.cluster_name(cfg_path)
+    else:
+        base = _derive_name_from_cfg(cfg_path)
+    if suffix:
+        return f"{base}-{suffix}"
+    return base
 
-    if not os.path.exists(cfg_path):
-        raise KindConfigError("KIND config file not found", config_path=cfg_path)
 
-    try:
-        with open(cfg_path, "r", encoding="utf-8") as fh:
-            data = yaml.safe_load(fh)
-    except yaml.YAMLError as exc:
-        raise KindConfigError(
-            f"Invalid YAML in KIND config: {exc}", config_path=cfg_path
-        ) from exc
+def _ensure_kind(
+    name: str, wait: str, cfg_path: str | None, use_name_arg: bool
+) -> bool:
+    """Create cluster ``name`` unless it exists. Returns True if created."""
+    with phase("check_binaries"):
+        _require_bins("kind", "kubectl", "ansible-playbook")
 
-    if isinstance(data, dict):
-        name = data.get("name")
-        if isinstance(name, str) and name.strip():
-            return name.strip()
+    if _cluster_exists(name):
+        return False
 
-    return "kind"
+    with cluster_lock(name):
+        # Another worker may have created it while we waited for the lock.
+        if _cluster_exists(name):
+            return False
 
+        cmd: list[str] = ["kind", "create", "cluster", f"--wait={wait}"]
+        if use_name_arg:
+            cmd.append(f"--name={name}")
+        if cfg_path is not None:
+            cmd.extend(["--config", cfg_path])
 
-def _ensure_kind(
-    name: str, wait: str, cfg_path: str | None, use_name_arg: bool
-) -> None:
-    _require_bins("kind", "kubectl", "ansible-playbook")
+        with phase("create_cluster"):
+            _run_kind_checked(cmd)
+        return True
 
-    if _cluster_exists(name):
-        return
 
-    cmd: list[str] = ["kind", "create", "cluster", f"--wait={wait}"]
-    if use_name_arg:
-        cmd.append(f"--name={name}")
-    if cfg_path is not None:
-        cmd.extend(["--config", cfg_path])
+_BATCH_MARKER = "pytest-ansible-kind batch #"
 
-    _run_kind_checked(cmd)
 
+def _dedupe(items: Iterable[str]) -> list[str]:
+    return list(dict.fromkeys(items))
 
-def _resolve_playbook_path(project_dir: str, playbook: str) -> str:
-    if os.path.isabs(playbook):
-        if os.path.exists(playbook):
-            return playbook
-        raise PlaybookNotFoundError(playbook)
-    candidate = os.path.join(project_dir, playbook)
-    if os.path.exists(candidate):
-        return candidate
-    raise PlaybookNotFoundError(playbook, project_dir=project_dir, tried=candidate)
 
+def _unlink_quietly(path: str | None) -> None:
+    if path and os.path.exists(path):
+        try:
+            os.unlink(path)
+        except OSError:
+            pass
+
+
+def _batches(
+    entries: list[tuple[str, dict[str, Any]]],
+) -> list[tuple[dict[str, Any], list[str]]]:
+    """Group consecutive entries with equal per-playbook vars, in order."""
+    batches: list[tuple[dict[str, Any], list[str]]] = []
+    for path, pb_vars in entries:
+        if batches and batches[-1][0] == pb_vars:
+            batches[-1][1].append(path)
+        else:
+            batches.append((pb_vars, [path]))
+    return batches
+
+
+def _write_batch_playbook(paths: list[str]) -> str:
+    """
+    Write a wrapper playbook that imports each path in turn. An empty marker
+    play precedes every import so play-start events reveal which constituent
+    is running.
+    """
+    import yaml
+
+    plays: list[dict[str, Any]] = []
+    for idx, path in enumerate(paths):
+        plays.append(
+            {
+                "name": f"{_BATCH_MARKER}{idx}",
+                "hosts": "localhost",
+                "gather_facts": False,
+                "tasks": [],
+            }
+        )
+        plays.append({"import_playbook": path})
 
-def _extract_play_hosts(playbook_path: str) -> list[str]:
-    with open(playbook_path, "r", encoding="utf-8") as fh:
-        data = yaml.safe_load(fh)
+    with tempfile.NamedTemporaryFile(
+        "w",
+        delete=False,
+        prefix="kind-batch-",
+        suffix=".yaml",
+    ) as tf:
+        yaml.safe_dump(plays, tf, sort_keys=False)
+    return tf.name
 
-    if isinstance(data, list):
-        plays = [p for p in data if isinstance(p, dict)]
-    elif isinstance(data, dict):
-        plays = [data]
-    else:
-        return []
 
-    seen: set[str] = set()
-    out: list[str] = []
-    for p in plays:
-        h = p.get("hosts")
-        if isinstance(h, str):
-            hv = h.strip()
-            if hv and hv not in seen:
-                seen.add(hv)
-                out.append(hv)
-    return out
+def _traced(method: Callable[..., Any]) -> Callable[..., Any]:
+    """Activate the runner's tracer for one public call and time it."""
+
+    @functools.wraps(method)
+    def wrapper(self: "KindRunner", playbook: Any, *args: Any, **kwargs: Any) -> Any:
+        if isinstance(playbook, str):
+            label = playbook
+        else:
+            label = "+".join(p if isinstance(p, str) else p[0] for p in playbook)
+        with tracing(self._tracer, nodeid=current_nodeid(), playbook=label):
+            with phase(method.__name__.strip("_")):
+                return method(self, playbook, *args, **kwargs)
+
+    return wrapper
+
+
+class RunFuture(Future["client.ApiClient"]):
+    """
+    Future of a run made with :meth:`KindRunner.submit`. With ``snapshot``
+    set, ``diff`` holds the run's :class:`ClusterDiff` once it is done.
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.diff: ClusterDiff | None = None
 
 
 class KindRunner:
@@ -153,15 +234,76 @@ class KindRunner:
         *,
         name: str | None = None,
         wait: str = "120s",
-        shutdown: bool = False,
+        shutdown: bool | str = False,
         default_kind_cfg: str | None = None,
+        name_suffix: str | None = None,
+        registry: ClusterRegistry | None = None,
+        playbook_cache: PlaybookCache | None = None,
+        provisioner: ClusterProvisioner | None = None,
+        max_workers: int = 4,
+        output: str = "full",
+        output_tail: int = 200,
+        profiler: TaskProfiler | None = None,
+        tracer: PhaseTracer | None = None,
+        isolation: NamespaceIsolation | None = None,
+        images: list[str] | None = None,
+        image_loader: ImageLoader | None = None,
+        api_clients: ApiClientPool | None = None,
+        provider: ClusterProvider | None = None,
+        index: ProjectIndex | None = None,
+        artifacts: ArtifactStore | None = None,
+        facts: FactCache | None = None,
+        snapshot: list[str] | None = None,
+        workers: AnsibleWorkerPool | None = None,
     ) -> None:
         self.project_dir = project_dir
         self.name = name
         self.wait = wait
-        self.shutdown = shutdown
+        self.shutdown = shutdown_policy(shutdown)
+        self._used: set[str] = set()
+        self.name_suffix = name_suffix
         self._default_kind_cfg = default_kind_cfg
-
+        self._owns_registry = registry is None
+        if registry is None:
+            registry = ClusterRegistry(provider=provider)
+        self._registry = registry
+        self._playbook_cache = playbook_cache
+        self._provisioner = provisioner
+        self._max_workers = max_workers
+        self.output = output
+        self.output_tail = output_tail
+        self._profiler = profiler
+        self._tracer = tracer
+        self._isolation = isolation
+        self.images = list(images or [])
+        self._image_loader = image_loader
+        self._owns_api_clients = api_clients is None
+        if api_clients is None:
+            api_clients = ApiClientPool()
+            self._registry.subscribe(api_clients.invalidate_cluster)
+        self._api_clients = api_clients
+        self._owns_index = index is None
+        self._index = index if index is not None else ProjectIndex()
+        self._owns_artifacts = artifacts is None
+        self._artifacts = artifacts if artifacts is not None else ArtifactStore()
+        self._facts = facts
+        self.snapshot = list(snapshot or [])
+        # Diffs are per thread so concurrent runs never see each other's.
+        self._local = threading.local()
+        self._workers = workers
+        self._executor: ThreadPoolExecutor | None = None
+        self._executor_lock = threading.Lock()
+
+    @property
+    def last_diff(self) -> ClusterDiff | None:
+        """
+        What the last run made by the calling thread changed in the watched
+        resource types (see ``snapshot``). Runs made through :meth:`submit`
+        or :meth:`run_matrix` report theirs on the future and ``MatrixRun``.
+        """
+        return getattr(self._local, "diff", None)
+
+    @_traced
     def __call__(
         self,
         playbook: str,
@@ -170,101 +312,557 @@ class KindRunner:
         inventory_file: str | None = None,
         kind_config: str | None = None,
     ) -> client.ApiClient:
+        self._local.diff = None
         resolved_project_dir = project_dir or self.project_dir
+        effective_name, kubeconfig = self._cluster(resolved_project_dir, kind_config)
 
-        if kind_config is not None:
-            cfg_path = kind_config
-            if not os.path.isabs(cfg_path):
-                cfg_path = os.path.join(resolved_project_dir, cfg_path)
-        else:
-            cfg_path = self._default_kind_cfg
+        try:
+            resolved_playbook = self._index.playbook(resolved_project_dir, playbook)
+            extravars = self._isolated(effective_name, kubeconfig, extravars)
+            roles_path = os.path.join(resolved_project_dir, "roles")
+            inventory_arg = self._inventory(
+                resolved_project_dir,
+                inventory_file,
+                lambda: self._index.play_hosts(resolved_playbook),
+            )
 
-        explicit_name = self.name is not None
-        effective_name = self.name or _derive_name_from_cfg(cfg_path)
+            cache_key: str | None = None
+            if self._playbook_cache is not None:
+                cache_key = self._cache_key(
+                    resolved_playbook,
+                    roles_path=roles_path,
+                    inventory=inventory_arg,
+                    extravars=extravars,
+                    cluster=effective_name,
+                )
+                hit = cache_key is not None and self._playbook_cache.lookup(cache_key)
+                if hit:
+                    if self.snapshot:
+                        self._local.diff = ClusterDiff()
+                    return self._api_client(effective_name, kubeconfig)
+
+            before = self._snapshot(effective_name, kubeconfig)
+            result = self._run_playbook(
+                project_dir=resolved_project_dir,
+                playbook=resolved_playbook,
+                inventory=inventory_arg,
+                extravars=extravars,
+                kubeconfig=kubeconfig,
+                cluster=effective_name,
+                playbooks=[resolved_playbook],
+            )
+            self._diff(effective_name, kubeconfig, before)
 
-        _ensure_kind(
-            name=effective_name,
-            wait=self.wait,
-            cfg_path=cfg_path,
-            use_name_arg=explicit_name,
-        )
+            if cache_key is not None:
+                self._playbook_cache.store(
+                    cache_key,
+                    playbook=resolved_playbook,
+                    cluster=effective_name,
+                    status=result.status,
+                    rc=result.rc,
+                )
 
-        kubeconfig = _kubeconfig_path(effective_name)
-        resolved_playbook = _resolve_playbook_path(resolved_project_dir, playbook)
+            return self._api_client(effective_name, kubeconfig)
+        finally:
+            self._release(effective_name)
 
-        temp_inv_path: str | None = None
-        artifact_dir: str | None = None
+    @_traced
+    def run_many(
+        self,
+        playbooks: list[str | tuple[str, dict[str, Any]]],
+        project_dir: str | None = None,
+        extravars: dict[str, Any] | None = None,
+        inventory_file: str | None = None,
+        kind_config: str | None = None,
+    ) -> client.ApiClient:
+        """
+        Run several playbooks, in order, in as few ansible-runner invocations
+        as possible.
+
+        Each entry is a playbook path or a ``(playbook, extravars)`` pair.
+        Per-playbook vars are passed as extra vars, on top of ``extravars``,
+        just as a single call would pass them. Consecutive entries with the
+        same vars share one invocation; a change of vars starts the next
+        one, since extra vars hold for a whole ansible-playbook run. The
+        first failing playbook stops the batch and is reported as the
+        ``playbook`` of the raised ``PlaybookFailedError``.
+        """
+        if not playbooks:
+            raise ValueError("run_many() needs at least one playbook")
+
+        self._local.diff = None
+        resolved_project_dir = project_dir or self.project_dir
+        effective_name, kubeconfig = self._cluster(resolved_project_dir, kind_config)
 
         try:
-            if inventory_file:
-                if os.path.isabs(inventory_file):
-                    inventory_arg = inventory_file
-                else:
-                    inventory_arg = os.path.join(resolved_project_dir, inventory_file)
-            else:
-                patterns = _extract_play_hosts(resolved_playbook)
-                host_aliases = patterns or ["localhost"]
-                with tempfile.NamedTemporaryFile(
-                    "w",
-                    delete=False,
-                    prefix="kind-inv-",
-                    suffix=".ini",
-                ) as tf:
-                    for alias in host_aliases:
-                        tf.write(f"{alias} ansible_connection=local\n")
-                    temp_inv_path = tf.name
-                inventory_arg = temp_inv_path
-
-            artifact_dir = tempfile.mkdtemp(prefix="pytest-ansible-kind-artifacts-")
-            roles_path = os.path.join(resolved_project_dir, "roles")
+            entries: list[tuple[str, dict[str, Any]]] = []
+            for entry in playbooks:
+                path, pb_vars = (entry, {}) if isinstance(entry, str) else entry
+                resolved = self._index.playbook(resolved_project_dir, path)
+                entries.append((resolved, pb_vars))
+
+            extravars = self._isolated(effective_name, kubeconfig, extravars)
+            inventory_arg = self._inventory(
+                resolved_project_dir,
+                inventory_file,
+                lambda: _dedupe(
+                    h for pb, _ in entries for h in self._index.play_hosts(pb)
+                ),
+            )
 
-            def _event_handler(event: dict[str, Any]) -> None:
-                stdout = event.get("stdout")
-                if stdout:
-                    print(stdout, flush=True)
+            before = self._snapshot(effective_name, kubeconfig)
+            for pb_vars, paths in _batches(entries):
+                self._run_batch(
+                    project_dir=resolved_project_dir,
+                    paths=paths,
+                    inventory=inventory_arg,
+                    extravars={**(extravars or {}), **pb_vars},
+                    kubeconfig=kubeconfig,
+                    cluster=effective_name,
+                )
+            self._diff(effective_name, kubeconfig, before)
 
-            result = ansible_runner.run(
-                private_data_dir=resolved_project_dir,
-                project_dir=resolved_project_dir,
-                playbook=resolved_playbook,
-                inventory=inventory_arg,
-                extravars=extravars or {},
-                envvars={
-                    "KUBECONFIG": kubeconfig,
-                    "ANSIBLE_FORCE_COLOR": "1",
-                },
-                roles_path=roles_path,
-                artifact_dir=artifact_dir,
-                quiet=False,
-                json_mode=False,
-                event_handler=_event_handler,
-                suppress_env_files=True,
+            return self._api_client(effective_name, kubeconfig)
+        finally:
+            self._release(effective_name)
+
+    def _run_batch(
+        self,
+        *,
+        project_dir: str,
+        paths: list[str],
+        inventory: str,
+        extravars: dict[str, Any],
+        kubeconfig: str,
+        cluster: str,
+    ) -> None:
+        """Run ``paths`` through one wrapper playbook, naming a failing one."""
+        batch_path = _write_batch_playbook(paths)
+        current = [0]
+
+        def _track(event: dict[str, Any]) -> None:
+            if event.get("event") != "playbook_on_play_start":
+                return
+            play = (event.get("event_data") or {}).get("play") or ""
+            if play.startswith(_BATCH_MARKER):
+                current[0] = int(play[len(_BATCH_MARKER) :])
+
+        try:
+            self._run_playbook(
+                project_dir=project_dir,
+                playbook=batch_path,
+                inventory=inventory,
+                extravars=extravars,
+                kubeconfig=kubeconfig,
+                cluster=cluster,
+                playbooks=paths,
+                event_handler=_track,
+                current_playbook=lambda: paths[current[0]],
             )
+        finally:
+            _unlink_quietly(batch_path)
+
+    def _release(self, name: str) -> None:
+        """Apply the shutdown policy after a call on cluster ``name``."""
+        if self.shutdown == "call":
+            # Other threads may still be running on it: the last one deletes.
+            with phase("shutdown"):
+                self._registry.unhold(name, delete=True)
+        elif self.shutdown != "never":
+            with self._executor_lock:
+                self._used.add(name)
+
+    def _api_client(self, name: str, kubeconfig: str) -> client.ApiClient:
+        state = self._registry.get(name)
+        if state is None:
+            return self._api_clients.get(name, "", kubeconfig)
+        return self._api_clients.get(
+            name, state.generation or "", kubeconfig, content=state.kubeconfig
+        )
 
-            status = result.status
-            rc = result.rc
-            if not (status == "successful" and rc == 0):
-                raise PlaybookFailedError(
-                    playbook=resolved_playbook,
-                    status=status,
-                    rc=rc,
+    def _snapshot(self, name: str, kubeconfig: str) -> Snapshot | None:
+        """Record the watched resource types before a run, if there are any."""
+        if not self.snapshot:
+            return None
+        with phase("snapshot"):
+            return take_snapshot(self._api_client(name, kubeconfig), self.snapshot)
+
+    def _diff(self, name: str, kubeconfig: str, before: Snapshot | None) -> None:
+        if before is None:
+            return
+        with phase("snapshot"):
+            self._local.diff = diff_snapshot(
+                self._api_client(name, kubeconfig), before
+            )
+
+    def _cfg_path(self, project_dir: str, kind_config: str | None) -> str | None:
+        if kind_config is None:
+            return self._default_kind_cfg
+        if os.path.isabs(kind_config):
+            return kind_config
+        return os.path.join(project_dir, kind_config)
+
+    def _cluster(self, project_dir: str, kind_config: str | None) -> tuple[str, str]:
+        """Make sure the target cluster exists; return its name and kubeconfig."""
+        cfg_path = self._cfg_path(project_dir, kind_config)
+
+        # A suffix changes the name KIND would pick from the config, so it
+        # must be passed explicitly as well.
+        explicit_name = self.name is not None or bool(self.name_suffix)
+        effective_name = _cluster_name(
+            cfg_path, self.name, self.name_suffix, index=self._index
+        )
+
+        tag(cluster=effective_name)
+
+        if self._provisioner is not None:
+            with phase("wait_provisioned"):
+                self._provisioner.wait(effective_name)
+
+        if self.shutdown == "call":
+            self._registry.hold(effective_name)
+        try:
+            self._registry.ensure(
+                name=effective_name,
+                wait=self.wait,
+                cfg_path=cfg_path,
+                use_name_arg=explicit_name,
+            )
+            kubeconfig = self._registry.kubeconfig_path(effective_name)
+
+            if (
+                self.images
+                and self._image_loader is not None
+                and self._registry.provider.is_kind
+            ):
+                state = self._registry.get(effective_name)
+                self._image_loader.load(
+                    effective_name, state.generation if state else "", self.images
                 )
+        except BaseException:
+            # The call never started, so it does not trigger a delete either.
+            if self.shutdown == "call":
+                self._registry.unhold(effective_name)
+            raise
+
+        return effective_name, kubeconfig
+
+    def _isolated(
+        self, cluster: str, kubeconfig: str, extravars: dict[str, Any] | None
+    ) -> dict[str, Any] | None:
+        """Add the current test's namespace extravars when isolation is on."""
+        if self._isolation is None:
+            return extravars
+        with phase("isolation"):
+            iso_vars = self._isolation.extravars(
+                current_nodeid(), kubeconfig, cluster
+            )
+        return {**iso_vars, **(extravars or {})}
+
+    def _cache_key(
+        self,
+        playbook: str,
+        *,
+        roles_path: str,
+        inventory: str,
+        extravars: dict[str, Any] | None,
+        cluster: str,
+    ) -> str | None:
+        """
+        Playbook cache key for one run, or ``None`` if the run must not be
+        cached because not every file the playbook reads can be hashed.
+        """
+        dependencies = self._index.dependencies(playbook, roles_path, inventory)
+        if dependencies is None:
+            return None
+        with open(inventory, "r", encoding="utf-8") as fh:
+            inventory_text = fh.read()
+        state = self._registry.get(cluster)
+        return playbook_cache_key(
+            playbook=playbook,
+            roles_path=roles_path,
+            inventory=inventory_text,
+            extravars=extravars,
+            cluster=cluster,
+            generation=state.generation if state else None,
+            dependencies=dependencies,
+        )
+
+    def _inventory(
+        self,
+        project_dir: str,
+        inventory_file: str | None,
+        host_patterns: Callable[[], list[str]],
+    ) -> str:
+        """
+        Return the inventory to use: ``inventory_file`` if given, otherwise
+        the index's shared inventory for the playbooks' host patterns.
+        """
+        if inventory_file:
+            return _resolve_inventory_path(project_dir, inventory_file)
+
+        with phase("inventory"):
+            return self._index.inventory(host_patterns() or ["localhost"])
+
+    def _run_playbook(
+        self,
+        *,
+        project_dir: str,
+        playbook: str,
+        inventory: str,
+        extravars: dict[str, Any] | None,
+        kubeconfig: str,
+        cluster: str | None = None,
+        playbooks: list[str] | None = None,
+        event_handler: Callable[[dict[str, Any]], None] | None = None,
+        current_playbook: Callable[[], str] | None = None,
+    ) -> Any:
+        """
+        Run one playbook through ansible-runner and raise
+        ``PlaybookFailedError`` (with the tail of its output) unless it
+        succeeded. ``current_playbook`` names the playbook being executed,
+        for batches whose wrapper is not the playbook to report;
+        ``playbooks`` are the project playbooks it runs, for fact cache stats.
+        """
+        import ansible_runner
+
+        current = current_playbook or (lambda: playbook)
+        ident = uuid.uuid4().hex
+        output = OutputPipeline(self.output, tail_lines=self.output_tail)
+        handlers = [h for h in (event_handler, output) if h is not None]
+        if self._profiler is not None:
+            handlers.append(
+                self._profiler.handler(lambda: os.path.relpath(current(), project_dir))
+            )
+
+        envvars = {"KUBECONFIG": kubeconfig, "ANSIBLE_FORCE_COLOR": "1"}
+        # Without a FactCache, ansible-runner would write facts to a new dir
+        # per run, which is thrown away with the artifacts; keep them in memory.
+        fact_kwargs: dict[str, Any] = {"fact_cache_type": "memory"}
+        fact_run: FactRun | None = None
+        if self._facts is not None and cluster is not None:
+            state = self._registry.get(cluster)
+            fact_kwargs = self._facts.runner_kwargs(
+                cluster, state.generation if state else None
+            )
+            envvars.update(self._facts.envvars())
+            fact_run = self._facts.run(
+                sum(self._index.gathering_plays(pb) for pb in playbooks or [playbook])
+            )
+            handlers.append(fact_run)
+
+        write_events = self._artifacts.may_keep
+
+        def _event_handler(event: dict[str, Any]) -> bool:
+            for handler in handlers:
+                handler(event)
+            # ansible-runner writes the event to job_events/ only when true.
+            return write_events
+
+        # With a worker pool, ansible-runner starts its client, not ansible-playbook.
+        worker_kwargs: dict[str, Any] = {}
+        if self._workers is not None:
+            worker_kwargs = self._workers.runner_kwargs(playbook)
 
-            config.load_kube_config(config_file=kubeconfig)
-            return client.ApiClient()
+        failed = True
+        try:
+            with phase("ansible_run"):
+                result = ansible_runner.run(
+                    private_data_dir=project_dir,
+                    project_dir=project_dir,
+                    playbook=playbook,
+                    inventory=inventory,
+                    extravars=extravars or {},
+                    envvars=envvars,
+                    roles_path=os.path.join(project_dir, "roles"),
+                    artifact_dir=self._artifacts.scratch(),
+                    ident=ident,
+                    # OutputPipeline is the only writer to stdout.
+                    quiet=True,
+                    json_mode=False,
+                    event_handler=_event_handler,
+                    suppress_env_files=True,
+                    **fact_kwargs,
+                    **worker_kwargs,
+                )
+            failed = not (result.status == "successful" and result.rc == 0)
         finally:
-            if temp_inv_path and os.path.exists(temp_inv_path):
-                try:
-                    os.unlink(temp_inv_path)
-                except OSError:
-                    pass
-            if artifact_dir and os.path.isdir(artifact_dir):
-                shutil.rmtree(artifact_dir, ignore_errors=True)
-            if self.shutdown:
-                subprocess.run(
-                    ["kind", "delete", "cluster", f"--name={effective_name}"],
-                    check=False,
+            output.finish(failed)
+            if fact_run is not None:
+                fact_run.finish()
+            archive = self._artifacts.finish(
+                ident,
+                failed=failed,
+                nodeid=current_nodeid(),
+                playbook=os.path.relpath(current(), project_dir),
+            )
+
+        if failed:
+            raise PlaybookFailedError(
+                playbook=current(),
+                status=result.status,
+                rc=result.rc,
+                output=output.tail() or None,
+                artifacts=archive,
+            )
+        return result
+
+    def run_matrix(
+        self,
+        playbook: str,
+        kind_configs: list[str],
+        *,
+        raise_on_error: bool = True,
+        project_dir: str | None = None,
+        extravars: dict[str, Any] | None = None,
+        inventory_file: str | None = None,
+    ) -> dict[str, MatrixRun]:
+        """
+        Run ``playbook`` on one cluster per entry of ``kind_configs``, all at
+        once: the clusters are created concurrently and each runs the
+        playbook as soon as it is ready, so the wall time is that of the
+        slowest topology rather than the sum.
+
+        Returns a :class:`MatrixRun` per config, in order, with the run's
+        snapshot diff in ``diff``. Every run is allowed to finish; then, with
+        ``raise_on_error``, the first failure (in config order) is raised.
+        The configs must name distinct clusters.
+        """
+        if not kind_configs:
+            raise ValueError("run_matrix() needs at least one kind config")
+
+        resolved_project_dir = project_dir or self.project_dir
+        clusters: dict[str, str] = {}
+        for kind_config in kind_configs:
+            name = _cluster_name(
+                self._cfg_path(resolved_project_dir, kind_config),
+                self.name,
+                self.name_suffix,
+                index=self._index,
+            )
+            for other, other_name in clusters.items():
+                if other_name == name:
+                    raise KindConfigError(
+                        f"cluster {name!r} is also the cluster of {other!r}; "
+                        "give each matrix config its own name",
+                        kind_config,
+                    )
+            clusters[kind_config] = name
+
+        def _run(kind_config: str) -> MatrixRun:
+            start = time.perf_counter()
+            try:
+                api_client = self(
+                    playbook,
+                    project_dir=project_dir,
+                    extravars=extravars,
+                    inventory_file=inventory_file,
+                    kind_config=kind_config,
+                )
+            except Exception as exc:
+                return MatrixRun(
+                    kind_config,
+                    clusters[kind_config],
+                    time.perf_counter() - start,
+                    error=exc,
                 )
+            return MatrixRun(
+                kind_config,
+                clusters[kind_config],
+                time.perf_counter() - start,
+                api_client=api_client,
+                diff=self.last_diff,
+            )
+
+        with ThreadPoolExecutor(
+            max_workers=len(clusters), thread_name_prefix="kind-matrix"
+        ) as pool:
+            runs = dict(zip(clusters, pool.map(_run, clusters)))
+        if raise_on_error:
+            for run in runs.values():
+                if run.error is not None:
+                    raise run.error
+        return runs
+
+    def submit(self, playbook: str, **kwargs: Any) -> RunFuture:
+        """
+        Run a playbook on the runner's thread pool.
+
+        Takes the same arguments as calling the runner and returns a
+        :class:`RunFuture` resolving to the ``ApiClient`` (or raising the
+        same errors, e.g. ``PlaybookFailedError``), with the run's snapshot
+        diff in ``diff``. Each run gets its own artifact dir and generated
+        inventories are never modified once written, so independent
+        playbooks, e.g. against different namespaces or clusters, can run
+        side by side.
+        """
+        future = RunFuture()
+
+        def _run() -> None:
+            if not future.set_running_or_notify_cancel():
+                return
+            try:
+                api_client = self(playbook, **kwargs)
+            except BaseException as exc:
+                future.diff = self.last_diff
+                future.set_exception(exc)
+            else:
+                future.diff = self.last_diff
+                future.set_result(api_client)
+
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self._max_workers,
+                    thread_name_prefix="kind-runner",
+                )
+            self._executor.submit(_run)
+        return future
+
+    def wait_for(
+        self, api_client: client.ApiClient, *waits: Wait, timeout: float | str = 120.0
+    ) -> list[dict[str, Any]]:
+        """
+        Block until every object in ``waits`` (see :mod:`pytest_ansible_kind.waits`)
+        is ready, using watch streams instead of polling. All waits share one
+        ``timeout`` (seconds, or a duration like ``"2m"``) and run concurrently.
+        Returns the objects as dicts; raises ``WaitError`` on timeout or if an
+        object fails, e.g. a failed Job.
+        """
+        with phase("wait"):
+            return wait_all(api_client, list(waits), timeout=timeout)
+
+    async def run_async(self, playbook: str, **kwargs: Any) -> client.ApiClient:
+        """Awaitable variant of :meth:`submit` for use with ``asyncio.gather``."""
+        import asyncio
+
+        return await asyncio.wrap_future(self.submit(playbook, **kwargs))
+
+    def close(self) -> None:
+        """
+        Wait for submitted runs and release the thread pool. Clusters used
+        under the ``module`` policy are deleted now; under ``session`` they
+        are left to the registry, which deletes them when it is closed.
+        """
+        with self._executor_lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+        with self._executor_lock:
+            used, self._used = self._used, set()
+        if self.shutdown == "module":
+            self._registry.delete_many(used)
+        elif self.shutdown == "session":
+            for name in used:
+                self._registry.schedule_delete(name)
+        if self._owns_api_clients:
+            self._api_clients.close()
+        if self._owns_registry:
+            self._registry.close()
+        if self._owns_index:
+            self._index.close()
+        if self._owns_artifacts:
+            self._artifacts.close()
 
 
 @contextmanager
@@ -273,8 +871,26 @@ def kind_session(
     *,
     name: str | None = None,
     wait: str = "120s",
-    shutdown: bool = False,
+    shutdown: bool | str = False,
     kind_cfg: str | None = None,
+    name_suffix: str | None = None,
+    registry: ClusterRegistry | None = None,
+    playbook_cache: PlaybookCache | None = None,
+    provisioner: ClusterProvisioner | None = None,
+    output: str = "full",
+    output_tail: int = 200,
+    profiler: TaskProfiler | None = None,
+    tracer: PhaseTracer | None = None,
+    isolation: NamespaceIsolation | None = None,
+    images: list[str] | None = None,
+    image_loader: ImageLoader | None = None,
+    api_clients: ApiClientPool | None = None,
+    provider: ClusterProvider | None = None,
+    index: ProjectIndex | None = None,
+    artifacts: ArtifactStore | None = None,
+    facts: FactCache | None = None,
+    snapshot: list[str] | None = None,
+    workers: AnsibleWorkerPool | None = None,
 ) -> Generator[KindRunner, None, None]:
     runner = KindRunner(
         project_dir=project_dir,
@@ -282,5 +898,26 @@ def kind_session(
         wait=wait,
         shutdown=shutdown,
         default_kind_cfg=kind_cfg,
+        name_suffix=name_suffix,
+        registry=registry,
+        playbook_cache=playbook_cache,
+        provisioner=provisioner,
+        output=output,
+        output_tail=output_tail,
+        profiler=profiler,
+        tracer=tracer,
+        isolation=isolation,
+        images=images,
+        image_loader=image_loader,
+        api_clients=api_clients,
+        provider=provider,
+        index=index,
+        artifacts=artifacts,
+        facts=facts,
+        snapshot=snapshot,
+        workers=workers,
     )
-    yield runner
+    try:
+        yield runner
+    finally:
+        runner.close()
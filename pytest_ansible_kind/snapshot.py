@@ -0,0 +1,237 @@
+from __future__ import annotations
+
+import json
+import re
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Callable, Iterator, TypeVar
+
+if TYPE_CHECKING:
+    from kubernetes import client
+
+T = TypeVar("T")
+
+# Metadata only for the "before" lists; servers that cannot transform the
+# list fall back to plain JSON, which carries the same metadata.
+_METADATA_ONLY = (
+    "application/json;as=PartialObjectMetadataList;g=meta.k8s.io;v=v1,"
+    "application/json"
+)
+_PAGE_SIZE = 500
+_RESOURCE = re.compile(r"^(?:([a-z0-9.-]+)/)?(v\d+[a-z0-9]*)/([a-z0-9]+)$")
+
+# Per object: (uid, resourceVersion), keyed by "namespace/name" (or "name").
+Index = dict[str, tuple[str, str]]
+Objects = dict[str, dict[str, dict[str, Any]]]
+
+
+def parse_resource(raw: str) -> str:
+    """
+    API path listing a resource type in every namespace, from ``v1/pods`` or
+    ``apps/v1/deployments`` (``group/version/plural``).
+    """
+    match = _RESOURCE.match(raw.strip())
+    if match is None:
+        raise ValueError(
+            f"invalid resource type {raw!r}, expected e.g. v1/pods or "
+            "apps/v1/deployments"
+        )
+    group, version, plural = match.groups()
+    if group:
+        return f"/apis/{group}/{version}/{plural}"
+    return f"/api/{version}/{plural}"
+
+
+def _key(meta: dict[str, Any]) -> str:
+    name = meta.get("name", "")
+    namespace = meta.get("namespace")
+    return f"{namespace}/{name}" if namespace else name
+
+
+def _gvk(page: dict[str, Any], path: str) -> str:
+    kind = page.get("kind") or ""
+    if page.get("apiVersion") and kind.endswith("List"):
+        return f"{page['apiVersion']}/{kind[: -len('List')]}"
+    return path.split("/", 2)[2]
+
+
+def _get_json(
+    api_client: client.ApiClient,
+    path: str,
+    query: list[tuple[str, Any]],
+    accept: str,
+    timeout: float,
+) -> dict[str, Any]:
+    headers = {"Accept": accept}
+    if hasattr(api_client, "param_serialize"):
+        from kubernetes.client.rest import ApiException
+
+        request = api_client.param_serialize(
+            "GET",
+            path,
+            query_params=query,
+            header_params=headers,
+            auth_settings=["BearerToken"],
+        )
+        resp = api_client.call_api(*request, _request_timeout=timeout)
+        data = resp.read()
+        if not 200 <= resp.status <= 299:
+            raise ApiException.from_response(http_resp=resp, body=None, data=None)
+    else:
+        # kubernetes < 35 sends the request from call_api itself.
+        data = api_client.call_api(
+            path,
+            "GET",
+            query_params=query,
+            header_params=headers,
+            auth_settings=["BearerToken"],
+            _return_http_data_only=True,
+            _preload_content=False,
+            _request_timeout=timeout,
+        ).data
+    return json.loads(data)
+
+
+def _pages(
+    api_client: client.ApiClient, path: str, accept: str, timeout: float
+) -> Iterator[dict[str, Any]]:
+    """List ``path`` in pages, so only one page is ever held in memory."""
+    token = ""
+    while True:
+        query: list[tuple[str, Any]] = [("limit", _PAGE_SIZE)]
+        if token:
+            query.append(("continue", token))
+        page = _get_json(api_client, path, query, accept, timeout)
+        yield page
+        token = (page.get("metadata") or {}).get("continue") or ""
+        if not token:
+            return
+
+
+def _concurrently(
+    fn: Callable[[str], T], paths: tuple[str, ...], max_workers: int
+) -> list[T]:
+    if len(paths) == 1:
+        return [fn(paths[0])]
+    with ThreadPoolExecutor(
+        max_workers=min(max_workers, len(paths)) or 1,
+        thread_name_prefix="kind-snapshot",
+    ) as pool:
+        return list(pool.map(fn, paths))
+
+
+@dataclass
+class Snapshot:
+    """uid and resourceVersion of every object of the watched types."""
+
+    paths: tuple[str, ...]
+    objects: dict[str, Index]
+
+    def __len__(self) -> int:
+        return sum(len(index) for index in self.objects.values())
+
+
+@dataclass
+class ClusterDiff:
+    """
+    What changed between a snapshot and now, as ``{gvk: {key: object}}``.
+
+    GVKs read like ``apps/v1/Deployment`` (``v1/Pod`` for the core group),
+    keys are ``namespace/name`` or just the name of cluster-scoped objects.
+    Created and modified entries are the objects as they are now; deleted
+    ones only carry their last known ``metadata``. An object deleted and
+    created again under the same name shows up in both.
+    """
+
+    created: Objects = field(default_factory=dict)
+    modified: Objects = field(default_factory=dict)
+    deleted: Objects = field(default_factory=dict)
+
+    def __bool__(self) -> bool:
+        return bool(self.created or self.modified or self.deleted)
+
+    def __str__(self) -> str:
+        counts = (
+            f"{sum(len(v) for v in bucket.values())} {label}"
+            for label, bucket in (
+                ("created", self.created),
+                ("modified", self.modified),
+                ("deleted", self.deleted),
+            )
+        )
+        return ", ".join(counts)
+
+
+def take_snapshot(
+    api_client: client.ApiClient,
+    resources: list[str],
+    timeout: float = 60.0,
+    max_workers: int = 8,
+) -> Snapshot:
+    """
+    Record the objects of each type in ``resources`` (see
+    :func:`parse_resource`), listing the types concurrently and fetching
+    metadata only.
+    """
+    paths = tuple(dict.fromkeys(parse_resource(r) for r in resources))
+
+    def index(path: str) -> Index:
+        found: Index = {}
+        for page in _pages(api_client, path, _METADATA_ONLY, timeout):
+            for item in page.get("items") or []:
+                meta = item.get("metadata") or {}
+                found[_key(meta)] = (
+                    meta.get("uid", ""),
+                    meta.get("resourceVersion", ""),
+                )
+        return found
+
+    return Snapshot(paths, dict(zip(paths, _concurrently(index, paths, max_workers))))
+
+
+def diff_snapshot(
+    api_client: client.ApiClient,
+    before: Snapshot,
+    timeout: float = 60.0,
+    max_workers: int = 8,
+) -> ClusterDiff:
+    """
+    List the types of ``before`` again and compare. Objects whose uid and
+    resourceVersion are unchanged are dropped as their page is read, so
+    only the changed ones are kept.
+    """
+
+    def compare(path: str) -> tuple[str, Objects]:
+        old = before.objects[path]
+        gone = set(old)
+        gvk = ""
+        changes: Objects = {"created": {}, "modified": {}, "deleted": {}}
+        for page in _pages(api_client, path, "application/json", timeout):
+            gvk = gvk or _gvk(page, path)
+            for item in page.get("items") or []:
+                meta = item.get("metadata") or {}
+                key = _key(meta)
+                gone.discard(key)
+                seen = old.get(key)
+                if seen is None:
+                    changes["created"][key] = item
+                elif seen[0] != meta.get("uid", ""):
+                    changes["created"][key] = item
+                    gone.add(key)
+                elif seen[1] != meta.get("resourceVersion", ""):
+                    changes["modified"][key] = item
+        for key in gone:
+            namespace, _, name = key.rpartition("/")
+            uid, rv = old[key]
+            meta = {"name": name, "uid": uid, "resourceVersion": rv}
+            if namespace:
+                meta["namespace"] = namespace
+            changes["deleted"][key] = {"metadata": meta}
+        return gvk, changes
+
+    result = ClusterDiff()
+    for gvk, changes in _concurrently(compare, before.paths, max_workers):
+        for label, objects in changes.items():
+            if objects:
+                getattr(result, label)[gvk] = objects
+    return result
@@ -0,0 +1,178 @@
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Callable, Iterator
+
+from .profiling import Timing
+
+
+@dataclass
+class Span:
+    """One timed lifecycle phase."""
+
+    name: str
+    start: float
+    duration: float
+    pid: int
+    tid: int
+    tags: dict[str, str] = field(default_factory=dict)
+
+
+class PhaseTracer:
+    """
+    Collect :class:`Span` records for the phases of ``KindRunner`` calls.
+
+    Code under measurement does not hold a tracer; it opens
+    :func:`phase` blocks, which record into whichever tracer was activated
+    for the current context with :func:`tracing`. Callbacks registered with
+    :meth:`subscribe` see every finished span.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.spans: list[Span] = []
+        self._listeners: list[Callable[[Span], None]] = []
+
+    def subscribe(self, callback: Callable[[Span], None]) -> None:
+        self._listeners.append(callback)
+
+    @contextmanager
+    def span(self, name: str, **tags: str) -> Iterator[None]:
+        wall = time.time()
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            span = Span(
+                name=name,
+                start=wall,
+                duration=time.perf_counter() - t0,
+                pid=os.getpid(),
+                tid=threading.get_ident(),
+                tags={k: v for k, v in tags.items() if v},
+            )
+            with self._lock:
+                self.spans.append(span)
+            for callback in list(self._listeners):
+                callback(span)
+
+    def durations(self) -> dict[str, Timing]:
+        out: dict[str, Timing] = {}
+        with self._lock:
+            for span in self.spans:
+                out.setdefault(span.name, Timing()).add(span.duration)
+        return out
+
+    def summary_lines(self, n: int) -> list[str]:
+        phases = sorted(
+            self.durations().items(), key=lambda kv: kv[1].total, reverse=True
+        )
+        lines = [f"{'phase':<20} {'total':>9} {'count':>6} {'mean':>8} {'max':>8}"]
+        for name, t in phases:
+            lines.append(
+                f"{name:<20} {t.total:8.2f}s {t.count:6d} "
+                f"{t.total / t.count:7.2f}s {t.max:7.2f}s"
+            )
+        with self._lock:
+            slowest = sorted(self.spans, key=lambda s: s.duration, reverse=True)[:n]
+        if slowest:
+            lines.append(f"slowest {n} phases:")
+            for span in slowest:
+                where = " ".join(f"{k}={v}" for k, v in sorted(span.tags.items()))
+                lines.append(f"{span.duration:8.2f}s {span.name:<20} {where}")
+        return lines
+
+    def chrome_events(self, process_name: str | None = None) -> list[dict[str, Any]]:
+        """Spans as Chrome trace-event "complete" events (microseconds)."""
+        with self._lock:
+            spans = list(self.spans)
+        events: list[dict[str, Any]] = []
+        if process_name is not None:
+            events.append(
+                {
+                    "name": "process_name",
+                    "ph": "M",
+                    "pid": os.getpid(),
+                    "args": {"name": process_name},
+                }
+            )
+        for span in spans:
+            events.append(
+                {
+                    "name": span.name,
+                    "cat": "kind",
+                    "ph": "X",
+                    "ts": int(span.start * 1_000_000),
+                    "dur": int(span.duration * 1_000_000),
+                    "pid": span.pid,
+                    "tid": span.tid,
+                    "args": span.tags,
+                }
+            )
+        return events
+
+
+def write_chrome_trace(path: str, events: list[dict[str, Any]]) -> None:
+    with open(path, "w", encoding="utf-8") as fh:
+        json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, fh)
+
+
+def read_chrome_trace(path: str) -> list[dict[str, Any]]:
+    with open(path, "r", encoding="utf-8") as fh:
+        return json.load(fh).get("traceEvents", [])
+
+
+_active: ContextVar[tuple[PhaseTracer, dict[str, str]] | None] = ContextVar(
+    "pytest_ansible_kind_tracer", default=None
+)
+
+
+@contextmanager
+def tracing(tracer: PhaseTracer | None, **tags: str) -> Iterator[None]:
+    """
+    Make ``tracer`` the target of :func:`phase` in this context, adding
+    ``tags`` to every span. Nested calls without a tracer only add tags.
+    """
+    current = _active.get()
+    if tracer is None:
+        if current is None:
+            yield
+            return
+        tracer = current[0]
+    merged = {**(current[1] if current else {}), **tags}
+    token = _active.set((tracer, merged))
+    try:
+        yield
+    finally:
+        _active.reset(token)
+
+
+def tag(**tags: str) -> None:
+    """Add ``tags`` to the innermost active :func:`tracing` block, if any."""
+    current = _active.get()
+    if current is not None:
+        current[1].update(tags)
+
+
+@contextmanager
+def phase(name: str, **tags: str) -> Iterator[None]:
+    """Time the enclosed block as phase ``name`` if tracing is active."""
+    current = _active.get()
+    if current is None:
+        yield
+        return
+    tracer, ctx = current
+    with tracer.span(name, **{**ctx, **tags}):
+        yield
+
+
+def current_nodeid() -> str:
+    """Node id of the running test, from ``PYTEST_CURRENT_TEST``."""
+    raw = os.environ.get("PYTEST_CURRENT_TEST", "")
+    return raw.rsplit(" ", 1)[0] if raw else ""
@@ -1,11 +1,26 @@
 from __future__ import annotations
 
+import os
 from pathlib import Path
 from typing import Tuple
 
 import pytest
 
+from .artifacts import RETENTION_MODES, parse_size
 from .exceptions import ProjectDirError
+from .facts import FACT_CACHE_MODES
+from .images import is_archive
+from .isolation import ISOLATION_MODES
+from .output import OUTPUT_MODES
+from .registry import shutdown_policy
+from .snapshot import parse_resource
+from .providers import (
+    PROVIDERS,
+    ClusterProvider,
+    FakeProvider,
+    KindProvider,
+    KubeconfigProvider,
+)
 
 
 def default_kind_config_from_pytest(request: pytest.FixtureRequest) -> str | None:
@@ -19,8 +34,11 @@ def default_kind_config_from_pytest(request: pytest.FixtureRequest) -> str | Non
     If neither is set or the value is empty, returns None (KIND defaults).
     If the path is relative, it is resolved against pytest's rootpath.
     """
-    cfg = request.config
+    return default_kind_config(request.config)
+
 
+def default_kind_config(cfg: pytest.Config) -> str | None:
+    """Config-only variant of :func:`default_kind_config_from_pytest`."""
     path_opt = cfg.getoption("kind_config")
     path_ini = (cfg.getini("kind_config") or "").strip()
     raw_path = path_opt or path_ini
@@ -43,7 +61,12 @@ def infer_project_dir_from_request(request: pytest.FixtureRequest) -> str:
     ``tests`` and returns its parent. If no such directory is found,
     falls back to two levels up from the test file.
     """
-    test_path = Path(str(request.node.path)).resolve()
+    return infer_project_dir(Path(str(request.node.path)))
+
+
+def infer_project_dir(test_path: Path) -> str:
+    """Path-only variant of :func:`infer_project_dir_from_request`."""
+    test_path = test_path.resolve()
     cur = test_path.parent
 
     while True:
@@ -59,28 +82,47 @@ def infer_project_dir_from_request(request: pytest.FixtureRequest) -> str:
 
 def resolve_project_dir_and_shutdown(
     request: pytest.FixtureRequest,
-) -> Tuple[str, bool]:
+) -> Tuple[str, str]:
     """
-    Resolve the effective project directory and shutdown flag from pytest config.
+    Resolve the effective project directory and shutdown policy from pytest config.
 
     Precedence for project_dir:
     1. --kind-project-dir CLI option
     2. kind_project_dir in [pytest] section
     3. Inferred from the test file path via infer_project_dir_from_request.
 
-    Precedence for shutdown:
-    1. --kind-shutdown CLI flag (True/False by presence)
-    2. kind_shutdown in [pytest] section (parsed as bool, default false)
+    The shutdown policy comes from :func:`resolve_shutdown`.
     """
     cfg = request.config
+    return resolve_project_dir(cfg, Path(str(request.node.path))), resolve_shutdown(cfg)
+
+
+def resolve_shutdown(config: pytest.Config) -> str:
+    """
+    Resolve the shutdown policy: call, module, session or never.
 
-    # Shutdown resolution
-    shutdown_flag: bool | None = cfg.getoption("kind_shutdown")
-    shutdown_ini_raw = (cfg.getini("kind_shutdown") or "false").strip().lower()
-    shutdown_ini = shutdown_ini_raw in ("1", "true", "yes", "on")
-    shutdown = shutdown_flag if shutdown_flag is not None else shutdown_ini
+    Precedence:
+    1. --kind-shutdown-policy=POLICY CLI option
+    2. --kind-shutdown CLI flag, meaning session
+    3. kind_shutdown in [pytest] section (default false). true maps to
+       session, false to never.
+    """
+    raw = (
+        config.getoption("kind_shutdown_policy")
+        or config.getoption("kind_shutdown")
+        or config.getini("kind_shutdown")
+    )
+    try:
+        return shutdown_policy(raw)
+    except ValueError as exc:
+        raise pytest.UsageError(f"kind_shutdown: {exc}") from None
 
-    # Project dir resolution
+
+def resolve_project_dir(cfg: pytest.Config, test_path: Path) -> str:
+    """
+    Resolve the project directory for a test file, with the same precedence
+    as :func:`resolve_project_dir_and_shutdown`.
+    """
     proj_cli = cfg.getoption("kind_project_dir")
     proj_ini = (cfg.getini("kind_project_dir") or "").strip()
 
@@ -89,11 +131,324 @@ def resolve_project_dir_and_shutdown(
     elif proj_ini:
         project_dir = str(Path(proj_ini).resolve())
     else:
-        project_dir = infer_project_dir_from_request(request)
+        project_dir = infer_project_dir(test_path)
 
     if not Path(project_dir).is_dir():
         raise ProjectDirError(
             "Project directory does not exist", project_dir=project_dir
         )
 
-    return project_dir, shutdown
+    return project_dir
+
+
+def kind_config_from_marker(
+    marker: pytest.Mark | None, project_dir: str
+) -> str | None:
+    """
+    Resolve the config path of a ``kind_cluster`` marker.
+
+    Accepts ``@pytest.mark.kind_cluster("cfg.yaml")`` or
+    ``@pytest.mark.kind_cluster(config="cfg.yaml")``. Relative paths are
+    resolved against the project dir, like the ``kind_config`` argument of
+    ``KindRunner``. Returns None if there is no marker or no config.
+    """
+    if marker is None:
+        return None
+    raw = marker.kwargs.get("config", marker.args[0] if marker.args else None)
+    if not raw:
+        return None
+    p = Path(raw)
+    if not p.is_absolute():
+        p = Path(project_dir) / raw
+    return str(p)
+
+
+def matrix_configs_from_marker(
+    marker: pytest.Mark | None, project_dir: str
+) -> list[str]:
+    """
+    Config paths of a ``kind_matrix`` marker, relative ones resolved against
+    the project dir like ``kind_config_from_marker``.
+    """
+    if marker is None:
+        return []
+    return [
+        str(p if p.is_absolute() else Path(project_dir) / p)
+        for p in (Path(str(raw)) for raw in marker.args)
+    ]
+
+
+def _resolve_image(raw: str, base: str | os.PathLike[str]) -> str:
+    if is_archive(raw) and not Path(raw).is_absolute():
+        return str(Path(base) / raw)
+    return raw
+
+
+def resolve_images(
+    config: pytest.Config, marker: pytest.Mark | None, project_dir: str
+) -> list[str]:
+    """
+    Images to load into a cluster: the ``kind_images`` ini list followed by
+    the arguments of a ``kind_images`` marker.
+
+    Entries ending in ``.tar``, ``.tar.gz`` or ``.tgz`` are image archives;
+    relative ones are resolved against rootpath (ini) or the project dir
+    (marker). Anything else is a local docker image reference.
+    """
+    images = [
+        _resolve_image(raw.strip(), config.rootpath)
+        for raw in config.getini("kind_images") or []
+        if raw.strip()
+    ]
+    if marker is not None:
+        images += [_resolve_image(str(raw), project_dir) for raw in marker.args]
+    return list(dict.fromkeys(images))
+
+
+def resolve_snapshot(config: pytest.Config, marker: pytest.Mark | None) -> list[str]:
+    """
+    Resource types to diff around playbook runs: the ``kind_snapshot`` ini
+    list followed by the arguments of a ``kind_snapshot`` marker.
+    """
+    raw = [r.strip() for r in config.getini("kind_snapshot") or [] if r.strip()]
+    if marker is not None:
+        raw += [str(r) for r in marker.args]
+    for resource in raw:
+        try:
+            parse_resource(resource)
+        except ValueError as exc:
+            raise pytest.UsageError(f"kind_snapshot: {exc}") from None
+    return list(dict.fromkeys(raw))
+
+
+def _parse_bool(raw: str | None, default: str = "false") -> bool:
+    return (raw or default).strip().lower() in ("1", "true", "yes", "on")
+
+
+def bool_option(config: pytest.Config, name: str) -> bool:
+    """
+    Resolve a boolean plugin setting: the CLI flag (when given) wins over
+    the ini value of the same name.
+    """
+    flag: bool | None = config.getoption(name)
+    if flag is not None:
+        return flag
+    return _parse_bool(config.getini(name))
+
+
+def xdist_worker_id() -> str | None:
+    """
+    Return the pytest-xdist worker id (e.g. ``gw3``) of this process.
+
+    Returns None when not running under an xdist worker.
+    """
+    worker = os.environ.get("PYTEST_XDIST_WORKER", "").strip()
+    return worker or None
+
+
+def worker_output_path(path: str) -> str:
+    """
+    Return ``path`` unchanged, or with ``.<worker id>`` appended inside an
+    xdist worker so that workers never write the same report file.
+    """
+    worker = xdist_worker_id()
+    return f"{path}.{worker}" if worker else path
+
+
+def resolve_cluster_name_suffix(config: pytest.Config) -> str | None:
+    """
+    Resolve the per-worker cluster name suffix.
+
+    Precedence:
+    1. --kind-xdist-isolation CLI flag
+    2. kind_xdist_isolation in [pytest] section (parsed as bool, default false)
+
+    When isolation is enabled and this process is an xdist worker, the
+    worker id is returned so each worker gets its own cluster (and thus its
+    own kubeconfig). Otherwise returns None.
+    """
+    if not bool_option(config, "kind_xdist_isolation"):
+        return None
+    return xdist_worker_id()
+
+
+def resolve_output(config: pytest.Config) -> Tuple[str, int]:
+    """
+    Resolve the playbook output mode and failure tail size.
+
+    Precedence for the mode:
+    1. --kind-output CLI option
+    2. kind_output in [pytest] section (default "full")
+
+    The tail size comes from kind_output_tail (default 200 lines).
+    """
+    mode = (
+        config.getoption("kind_output")
+        or (config.getini("kind_output") or "full").strip().lower()
+    )
+    if mode not in OUTPUT_MODES:
+        raise pytest.UsageError(
+            f"kind_output must be one of {', '.join(OUTPUT_MODES)}, got {mode!r}"
+        )
+
+    raw_tail = (config.getini("kind_output_tail") or "200").strip()
+    try:
+        tail = int(raw_tail)
+    except ValueError:
+        raise pytest.UsageError(
+            f"kind_output_tail must be an integer, got {raw_tail!r}"
+        ) from None
+    return mode, tail
+
+
+def resolve_api_pool_maxsize(config: pytest.Config) -> int | None:
+    """
+    Connection-pool size of the pooled kubernetes ApiClients, from
+    kind_api_pool_maxsize. Empty keeps the kubernetes client default.
+    """
+    raw = (config.getini("kind_api_pool_maxsize") or "").strip()
+    if not raw:
+        return None
+    try:
+        size = int(raw)
+    except ValueError:
+        size = 0
+    if size < 1:
+        raise pytest.UsageError(
+            f"kind_api_pool_maxsize must be a positive integer, got {raw!r}"
+        )
+    return size
+
+
+def resolve_ansible_workers(config: pytest.Config) -> int:
+    """
+    Number of warm ansible-playbook workers to keep per project.
+
+    Precedence:
+    1. --kind-ansible-workers CLI option
+    2. kind_ansible_workers in [pytest] section (default 0, no pool)
+    """
+    option = config.getoption("kind_ansible_workers")
+    if option is not None:
+        raw = str(option)
+    else:
+        raw = (config.getini("kind_ansible_workers") or "0").strip()
+    try:
+        size = int(raw)
+    except ValueError:
+        size = -1
+    if size < 0:
+        raise pytest.UsageError(
+            f"kind_ansible_workers must be a non-negative integer, got {raw!r}"
+        )
+    return size
+
+
+def resolve_provider(config: pytest.Config) -> ClusterProvider:
+    """
+    Build the cluster provider.
+
+    Precedence for the provider name:
+    1. --kind-provider CLI option
+    2. kind_provider in [pytest] section (default "kind")
+
+    The kubeconfig provider reads kind_kubeconfig (relative to rootpath;
+    empty means $KUBECONFIG or ~/.kube/config) and kind_context.
+    """
+    name = (
+        config.getoption("kind_provider")
+        or (config.getini("kind_provider") or "kind").strip().lower()
+    )
+    if name not in PROVIDERS:
+        raise pytest.UsageError(
+            f"kind_provider must be one of {', '.join(PROVIDERS)}, got {name!r}"
+        )
+    if name == "fake":
+        return FakeProvider()
+    if name == "kind":
+        return KindProvider()
+
+    raw_path = (config.getini("kind_kubeconfig") or "").strip()
+    path: str | None = None
+    if raw_path:
+        p = Path(os.path.expanduser(raw_path))
+        path = str(p if p.is_absolute() else Path(config.rootpath) / p)
+    context = (config.getini("kind_context") or "").strip() or None
+    return KubeconfigProvider(path=path, context=context)
+
+
+def resolve_isolation(config: pytest.Config) -> str:
+    """
+    Resolve the test isolation mode.
+
+    Precedence:
+    1. --kind-isolation CLI option
+    2. kind_isolation in [pytest] section (default "none")
+    """
+    mode = (
+        config.getoption("kind_isolation")
+        or (config.getini("kind_isolation") or "none").strip().lower()
+    )
+    if mode not in ISOLATION_MODES:
+        raise pytest.UsageError(
+            f"kind_isolation must be one of {', '.join(ISOLATION_MODES)}, got {mode!r}"
+        )
+    return mode
+
+
+def resolve_artifacts(config: pytest.Config) -> Tuple[str, Path | None, int | None]:
+    """
+    Resolve artifact retention, archive dir and size budget.
+
+    Precedence for the retention:
+    1. --kind-artifacts CLI option
+    2. kind_artifacts in [pytest] section (default "never")
+
+    The dir comes from --kind-artifacts-dir or kind_artifacts_dir (relative
+    to rootpath); None means the pytest cache dir. The budget comes from
+    kind_artifacts_max_size (default 1G, empty or 0 for no limit).
+    """
+    retention = (
+        config.getoption("kind_artifacts")
+        or (config.getini("kind_artifacts") or "never").strip().lower()
+    )
+    if retention not in RETENTION_MODES:
+        raise pytest.UsageError(
+            f"kind_artifacts must be one of {', '.join(RETENTION_MODES)}, "
+            f"got {retention!r}"
+        )
+
+    raw_dir = (
+        config.getoption("kind_artifacts_dir")
+        or (config.getini("kind_artifacts_dir") or "").strip()
+    )
+    root: Path | None = None
+    if raw_dir:
+        p = Path(os.path.expanduser(raw_dir))
+        root = p if p.is_absolute() else Path(config.rootpath) / p
+
+    try:
+        max_bytes = parse_size(config.getini("kind_artifacts_max_size") or "")
+    except ValueError as exc:
+        raise pytest.UsageError(f"kind_artifacts_max_size: {exc}") from None
+    return retention, root, max_bytes
+
+
+def resolve_fact_cache(config: pytest.Config) -> str:
+    """
+    Resolve the Ansible fact cache mode.
+
+    Precedence:
+    1. --kind-fact-cache CLI option
+    2. kind_fact_cache in [pytest] section (default "none")
+    """
+    mode = (
+        config.getoption("kind_fact_cache")
+        or (config.getini("kind_fact_cache") or "none").strip().lower()
+    )
+    if mode not in FACT_CACHE_MODES:
+        raise pytest.UsageError(
+            f"kind_fact_cache must be one of {', '.join(FACT_CACHE_MODES)}, "
+            f"got {mode!r}"
+        )
+    return mode
@@ -0,0 +1,313 @@
+from __future__ import annotations
+
+import json
+import math
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, replace
+from typing import TYPE_CHECKING, Any, Callable
+
+from .exceptions import WaitError
+
+if TYPE_CHECKING:
+    from kubernetes import client
+
+Condition = Callable[[dict[str, Any]], bool]
+
+_DURATION = re.compile(r"^(\d+(?:\.\d+)?)\s*(ms|s|m|h)?$")
+_UNITS = {"ms": 0.001, "s": 1.0, "m": 60.0, "h": 3600.0}
+
+
+class ConditionFailed(Exception):
+    """Raised by a condition when the object can no longer become ready."""
+
+
+def seconds(timeout: float | str) -> float:
+    """Timeout in seconds from a number or a duration like ``90s`` or ``2m``."""
+    if isinstance(timeout, (int, float)):
+        return float(timeout)
+    match = _DURATION.match(timeout.strip())
+    if match is None:
+        raise ValueError(f"invalid timeout {timeout!r}, expected e.g. 30s or 2m")
+    return float(match.group(1)) * _UNITS[match.group(2) or "s"]
+
+
+def _status(obj: dict[str, Any]) -> dict[str, Any]:
+    return obj.get("status") or {}
+
+
+def _conditions(obj: dict[str, Any]) -> dict[str, dict[str, Any]]:
+    return {c.get("type"): c for c in _status(obj).get("conditions") or []}
+
+
+def _observed(obj: dict[str, Any]) -> bool:
+    generation = (obj.get("metadata") or {}).get("generation")
+    observed = _status(obj).get("observedGeneration")
+    return generation is None or (observed is not None and observed >= generation)
+
+
+def has_condition(type_: str, status: str = "True") -> Condition:
+    """Condition: ``status.conditions`` has ``type_`` with ``status``."""
+
+    def check(obj: dict[str, Any]) -> bool:
+        cond = _conditions(obj).get(type_)
+        return cond is not None and cond.get("status") == status
+
+    return check
+
+
+def deployment_ready(obj: dict[str, Any]) -> bool:
+    """The rollout finished, like ``kubectl rollout status``."""
+    progressing = _conditions(obj).get("Progressing") or {}
+    if progressing.get("reason") == "ProgressDeadlineExceeded":
+        raise ConditionFailed(
+            progressing.get("message") or "progress deadline exceeded"
+        )
+    if not _observed(obj):
+        return False
+    want = (obj.get("spec") or {}).get("replicas", 1)
+    st = _status(obj)
+    updated = st.get("updatedReplicas", 0)
+    return (
+        updated >= want
+        and st.get("replicas", 0) <= updated
+        and st.get("availableReplicas", 0) >= want
+    )
+
+
+def statefulset_ready(obj: dict[str, Any]) -> bool:
+    """All replicas ready and on the current revision."""
+    if not _observed(obj):
+        return False
+    want = (obj.get("spec") or {}).get("replicas", 1)
+    st = _status(obj)
+    if st.get("readyReplicas", 0) < want:
+        return False
+    strategy = (obj.get("spec") or {}).get("updateStrategy") or {}
+    if strategy.get("type", "RollingUpdate") != "RollingUpdate":
+        return True
+    return st.get("updateRevision") == st.get("currentRevision")
+
+
+def pod_ready(obj: dict[str, Any]) -> bool:
+    """The pod is Ready (or ran to completion)."""
+    phase = _status(obj).get("phase")
+    if phase == "Failed":
+        raise ConditionFailed(_status(obj).get("message") or "pod failed")
+    return phase == "Succeeded" or has_condition("Ready")(obj)
+
+
+def job_complete(obj: dict[str, Any]) -> bool:
+    """The job completed; a failed job fails the wait at once."""
+    failed = _conditions(obj).get("Failed") or {}
+    if failed.get("status") == "True":
+        raise ConditionFailed(failed.get("message") or "job failed")
+    return has_condition("Complete")(obj)
+
+
+def crd_established(obj: dict[str, Any]) -> bool:
+    """The CRD's names are accepted and it is served."""
+    return has_condition("NamesAccepted")(obj) and has_condition("Established")(obj)
+
+
+@dataclass(frozen=True)
+class Wait:
+    """One object to wait for and the condition it has to meet."""
+
+    kind: str
+    name: str
+    namespace: str | None
+    condition: Condition
+    group: str = ""
+    version: str = ""
+    plural: str = ""
+
+    def __str__(self) -> str:
+        where = f"{self.namespace}/" if self.namespace else ""
+        return f"{self.kind} {where}{self.name}"
+
+    def until(self, condition: Condition) -> Wait:
+        """The same object with a custom ``condition``."""
+        return replace(self, condition=condition)
+
+
+def deployment(name: str, namespace: str = "default") -> Wait:
+    return Wait("deployment", name, namespace, deployment_ready)
+
+
+def statefulset(name: str, namespace: str = "default") -> Wait:
+    return Wait("statefulset", name, namespace, statefulset_ready)
+
+
+def pod(name: str, namespace: str = "default") -> Wait:
+    return Wait("pod", name, namespace, pod_ready)
+
+
+def job(name: str, namespace: str = "default") -> Wait:
+    return Wait("job", name, namespace, job_complete)
+
+
+def crd(name: str) -> Wait:
+    return Wait("customresourcedefinition", name, None, crd_established)
+
+
+def custom_object(
+    group: str,
+    version: str,
+    plural: str,
+    name: str,
+    namespace: str | None = None,
+    condition: Condition | None = None,
+) -> Wait:
+    """A custom resource; waits for its ``Ready`` condition by default."""
+    return Wait(
+        plural,
+        name,
+        namespace,
+        condition or has_condition("Ready"),
+        group=group,
+        version=version,
+        plural=plural,
+    )
+
+
+def _lister(
+    api_client: client.ApiClient, wait: Wait
+) -> tuple[Callable[..., Any], dict[str, Any]]:
+    from kubernetes import client
+
+    ns = {"namespace": wait.namespace}
+    if wait.plural:
+        api = client.CustomObjectsApi(api_client)
+        kwargs = {"group": wait.group, "version": wait.version, "plural": wait.plural}
+        if wait.namespace:
+            return api.list_namespaced_custom_object, {**kwargs, **ns}
+        return api.list_cluster_custom_object, kwargs
+    if wait.kind == "deployment":
+        return client.AppsV1Api(api_client).list_namespaced_deployment, ns
+    if wait.kind == "statefulset":
+        return client.AppsV1Api(api_client).list_namespaced_stateful_set, ns
+    if wait.kind == "pod":
+        return client.CoreV1Api(api_client).list_namespaced_pod, ns
+    if wait.kind == "job":
+        return client.BatchV1Api(api_client).list_namespaced_job, ns
+    if wait.kind == "customresourcedefinition":
+        api = client.ApiextensionsV1Api(api_client)
+        return api.list_custom_resource_definition, {}
+    raise ValueError(f"cannot wait for {wait.kind!r}")
+
+
+def _holds(wait: Wait, obj: dict[str, Any]) -> bool:
+    try:
+        return bool(wait.condition(obj))
+    except ConditionFailed as exc:
+        raise WaitError(str(wait), str(exc), obj) from None
+
+
+def wait_one(
+    api_client: client.ApiClient, wait: Wait, deadline: float
+) -> dict[str, Any]:
+    """
+    Block until ``wait`` holds or ``deadline`` (``time.monotonic()``) passes.
+    Returns the object as a dict.
+    """
+    from kubernetes import watch
+    from kubernetes.client.rest import ApiException
+
+    list_fn, kwargs = _lister(api_client, wait)
+
+    def raw_list(**kw: Any) -> Any:
+        # Watch derives the model to build from the API method's docstring;
+        # hiding it leaves events as the raw dicts conditions work on.
+        return list_fn(**kw)
+
+    kwargs["field_selector"] = f"metadata.name={wait.name}"
+    last: dict[str, Any] | None = None
+    resource_version: str | None = None
+
+    while True:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            reason = "timed out"
+            if last is None:
+                reason += ", object not found"
+            raise WaitError(str(wait), reason, last)
+
+        if resource_version is None:
+            resp = list_fn(
+                **kwargs, _preload_content=False, _request_timeout=remaining
+            )
+            body = json.loads(resp.data)
+            resource_version = (body.get("metadata") or {}).get("resourceVersion")
+            items = body.get("items") or []
+            last = items[0] if items else None
+            if last is not None and _holds(wait, last):
+                return last
+
+        stream = watch.Watch().stream(
+            raw_list,
+            **kwargs,
+            resource_version=resource_version,
+            allow_watch_bookmarks=True,
+            timeout_seconds=max(1, math.ceil(remaining)),
+            _request_timeout=remaining + 5,
+        )
+        try:
+            for event in stream:
+                obj = event.get("raw_object") or {}
+                resource_version = (obj.get("metadata") or {}).get(
+                    "resourceVersion", resource_version
+                )
+                if event.get("type") == "BOOKMARK":
+                    continue
+                if event.get("type") == "DELETED":
+                    last = None
+                    continue
+                last = obj
+                if _holds(wait, obj):
+                    return obj
+        except ApiException as exc:
+            if exc.status != 410:
+                raise
+            # Our resourceVersion is too old to resume from: list again.
+            resource_version = None
+        finally:
+            stream.close()
+
+
+def wait_all(
+    api_client: client.ApiClient,
+    waits: list[Wait],
+    timeout: float | str = 120.0,
+    max_workers: int = 16,
+) -> list[dict[str, Any]]:
+    """
+    Wait for every entry of ``waits`` within one shared ``timeout``, running
+    them concurrently. Returns the objects in order; if any wait fails, a
+    ``WaitError`` naming all failures is raised once all have finished.
+    """
+    deadline = time.monotonic() + seconds(timeout)
+    if len(waits) == 1:
+        return [wait_one(api_client, waits[0], deadline)]
+
+    with ThreadPoolExecutor(
+        max_workers=min(max_workers, len(waits)) or 1,
+        thread_name_prefix="kind-wait",
+    ) as pool:
+        futures = [pool.submit(wait_one, api_client, w, deadline) for w in waits]
+    results: list[dict[str, Any]] = []
+    errors: list[WaitError] = []
+    for future in futures:
+        try:
+            results.append(future.result())
+        except WaitError as exc:
+            errors.append(exc)
+    if len(errors) == 1:
+        raise errors[0]
+    if errors:
+        raise WaitError(
+            ", ".join(e.what for e in errors),
+            "; ".join(f"{e.what}: {e.reason}" for e in errors),
+        )
+    return results
@@ -0,0 +1,210 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import shlex
+import shutil
+import socketserver
+import subprocess
+import sys
+import tempfile
+import threading
+import weakref
+from dataclasses import dataclass
+from typing import Any
+
+_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "_prefork.py")
+
+PLAYBOOK_ENTRY = "ansible.cli.playbook:main"
+# Imported by workers on top of the entry point: what every run needs
+# but ansible-playbook only imports once it starts executing.
+DEFAULT_PRELOAD = (
+    "ansible.executor.task_queue_manager",
+    "ansible.executor.task_executor",
+    "ansible.executor.process.worker",
+    "ansible.plugins.strategy.linear",
+    "ansible.plugins.callback.default",
+    "ansible.plugins.connection.local",
+    "ansible.plugins.action.normal",
+)
+
+
+def config_key(cwd: str, env: dict[str, str]) -> str:
+    """
+    Digest of what ansible's import-time configuration depends on: the
+    directory ``ansible.cfg`` is looked up from, ``ANSIBLE_*`` settings and
+    where ansible itself and the user's config are found.
+    """
+    settings = sorted(
+        (k, v)
+        for k, v in env.items()
+        if k.startswith("ANSIBLE_") or k in ("HOME", "PYTHONPATH")
+    )
+    raw = json.dumps([cwd, settings])
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+
+@dataclass
+class _Server:
+    proc: subprocess.Popen[bytes]
+    socket: str
+
+
+class _Dispatch(socketserver.StreamRequestHandler):
+    def handle(self) -> None:
+        pool: AnsibleWorkerPool = self.server.pool  # type: ignore[attr-defined]
+        try:
+            request = json.loads(self.rfile.readline())
+            path = pool._socket_for(request["cwd"], request["env"])
+        except (KeyError, TypeError, ValueError):
+            path = None
+        self.wfile.write(json.dumps({"socket": path}).encode() + b"\n")
+
+
+class AnsibleWorkerPool:
+    """
+    Warm ``ansible-playbook`` processes for ansible-runner to run on.
+
+    Playbooks still go through ``ansible_runner.run``, which prepares the
+    command, env and artifacts and streams events exactly as before, but
+    with :meth:`runner_kwargs` its "binary" is a small client that hands
+    its pty, argv, env and cwd to a worker. Workers are forked from a
+    server that imported ansible once, so a run skips interpreter start-up
+    and the ansible imports.
+
+    ansible reads most of its configuration when it is imported, so there
+    is one server per :func:`config_key` (in practice one per project),
+    started on the first run that needs it and keeping ``size`` workers
+    forked ahead. Runs fall back to the real ``ansible-playbook`` when a
+    server cannot start, e.g. because ansible is not importable from this
+    interpreter; ``errors`` holds why.
+    """
+
+    def __init__(
+        self,
+        size: int = 2,
+        *,
+        entry: str = PLAYBOOK_ENTRY,
+        preload: tuple[str, ...] = DEFAULT_PRELOAD,
+        start_timeout: float = 120.0,
+    ) -> None:
+        if size < 1:
+            raise ValueError(f"size must be at least 1, got {size}")
+        self.size = size
+        self.entry = entry
+        self.preload = tuple(preload)
+        self.start_timeout = start_timeout
+        self.errors: dict[str, str] = {}
+        self._lock = threading.Lock()
+        self._key_locks: dict[str, threading.Lock] = {}
+        self._servers: dict[str, _Server] = {}
+        self._dir: str | None = None
+        self._master: str | None = None
+        self._dispatcher: socketserver.ThreadingUnixStreamServer | None = None
+        self._remove_dir: weakref.finalize | None = None
+
+    def _start(self) -> str:
+        with self._lock:
+            if self._master is None:
+                self._dir = tempfile.mkdtemp(prefix="kind-workers-")
+                self._remove_dir = weakref.finalize(
+                    self, shutil.rmtree, self._dir, ignore_errors=True
+                )
+                master = os.path.join(self._dir, "pool.sock")
+                server = socketserver.ThreadingUnixStreamServer(master, _Dispatch)
+                server.daemon_threads = True
+                server.pool = weakref.proxy(self)  # type: ignore[attr-defined]
+                threading.Thread(
+                    target=server.serve_forever,
+                    name="kind-workers",
+                    daemon=True,
+                ).start()
+                self._dispatcher, self._master = server, master
+            return self._master
+
+    def runner_kwargs(self, playbook: str) -> dict[str, Any]:
+        """``ansible_runner.run`` arguments that run ``playbook`` on a worker."""
+        args = ("-I", "-S", _SCRIPT, "client", self._start(), playbook)
+        return {"binary": sys.executable, "cmdline": shlex.join(args)}
+
+    def _socket_for(self, cwd: str, env: dict[str, str]) -> str | None:
+        key = config_key(cwd, env)
+        with self._lock:
+            if self._dir is None:
+                return None
+            lock = self._key_locks.setdefault(key, threading.Lock())
+        with lock:
+            server = self._servers.get(key)
+            if server is not None and server.proc.poll() is None:
+                return server.socket
+            if key in self.errors:
+                return None
+            try:
+                server = self._spawn(key, cwd, env)
+            except (OSError, RuntimeError) as exc:
+                self.errors[key] = str(exc)
+                return None
+            with self._lock:
+                if self._dir is None:
+                    _stop(server)
+                    return None
+                self._servers[key] = server
+            return server.socket
+
+    def _spawn(self, key: str, cwd: str, env: dict[str, str]) -> _Server:
+        assert self._dir is not None
+        path = os.path.join(self._dir, f"{key[:16]}.sock")
+        if os.path.exists(path):
+            os.unlink(path)
+        argv = [sys.executable, _SCRIPT, "serve", path, str(self.size), self.entry]
+        proc = subprocess.Popen(
+            [*argv, *self.preload],
+            cwd=cwd,
+            env=env,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            start_new_session=True,
+        )
+        timer = threading.Timer(self.start_timeout, proc.kill)
+        timer.start()
+        try:
+            assert proc.stdout is not None and proc.stderr is not None
+            ready = proc.stdout.readline() == b"ready\n"
+            if not ready:
+                detail = proc.stderr.read().decode(errors="replace").strip()
+                proc.wait()
+                last = detail.splitlines()[-1] if detail else f"exit {proc.returncode}"
+                raise RuntimeError(f"worker server for {cwd} did not start: {last}")
+        finally:
+            timer.cancel()
+        proc.stdout.close()
+        proc.stderr.close()
+        return _Server(proc, path)
+
+    def close(self) -> None:
+        """Stop the servers and their workers and remove the sockets."""
+        with self._lock:
+            dispatcher, self._dispatcher = self._dispatcher, None
+            servers, self._servers = list(self._servers.values()), {}
+            remove_dir, self._remove_dir = self._remove_dir, None
+            self._dir = self._master = None
+        if dispatcher is not None:
+            dispatcher.shutdown()
+            dispatcher.server_close()
+        for server in servers:
+            _stop(server)
+        if remove_dir is not None:
+            remove_dir()
+
+
+def _stop(server: _Server) -> None:
+    # Closing stdin, the server's lifeline, makes it kill its workers and exit.
+    if server.proc.stdin is not None:
+        server.proc.stdin.close()
+    try:
+        server.proc.wait(timeout=5)
+    except subprocess.TimeoutExpired:
+        server.proc.kill()
+        server.proc.wait()
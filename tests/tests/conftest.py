@@ -0,0 +1,260 @@
+"""Shared fixtures for the pytest-ansible-kind unit tests."""
+
+from __future__ import annotations
+
+import json
+import os
+import stat
+import sys
+from pathlib import Path
+
+import pytest
+
+# The plugin imports yaml lazily. Were its first import inside a
+# runpytest_inprocess() run, pytester would drop yaml from sys.modules
+# afterwards, and the re-imported module no longer matches the C _yaml
+# extension, which breaks CSafeLoader for every later test.
+import yaml  # noqa: F401
+
+pytest_plugins = ["pytester"]
+
+_FAKE_KIND = r'''#!{python}
+"""Stand-in for the ``kind`` CLI that keeps its state in files."""
+import json
+import os
+import sys
+import uuid
+
+state = os.environ["FAKE_KIND_STATE"]
+args = sys.argv[1:]
+with open(os.path.join(state, "calls.log"), "a") as fh:
+    fh.write(json.dumps([os.path.basename(sys.argv[0]), *args]) + "\n")
+
+if os.path.basename(sys.argv[0]) == "docker" and args[:2] == ["image", "inspect"]:
+    try:
+        with open(os.path.join(state, "images.json")) as fh:
+            images = json.load(fh)
+    except FileNotFoundError:
+        images = {{}}
+    if args[-1] not in images:
+        sys.stderr.write("No such image: %s\n" % args[-1])
+        sys.exit(1)
+    print(images[args[-1]])
+    sys.exit(0)
+
+if os.path.basename(sys.argv[0]) == "kubectl":
+    # Like the real one: a kubeconfig of a deleted cluster cannot connect.
+    kubeconfig = os.environ.get("KUBECONFIG", "")
+    if os.path.isfile(kubeconfig):
+        try:
+            with open(os.path.join(state, "clusters.json")) as fh:
+                alive = set(json.load(fh).values())
+        except FileNotFoundError:
+            alive = set()
+        for line in open(kubeconfig):
+            key, _, value = line.strip().partition(": ")
+            if key == "certificate-authority-data" and value not in alive:
+                sys.stderr.write("Unable to connect to the server\n")
+                sys.exit(1)
+    sys.exit(0)
+
+if os.path.basename(sys.argv[0]) == "ansible-playbook":
+    print("TASK [fake : debug] ***")
+    print("ok: [localhost]")
+    sys.exit(0)
+
+if os.path.basename(sys.argv[0]) != "kind":
+    sys.exit(0)
+
+import fcntl
+
+lock = open(os.path.join(state, "clusters.lock"), "a")
+fcntl.flock(lock.fileno(), fcntl.LOCK_EX)
+
+db_path = os.path.join(state, "clusters.json")
+try:
+    with open(db_path) as fh:
+        db = json.load(fh)
+except FileNotFoundError:
+    db = {{}}
+
+
+def opt(prefix, default=None):
+    for i, a in enumerate(args):
+        if a.startswith(prefix + "="):
+            return a.split("=", 1)[1]
+        if a == prefix and i + 1 < len(args):
+            return args[i + 1]
+    return default
+
+
+name = opt("--name")
+if name is None:
+    name = "kind"
+    cfg = opt("--config")
+    if cfg:
+        for line in open(cfg):
+            if line.startswith("name:"):
+                name = line.split(":", 1)[1].strip()
+
+if args[:2] == ["get", "clusters"]:
+    print("\n".join(sorted(db)))
+elif args[:2] == ["create", "cluster"]:
+    if opt("--config") and not os.path.exists(opt("--config")):
+        sys.stderr.write("failed to read config\n")
+        sys.exit(1)
+    if name in db:
+        sys.stderr.write("node(s) already exist for a cluster with the name\n")
+        sys.exit(1)
+    db[name] = uuid.uuid4().hex
+elif args[:2] == ["delete", "cluster"]:
+    db.pop(name, None)
+elif args[:2] == ["get", "kubeconfig"]:
+    if name not in db:
+        sys.stderr.write("could not locate any control plane nodes\n")
+        sys.exit(1)
+    print(
+        "apiVersion: v1\n"
+        "kind: Config\n"
+        "clusters:\n"
+        "- cluster:\n"
+        "    certificate-authority-data: {{}}\n"
+        "    server: https://127.0.0.1:6443\n"
+        "  name: kind-{{}}\n"
+        "contexts:\n"
+        "- context:\n"
+        "    cluster: kind-{{}}\n"
+        "    user: kind-{{}}\n"
+        "  name: kind-{{}}\n"
+        "current-context: kind-{{}}\n"
+        "users:\n"
+        "- name: kind-{{}}\n"
+        "  user:\n"
+        "    token: fake\n".format(db[name], *([name] * 6))
+    )
+elif args[:1] == ["load"]:
+    if name not in db:
+        sys.stderr.write("no nodes found for cluster %s\n" % name)
+        sys.exit(1)
+else:
+    sys.stderr.write("unknown command: %s\n" % " ".join(args))
+    sys.exit(2)
+
+tmp = "%s.%d" % (db_path, os.getpid())
+with open(tmp, "w") as fh:
+    json.dump(db, fh)
+os.replace(tmp, db_path)
+'''
+
+
+class FakeKind:
+    """Handle on the fake ``kind``/``kubectl``/``ansible-playbook`` binaries."""
+
+    def __init__(self, state_dir: Path) -> None:
+        self.state_dir = state_dir
+
+    def calls(self, binary: str = "kind") -> list[list[str]]:
+        log = self.state_dir / "calls.log"
+        if not log.exists():
+            return []
+        import json
+
+        out = []
+        for line in log.read_text().splitlines():
+            argv = json.loads(line)
+            if argv[0] == binary:
+                out.append(argv[1:])
+        return out
+
+    def add_image(self, ref: str, digest: str) -> None:
+        """Make ``docker image inspect ref`` report ``digest``."""
+        import json
+
+        db = self.state_dir / "images.json"
+        images = json.loads(db.read_text()) if db.exists() else {}
+        images[ref] = digest
+        db.write_text(json.dumps(images))
+
+    def clusters(self) -> list[str]:
+        import json
+
+        db = self.state_dir / "clusters.json"
+        if not db.exists():
+            return []
+        return sorted(json.loads(db.read_text()))
+
+
+@pytest.fixture
+def fake_kind(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> FakeKind:
+    """
+    Put fake ``kind``, ``kubectl`` and ``ansible-playbook`` binaries first
+    on PATH. Every invocation is logged; ``kind`` tracks clusters on disk.
+    """
+    bin_dir = tmp_path / "fake-bin"
+    state_dir = tmp_path / "fake-state"
+    bin_dir.mkdir()
+    state_dir.mkdir()
+
+    script = _FAKE_KIND.format(python=sys.executable)
+    for binary in ("kind", "kubectl", "ansible-playbook", "docker"):
+        path = bin_dir / binary
+        path.write_text(script)
+        path.chmod(path.stat().st_mode | stat.S_IXUSR | stat.S_IXGRP | stat.S_IXOTH)
+
+    monkeypatch.setenv("FAKE_KIND_STATE", str(state_dir))
+    monkeypatch.setenv("PATH", f"{bin_dir}{os.pathsep}{os.environ.get('PATH', '')}")
+    monkeypatch.setattr("tempfile.tempdir", str(tmp_path))
+    return FakeKind(state_dir)
+
+
+class FakeAnsible:
+    """Records ``ansible_runner.run`` calls and returns a canned result."""
+
+    def __init__(self) -> None:
+        self.calls: list[dict] = []
+        self.status = "successful"
+        self.rc = 0
+        self.events: list[dict] = []
+
+    def run(self, **kwargs):
+        from types import SimpleNamespace
+
+        self.calls.append(kwargs)
+        run_dir: Path | None = None
+        if kwargs.get("artifact_dir") and kwargs.get("ident"):
+            # Like ansible-runner: one dir per run under artifact_dir.
+            run_dir = Path(kwargs["artifact_dir"]) / kwargs["ident"]
+            (run_dir / "job_events").mkdir(parents=True)
+            (run_dir / "stdout").write_text("fake ansible output\n" * 50)
+            (run_dir / "rc").write_text(str(self.rc))
+        handler = kwargs.get("event_handler")
+        if handler is not None:
+            for counter, event in enumerate(self.events, 1):
+                # Events are only written out when the handler returns true.
+                if handler(dict(event)) and run_dir is not None:
+                    path = run_dir / "job_events" / f"{counter}.json"
+                    path.write_text(json.dumps(event))
+        return SimpleNamespace(status=self.status, rc=self.rc)
+
+
+@pytest.fixture
+def fake_ansible(monkeypatch: pytest.MonkeyPatch) -> FakeAnsible:
+    """Replace ``ansible_runner.run`` with an in-process fake."""
+    fake = FakeAnsible()
+    monkeypatch.setattr("ansible_runner.run", fake.run)
+    return fake
+
+
+@pytest.fixture
+def project(tmp_path: Path) -> Path:
+    """A minimal Ansible project dir with one playbook and one role."""
+    root = tmp_path / "project"
+    (root / "playbooks").mkdir(parents=True)
+    (root / "roles" / "demo" / "tasks").mkdir(parents=True)
+    (root / "playbooks" / "site.yaml").write_text(
+        "- hosts: localhost\n  gather_facts: false\n  roles:\n    - demo\n"
+    )
+    (root / "roles" / "demo" / "tasks" / "main.yml").write_text(
+        "- debug:\n    msg: hello\n"
+    )
+    return root
@@ -0,0 +1,151 @@
+"""Unit tests for ansible artifact retention."""
+
+from __future__ import annotations
+
+import os
+import tarfile
+
+import pytest
+
+from pytest_ansible_kind import PlaybookFailedError
+from pytest_ansible_kind.artifacts import ArtifactStore, parse_size
+from pytest_ansible_kind.registry import ClusterRegistry
+from pytest_ansible_kind.runner import KindRunner
+
+
+def _runner(project, artifacts):
+    return KindRunner(
+        str(project),
+        registry=ClusterRegistry(probe=None),
+        output="silent",
+        artifacts=artifacts,
+    )
+
+
+def _archives(root):
+    return sorted(p.name for p in root.rglob("*.tar.gz"))
+
+
+class TestParseSize:
+    @pytest.mark.parametrize(
+        "raw, expected",
+        [
+            ("", None),
+            ("0", None),
+            ("1024", 1024),
+            ("500M", 500 << 20),
+            ("2g", 2 << 30),
+            ("1.5KiB", 1536),
+        ],
+    )
+    def test_parse(self, raw, expected):
+        assert parse_size(raw) == expected
+
+    def test_rejects_garbage(self):
+        with pytest.raises(ValueError, match="lots"):
+            parse_size("lots")
+
+
+class TestArtifactStore:
+    def test_never_keeps_nothing(self, fake_kind, fake_ansible, project):
+        store = ArtifactStore()
+        runner = _runner(project, store)
+        try:
+            runner("playbooks/site.yaml")
+            runner("playbooks/site.yaml")
+        finally:
+            runner.close()
+        scratch = {c["artifact_dir"] for c in fake_ansible.calls}
+        assert len(scratch) == 1
+        assert os.listdir(scratch.pop()) == []
+        assert store.archived == []
+        store.close()
+
+    def test_job_events_only_when_kept(
+        self, fake_kind, fake_ansible, project, tmp_path
+    ):
+        kept = ArtifactStore(tmp_path / "kept", retention="always")
+        for store in (ArtifactStore(), kept):
+            runner = _runner(project, store)
+            try:
+                runner("playbooks/site.yaml")
+            finally:
+                runner.close()
+                store.close()
+        never, always = fake_ansible.calls
+        assert not never["event_handler"]({"event": "playbook_on_start"})
+        assert always["event_handler"]({"event": "playbook_on_start"})
+
+    def test_on_failure_archives_failed_runs(
+        self, fake_kind, fake_ansible, project, tmp_path
+    ):
+        root = tmp_path / "artifacts"
+        store = ArtifactStore(root, retention="on-failure")
+        fake_ansible.events = [{"event": "playbook_on_start"}]
+        runner = _runner(project, store)
+        try:
+            runner("playbooks/site.yaml")
+            assert _archives(root) == []
+
+            fake_ansible.status, fake_ansible.rc = "failed", 2
+            with pytest.raises(PlaybookFailedError) as exc_info:
+                runner("playbooks/site.yaml")
+        finally:
+            runner.close()
+            store.close()
+
+        archive = exc_info.value.artifacts
+        assert archive in store.archived
+        assert "artifacts=" in str(exc_info.value)
+        with tarfile.open(archive) as tar:
+            names = tar.getnames()
+        ident = fake_ansible.calls[-1]["ident"]
+        assert f"{ident}/stdout" in names
+        assert f"{ident}/job_events/1.json" in names
+        assert os.path.basename(archive).startswith("site-")
+
+    def test_budget_evicts_oldest(self, tmp_path):
+        root = tmp_path / "artifacts"
+        store = ArtifactStore(root, retention="always", max_bytes=1)
+        kept = []
+        for i in range(3):
+            run_dir = os.path.join(store.scratch(), f"run{i}")
+            os.makedirs(run_dir)
+            with open(os.path.join(run_dir, "stdout"), "w") as fh:
+                fh.write("x" * 100)
+            kept.append(
+                store.finish(f"run{i}", failed=False, nodeid="t.py::t", playbook="p")
+            )
+        store.close()
+        # The newest archive is kept even when it alone exceeds the budget.
+        assert _archives(root) == [os.path.basename(kept[-1])]
+        assert store.evicted == 2
+
+
+class TestArtifactsOption:
+    def test_failed_test_leaves_archive(
+        self, pytester, fake_kind, fake_ansible, project
+    ):
+        fake_ansible.status, fake_ansible.rc = "failed", 1
+        pytester.makepyfile(
+            """
+            def test_broken(kind_runner):
+                kind_runner("playbooks/site.yaml")
+            """
+        )
+        result = pytester.runpytest_inprocess(
+            f"--kind-project-dir={project}",
+            "--kind-artifacts=on-failure",
+            "--kind-artifacts-dir=out",
+        )
+        result.assert_outcomes(failed=1)
+        result.stdout.fnmatch_lines(["kind: kept 1 artifact archives in *out"])
+        archives = list((pytester.path / "out").rglob("*.tar.gz"))
+        assert len(archives) == 1
+        test_dir = archives[0].parent.name
+        assert test_dir == "test_failed_test_leaves_archive.py_test_broken"
+
+    def test_invalid_budget(self, pytester, fake_kind, fake_ansible, project):
+        pytester.makeini("[pytest]\nkind_artifacts_max_size = lots\n")
+        result = pytester.runpytest_inprocess(f"--kind-project-dir={project}")
+        result.stderr.fnmatch_lines(["*kind_artifacts_max_size: invalid size*"])
@@ -0,0 +1,113 @@
+"""Unit tests for batched multi-playbook runs."""
+
+from __future__ import annotations
+
+import os
+
+import pytest
+import yaml
+
+from pytest_ansible_kind import KindRunner, PlaybookFailedError
+from pytest_ansible_kind.registry import ClusterRegistry
+from pytest_ansible_kind.runner import _BATCH_MARKER
+
+
+@pytest.fixture
+def batch_project(project):
+    (project / "playbooks" / "second.yaml").write_text(
+        "- hosts: workers\n  gather_facts: false\n  tasks: []\n"
+    )
+    return project
+
+
+def _runner(project) -> KindRunner:
+    return KindRunner(str(project), registry=ClusterRegistry(probe=None))
+
+
+class TestRunMany:
+    def test_single_invocation_with_imports(
+        self, fake_kind, fake_ansible, batch_project, monkeypatch
+    ):
+        seen = {}
+        run = fake_ansible.run
+
+        def capture(**kwargs):
+            with open(kwargs["playbook"]) as fh:
+                seen["plays"] = yaml.safe_load(fh)
+            with open(kwargs["inventory"]) as fh:
+                seen["inventory"] = fh.read()
+            return run(**kwargs)
+
+        monkeypatch.setattr("ansible_runner.run", capture)
+        _runner(batch_project).run_many(
+            ["playbooks/site.yaml", "playbooks/second.yaml"],
+            extravars={"shared": True},
+        )
+
+        assert len(fake_ansible.calls) == 1
+        assert fake_ansible.calls[0]["extravars"] == {"shared": True}
+        assert not os.path.exists(fake_ansible.calls[0]["playbook"])
+
+        imports = [p for p in seen["plays"] if "import_playbook" in p]
+        assert [os.path.basename(p["import_playbook"]) for p in imports] == [
+            "site.yaml",
+            "second.yaml",
+        ]
+        assert seen["inventory"].splitlines() == [
+            "localhost ansible_connection=local",
+            "workers ansible_connection=local",
+        ]
+
+    def test_per_playbook_vars_are_extravars(
+        self, fake_kind, fake_ansible, batch_project, monkeypatch
+    ):
+        imported = []
+        run = fake_ansible.run
+
+        def capture(**kwargs):
+            with open(kwargs["playbook"]) as fh:
+                plays = yaml.safe_load(fh)
+            imported.append(
+                [
+                    os.path.basename(p["import_playbook"])
+                    for p in plays
+                    if "import_playbook" in p
+                ]
+            )
+            return run(**kwargs)
+
+        monkeypatch.setattr("ansible_runner.run", capture)
+        _runner(batch_project).run_many(
+            [
+                "playbooks/site.yaml",
+                ("playbooks/second.yaml", {"replicas": 2}),
+                ("playbooks/site.yaml", {"replicas": 2}),
+            ],
+            extravars={"shared": True, "replicas": 1},
+        )
+
+        assert [c["extravars"] for c in fake_ansible.calls] == [
+            {"shared": True, "replicas": 1},
+            {"shared": True, "replicas": 2},
+        ]
+        assert imported == [["site.yaml"], ["second.yaml", "site.yaml"]]
+
+    def test_failure_names_constituent(self, fake_kind, fake_ansible, batch_project):
+        fake_ansible.status, fake_ansible.rc = "failed", 2
+        fake_ansible.events = [
+            {
+                "event": "playbook_on_play_start",
+                "event_data": {"play": f"{_BATCH_MARKER}{idx}"},
+            }
+            for idx in (0, 1)
+        ]
+        with pytest.raises(PlaybookFailedError) as exc_info:
+            _runner(batch_project).run_many(
+                ["playbooks/site.yaml", "playbooks/second.yaml"]
+            )
+        assert exc_info.value.playbook.endswith("second.yaml")
+        assert exc_info.value.rc == 2
+
+    def test_empty_batch(self, fake_kind, fake_ansible, batch_project):
+        with pytest.raises(ValueError):
+            _runner(batch_project).run_many([])
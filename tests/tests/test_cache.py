@@ -0,0 +1,150 @@
+"""Unit tests for the content-addressed playbook result cache."""
+
+from __future__ import annotations
+
+import pytest
+
+from pytest_ansible_kind import KindRunner, PlaybookFailedError
+from pytest_ansible_kind.cache import PlaybookCache, playbook_cache_key
+from pytest_ansible_kind.registry import ClusterRegistry
+
+
+def _key(project, **overrides):
+    kwargs = dict(
+        playbook=str(project / "playbooks" / "site.yaml"),
+        roles_path=str(project / "roles"),
+        inventory="localhost ansible_connection=local\n",
+        extravars={"a": 1},
+        cluster="kind",
+        generation="g1",
+    )
+    kwargs.update(overrides)
+    return playbook_cache_key(**kwargs)
+
+
+class TestPlaybookCacheKey:
+    def test_stable(self, project):
+        assert _key(project) == _key(project)
+
+    def test_extravars_order_does_not_matter(self, project):
+        assert _key(project, extravars={"a": 1, "b": 2}) == _key(
+            project, extravars={"b": 2, "a": 1}
+        )
+
+    def test_inputs_change_key(self, project):
+        base = _key(project)
+        assert _key(project, extravars={"a": 2}) != base
+        assert _key(project, inventory="other\n") != base
+        assert _key(project, cluster="other") != base
+        assert _key(project, generation="g2") != base
+
+    def test_role_edit_changes_key(self, project):
+        base = _key(project)
+        (project / "roles" / "demo" / "tasks" / "main.yml").write_text("- ping:\n")
+        assert _key(project) != base
+
+    def test_playbook_edit_changes_key(self, project):
+        base = _key(project)
+        (project / "playbooks" / "site.yaml").write_text("- hosts: all\n")
+        assert _key(project) != base
+
+
+class TestPlaybookCache:
+    def test_store_and_lookup(self, tmp_path):
+        cache = PlaybookCache(tmp_path / "cache")
+        assert cache.lookup("k") is None
+        cache.store("k", playbook="p.yaml", cluster="kind", status="successful", rc=0)
+        assert cache.lookup("k")["playbook"] == "p.yaml"
+        assert (cache.hits, cache.misses) == (1, 1)
+
+    def test_invalidate_cluster(self, tmp_path):
+        cache = PlaybookCache(tmp_path / "cache")
+        cache.store("a", playbook="p", cluster="one", status="successful", rc=0)
+        cache.store("b", playbook="p", cluster="two", status="successful", rc=0)
+        cache.invalidate_cluster("one")
+        assert cache.lookup("a") is None
+        assert cache.lookup("b") is not None
+
+
+class TestKindRunnerWithCache:
+    def test_unchanged_run_is_skipped(self, fake_kind, fake_ansible, project, tmp_path):
+        registry = ClusterRegistry(probe=lambda state: True)
+        cache = PlaybookCache(tmp_path / "cache")
+        registry.subscribe(cache.invalidate_cluster)
+        runner = KindRunner(str(project), registry=registry, playbook_cache=cache)
+
+        runner("playbooks/site.yaml")
+        runner("playbooks/site.yaml")
+        assert len(fake_ansible.calls) == 1
+
+        runner("playbooks/site.yaml", extravars={"x": 1})
+        assert len(fake_ansible.calls) == 2
+
+    def test_recreated_cluster_reruns(self, fake_kind, fake_ansible, project, tmp_path):
+        registry = ClusterRegistry(probe=lambda state: True)
+        cache = PlaybookCache(tmp_path / "cache")
+        registry.subscribe(cache.invalidate_cluster)
+        runner = KindRunner(str(project), registry=registry, playbook_cache=cache)
+
+        runner("playbooks/site.yaml")
+        registry.delete("kind")
+        runner("playbooks/site.yaml")
+        assert len(fake_ansible.calls) == 2
+
+    def test_failed_run_is_not_cached(self, fake_kind, fake_ansible, project, tmp_path):
+        cache = PlaybookCache(tmp_path / "cache")
+        runner = KindRunner(
+            str(project),
+            registry=ClusterRegistry(probe=lambda state: True),
+            playbook_cache=cache,
+        )
+        fake_ansible.status, fake_ansible.rc = "failed", 2
+        for _ in range(2):
+            with pytest.raises(PlaybookFailedError):
+                runner("playbooks/site.yaml")
+        assert len(fake_ansible.calls) == 2
+
+    def test_referenced_file_edit_reruns(
+        self, fake_kind, fake_ansible, project, tmp_path
+    ):
+        (project / "playbooks" / "site.yaml").write_text(
+            "- import_playbook: base.yaml\n"
+        )
+        (project / "playbooks" / "base.yaml").write_text(
+            "- hosts: localhost\n  vars_files: [vars.yaml]\n  roles: [demo]\n"
+        )
+        (project / "playbooks" / "vars.yaml").write_text("a: 1\n")
+        runner = KindRunner(
+            str(project),
+            registry=ClusterRegistry(probe=lambda state: True),
+            playbook_cache=PlaybookCache(tmp_path / "cache"),
+        )
+        runner("playbooks/site.yaml")
+        runner("playbooks/site.yaml")
+        assert len(fake_ansible.calls) == 1
+
+        (project / "playbooks" / "vars.yaml").write_text("a: 2\n")
+        runner("playbooks/site.yaml")
+        assert len(fake_ansible.calls) == 2
+
+        (project / "playbooks" / "group_vars").mkdir()
+        (project / "playbooks" / "group_vars" / "all.yaml").write_text("b: 1\n")
+        runner("playbooks/site.yaml")
+        assert len(fake_ansible.calls) == 3
+
+    def test_unresolvable_playbook_is_not_cached(
+        self, fake_kind, fake_ansible, project, tmp_path
+    ):
+        (project / "playbooks" / "site.yaml").write_text(
+            "- hosts: localhost\n  tasks:\n    - include_tasks: '{{ which }}.yaml'\n"
+        )
+        cache = PlaybookCache(tmp_path / "cache")
+        runner = KindRunner(
+            str(project),
+            registry=ClusterRegistry(probe=lambda state: True),
+            playbook_cache=cache,
+        )
+        runner("playbooks/site.yaml")
+        runner("playbooks/site.yaml")
+        assert len(fake_ansible.calls) == 2
+        assert list(cache.directory.glob("*.json")) == []
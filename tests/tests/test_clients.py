@@ -0,0 +1,110 @@
+"""Unit tests for the per-cluster ApiClient pool."""
+
+from __future__ import annotations
+
+import pytest
+from kubernetes import client
+
+from pytest_ansible_kind.clients import ApiClientPool
+from pytest_ansible_kind.registry import ClusterRegistry
+from pytest_ansible_kind.runner import KindRunner
+
+_KUBECONFIG = """\
+apiVersion: v1
+kind: Config
+clusters:
+- cluster:
+    server: https://127.0.0.1:{port}
+  name: kind-{name}
+contexts:
+- context:
+    cluster: kind-{name}
+    user: kind-{name}
+  name: kind-{name}
+current-context: kind-{name}
+users:
+- name: kind-{name}
+  user:
+    token: fake
+"""
+
+
+@pytest.fixture
+def kubeconfig(tmp_path):
+    def _write(name: str, port: int = 6443) -> str:
+        path = tmp_path / f"{name}-kubeconfig"
+        path.write_text(_KUBECONFIG.format(name=name, port=port))
+        return str(path)
+
+    return _write
+
+
+class TestApiClientPool:
+    def test_reuses_client_per_generation(self, kubeconfig):
+        pool = ApiClientPool()
+        first = pool.get("a", "g1", kubeconfig("a"))
+        assert pool.get("a", "g1", kubeconfig("a")) is first
+        assert pool.get("a", "g2", kubeconfig("a")) is not first
+        assert len(pool) == 1
+        pool.close()
+
+    def test_clusters_get_their_own_configuration(self, kubeconfig):
+        pool = ApiClientPool()
+        a = pool.get("a", "g", kubeconfig("a", port=1111))
+        b = pool.get("b", "g", kubeconfig("b", port=2222))
+        assert a.configuration.host == "https://127.0.0.1:1111"
+        assert b.configuration.host == "https://127.0.0.1:2222"
+        pool.close()
+
+    def test_default_configuration_untouched(self, kubeconfig):
+        before = client.Configuration.get_default_copy().host
+        pool = ApiClientPool()
+        pool.get("a", "g", kubeconfig("a", port=3333))
+        assert client.Configuration.get_default_copy().host == before
+        pool.close()
+
+    def test_builds_from_content_without_reading(self, tmp_path):
+        pool = ApiClientPool()
+        content = _KUBECONFIG.format(name="a", port=4444)
+        api_client = pool.get("a", "g", str(tmp_path / "missing"), content=content)
+        assert api_client.configuration.host == "https://127.0.0.1:4444"
+        pool.close()
+
+    def test_pool_maxsize(self, kubeconfig):
+        pool = ApiClientPool(pool_maxsize=3)
+        api_client = pool.get("a", "g", kubeconfig("a"))
+        assert api_client.configuration.connection_pool_maxsize == 3
+        pool.close()
+
+    def test_registry_changes_drop_clients(self, fake_kind, kubeconfig):
+        registry = ClusterRegistry(probe=None)
+        pool = ApiClientPool()
+        registry.subscribe(pool.invalidate_cluster)
+        registry.ensure(name="a", wait="0s", cfg_path=None, use_name_arg=True)
+        pool.get("a", "g", kubeconfig("a"))
+        registry.delete("a")
+        assert len(pool) == 0
+
+
+class TestKindRunnerClients:
+    def test_calls_share_one_client(self, fake_kind, fake_ansible, project):
+        runner = KindRunner(str(project), name="shared")
+        try:
+            first = runner("playbooks/site.yaml")
+            assert runner("playbooks/site.yaml") is first
+        finally:
+            runner.close()
+
+    def test_external_pool_outlives_runner(self, fake_kind, fake_ansible, project):
+        pool = ApiClientPool()
+        runner = KindRunner(str(project), name="outer", api_clients=pool)
+        runner("playbooks/site.yaml")
+        runner.close()
+        assert len(pool) == 1
+        pool.close()
+
+    def test_invalid_pool_size_is_usage_error(self, pytester, fake_kind, project):
+        pytester.makeini("[pytest]\nkind_api_pool_maxsize = lots\n")
+        pytester.makepyfile("def test_noop():\n    pass\n")
+        result = pytester.runpytest_inprocess(f"--kind-project-dir={project}")
+        result.stderr.fnmatch_lines(["*kind_api_pool_maxsize must be*"])
@@ -0,0 +1,79 @@
+"""Unit tests for the concurrent KindRunner API."""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from pytest_ansible_kind import KindRunner, PlaybookFailedError
+from pytest_ansible_kind.registry import ClusterRegistry
+
+
+def _slow(fake_ansible, delay: float = 0.3):
+    run = fake_ansible.run
+    active = {"now": 0, "max": 0}
+    lock = threading.Lock()
+
+    def slow_run(**kwargs):
+        with lock:
+            active["now"] += 1
+            active["max"] = max(active["max"], active["now"])
+        time.sleep(delay)
+        with lock:
+            active["now"] -= 1
+        return run(**kwargs)
+
+    return slow_run, active
+
+
+class TestSubmit:
+    def test_runs_overlap(self, fake_kind, fake_ansible, project, monkeypatch):
+        slow_run, active = _slow(fake_ansible)
+        monkeypatch.setattr("ansible_runner.run", slow_run)
+        runner = KindRunner(str(project), registry=ClusterRegistry(probe=None))
+        try:
+            futures = [
+                runner.submit("playbooks/site.yaml", extravars={"ns": f"ns{i}"})
+                for i in range(3)
+            ]
+            clients = [f.result() for f in futures]
+        finally:
+            runner.close()
+
+        assert len(clients) == 3
+        assert active["max"] > 1
+        # Identical generated inventories are shared between the runs.
+        inventories = {c["inventory"] for c in fake_ansible.calls}
+        assert len(inventories) == 1
+
+    def test_failure_raised_from_future(self, fake_kind, fake_ansible, project):
+        fake_ansible.status, fake_ansible.rc = "failed", 2
+        runner = KindRunner(str(project), registry=ClusterRegistry(probe=None))
+        try:
+            future = runner.submit("playbooks/site.yaml")
+            with pytest.raises(PlaybookFailedError) as exc_info:
+                future.result()
+        finally:
+            runner.close()
+        assert exc_info.value.rc == 2
+
+
+class TestRunAsync:
+    def test_gather(self, fake_kind, fake_ansible, project):
+        runner = KindRunner(str(project), registry=ClusterRegistry(probe=None))
+
+        async def main():
+            return await asyncio.gather(
+                runner.run_async("playbooks/site.yaml", extravars={"n": 1}),
+                runner.run_async("playbooks/site.yaml", extravars={"n": 2}),
+            )
+
+        try:
+            results = asyncio.run(main())
+        finally:
+            runner.close()
+        assert len(results) == 2
+        assert sorted(c["extravars"]["n"] for c in fake_ansible.calls) == [1, 2]
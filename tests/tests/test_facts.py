@@ -0,0 +1,162 @@
+"""Unit tests for the plugin-managed Ansible fact cache."""
+
+from __future__ import annotations
+
+import os
+
+import pytest
+
+from pytest_ansible_kind.facts import FactCache
+from pytest_ansible_kind.index import ProjectIndex
+from pytest_ansible_kind.registry import ClusterRegistry
+from pytest_ansible_kind.runner import KindRunner
+
+_GATHER = [
+    {
+        "event": "playbook_on_task_start",
+        "event_data": {"task": "Gathering Facts", "task_uuid": "t1"},
+    },
+    {
+        "event": "runner_on_ok",
+        "event_data": {"task": "Gathering Facts", "task_uuid": "t1", "duration": 2.0},
+    },
+    {
+        "event": "runner_on_ok",
+        "event_data": {"task": "Gathering Facts", "task_uuid": "t1", "duration": 1.5},
+    },
+]
+
+
+@pytest.fixture
+def facts(tmp_path, monkeypatch):
+    monkeypatch.setattr("tempfile.tempdir", str(tmp_path))
+    cache = FactCache()
+    yield cache
+    cache.close()
+
+
+class TestFactCache:
+    def test_directory_per_generation(self, facts):
+        kwargs = facts.runner_kwargs("c", "aaaa")
+        assert kwargs["fact_cache_type"] == "jsonfile"
+        assert os.path.isdir(kwargs["fact_cache"])
+        other = facts.runner_kwargs("c", "bbbb")["fact_cache"]
+        assert other != kwargs["fact_cache"]
+        assert facts.envvars()["ANSIBLE_GATHERING"] == "smart"
+
+    def test_ansible_runner_uses_directory(self, facts, tmp_path):
+        """ansible-runner keeps the cache dir instead of its per-run one."""
+        from ansible_runner.config.runner import RunnerConfig
+
+        (tmp_path / "site.yaml").write_text("- hosts: localhost\n")
+        config = RunnerConfig(
+            private_data_dir=str(tmp_path),
+            project_dir=str(tmp_path),
+            playbook="site.yaml",
+            inventory="localhost",
+            artifact_dir=str(tmp_path / "artifacts"),
+            envvars=facts.envvars(),
+            suppress_env_files=True,
+            **facts.runner_kwargs("c", "aaaa"),
+        )
+        config.prepare()
+        assert config.env["ANSIBLE_CACHE_PLUGIN"] == "jsonfile"
+        assert config.env["ANSIBLE_CACHE_PLUGIN_CONNECTION"] == facts.directory(
+            "c", "aaaa"
+        )
+
+    def test_invalidate_only_touches_cluster(self, facts):
+        kind = facts.directory("kind", "g")
+        worker = facts.directory("kind-gw0", "g")
+        facts.invalidate_cluster("kind")
+        assert not os.path.exists(kind)
+        assert os.path.isdir(worker)
+
+    def test_session_removed_persistent_kept(self, tmp_path):
+        session = FactCache()
+        session_dir = session.directory("c", "g")
+        session.close()
+        assert not os.path.exists(session_dir)
+
+        persistent = FactCache(tmp_path / "facts")
+        persistent_dir = persistent.directory("c", "g")
+        persistent.close()
+        assert os.path.isdir(persistent_dir)
+
+    def test_counts_gathers_and_savings(self, facts):
+        run = facts.run(expected=1)
+        for event in _GATHER:
+            run(event)
+        run.finish()
+        facts.run(expected=2).finish()
+        assert (facts.gathered, facts.skipped) == (1, 2)
+        assert facts.gather_seconds == 2.0
+        assert facts.saved_seconds == 4.0
+        assert "skipped 2 fact gathers (~4.0s saved)" in facts.summary_line()
+
+
+class TestGatheringPlays:
+    def test_follows_imports(self, tmp_path):
+        (tmp_path / "a.yaml").write_text(
+            "- hosts: all\n- hosts: all\n  gather_facts: false\n"
+            "- import_playbook: b.yaml\n"
+        )
+        (tmp_path / "b.yaml").write_text(
+            "- hosts: all\n  gather_facts: 'no'\n- hosts: all\n  gather_facts: true\n"
+        )
+        index = ProjectIndex()
+        assert index.gathering_plays(str(tmp_path / "a.yaml")) == 2
+
+
+class TestRunner:
+    def test_second_run_skips_gathering(
+        self, fake_kind, fake_ansible, project, facts
+    ):
+        (project / "playbooks" / "facts.yaml").write_text("- hosts: localhost\n")
+        runner = KindRunner(
+            str(project),
+            registry=ClusterRegistry(probe=None),
+            output="silent",
+            facts=facts,
+        )
+        try:
+            fake_ansible.events = _GATHER
+            runner("playbooks/facts.yaml")
+            fake_ansible.events = []
+            runner("playbooks/facts.yaml")
+        finally:
+            runner.close()
+
+        first, second = fake_ansible.calls
+        assert first["envvars"]["ANSIBLE_GATHERING"] == "smart"
+        assert first["fact_cache_type"] == "jsonfile"
+        assert os.path.isabs(first["fact_cache"])
+        assert first["fact_cache"] == second["fact_cache"]
+        assert (facts.gathered, facts.skipped) == (1, 1)
+
+    def test_disabled_by_default(self, fake_kind, fake_ansible, project):
+        runner = KindRunner(
+            str(project), registry=ClusterRegistry(probe=None), output="silent"
+        )
+        try:
+            runner("playbooks/site.yaml")
+        finally:
+            runner.close()
+        (call,) = fake_ansible.calls
+        assert "ANSIBLE_GATHERING" not in call["envvars"]
+        assert call["fact_cache_type"] == "memory"
+
+
+def test_option_reports_savings(pytester, fake_kind, fake_ansible, project):
+    fake_ansible.events = _GATHER
+    pytester.makepyfile(
+        """
+        def test_a(kind_runner):
+            kind_runner("playbooks/site.yaml")
+        """
+    )
+    result = pytester.runpytest_inprocess(
+        f"--kind-project-dir={project}", "--kind-fact-cache=session"
+    )
+    result.assert_outcomes(passed=1)
+    result.stdout.fnmatch_lines(["kind: fact cache skipped 0 fact gathers*"])
@@ -0,0 +1,168 @@
+"""Unit tests for image preloading and the per-cluster digest manifest."""
+
+from __future__ import annotations
+
+import pytest
+
+from pytest_ansible_kind import KindClusterError
+from pytest_ansible_kind.images import ImageLoader, image_digest
+from pytest_ansible_kind.provision import ClusterProvisioner
+from pytest_ansible_kind.registry import ClusterRegistry
+
+
+def _loads(fake_kind) -> list[list[str]]:
+    return [c for c in fake_kind.calls() if c[:1] == ["load"]]
+
+
+@pytest.fixture
+def cluster(fake_kind) -> str:
+    ClusterRegistry(probe=None).ensure(
+        name="imgs", wait="0s", cfg_path=None, use_name_arg=True
+    )
+    return "imgs"
+
+
+class TestImageDigest:
+    def test_archive_digest_follows_content(self, tmp_path):
+        archive = tmp_path / "app.tar"
+        archive.write_bytes(b"one")
+        first = image_digest(str(archive))
+        archive.write_bytes(b"two")
+        assert image_digest(str(archive)) != first
+
+    def test_docker_image_id(self, fake_kind):
+        fake_kind.add_image("app:1", "sha256:aaa")
+        assert image_digest("app:1") == "sha256:aaa"
+
+    def test_missing_docker_image(self, fake_kind):
+        with pytest.raises(KindClusterError):
+            image_digest("missing:1")
+
+
+class TestImageLoader:
+    def test_loads_docker_images_in_one_call(self, fake_kind, cluster, tmp_path):
+        fake_kind.add_image("app:1", "sha256:aaa")
+        fake_kind.add_image("db:1", "sha256:bbb")
+        loader = ImageLoader(tmp_path / "manifests")
+
+        assert loader.load(cluster, "g1", ["app:1", "db:1"]) == ["app:1", "db:1"]
+        assert _loads(fake_kind) == [
+            ["load", "docker-image", "app:1", "db:1", f"--name={cluster}"]
+        ]
+
+    def test_loads_archives(self, fake_kind, cluster, tmp_path):
+        archive = tmp_path / "app.tar"
+        archive.write_bytes(b"image")
+        ImageLoader(tmp_path / "manifests").load(cluster, "g1", [str(archive)])
+        assert _loads(fake_kind) == [
+            ["load", "image-archive", str(archive), f"--name={cluster}"]
+        ]
+
+    def test_manifest_skips_unchanged_across_sessions(
+        self, fake_kind, cluster, tmp_path
+    ):
+        fake_kind.add_image("app:1", "sha256:aaa")
+        ImageLoader(tmp_path / "manifests").load(cluster, "g1", ["app:1"])
+        assert ImageLoader(tmp_path / "manifests").load(cluster, "g1", ["app:1"]) == []
+        assert len(_loads(fake_kind)) == 1
+
+    def test_changed_digest_reloads(self, fake_kind, cluster, tmp_path):
+        fake_kind.add_image("app:1", "sha256:aaa")
+        ImageLoader(tmp_path / "manifests").load(cluster, "g1", ["app:1"])
+        fake_kind.add_image("app:1", "sha256:bbb")
+        assert ImageLoader(tmp_path / "manifests").load(cluster, "g1", ["app:1"]) == [
+            "app:1"
+        ]
+
+    def test_new_generation_reloads(self, fake_kind, cluster, tmp_path):
+        fake_kind.add_image("app:1", "sha256:aaa")
+        loader = ImageLoader(tmp_path / "manifests")
+        loader.load(cluster, "g1", ["app:1"])
+        assert loader.load(cluster, "g1", ["app:1"]) == []
+        assert loader.load(cluster, "g2", ["app:1"]) == ["app:1"]
+
+    def test_registry_recreate_invalidates(self, fake_kind, tmp_path):
+        fake_kind.add_image("app:1", "sha256:aaa")
+        registry = ClusterRegistry(probe=None)
+        loader = ImageLoader(tmp_path / "manifests")
+        registry.subscribe(loader.invalidate_cluster)
+
+        registry.ensure(name="re", wait="0s", cfg_path=None, use_name_arg=True)
+        loader.load("re", "g1", ["app:1"])
+        registry.delete("re")
+        registry.ensure(name="re", wait="0s", cfg_path=None, use_name_arg=True)
+        assert loader.load("re", "g1", ["app:1"]) == ["app:1"]
+
+    def test_manifest_dir_created_on_first_load(self, fake_kind, cluster, tmp_path):
+        fake_kind.add_image("app:1", "sha256:aaa")
+        calls = []
+
+        def manifest_dir():
+            calls.append(1)
+            return tmp_path / "manifests"
+
+        loader = ImageLoader(manifest_dir)
+        loader.invalidate_cluster(cluster)
+        assert not calls and not (tmp_path / "manifests").exists()
+        loader.load(cluster, "g1", ["app:1"])
+        loader.invalidate_cluster(cluster)
+        loader.load(cluster, "g1", ["app:1"])
+        assert len(calls) == 1
+        assert (tmp_path / "manifests" / f"{cluster}.json").is_file()
+
+    def test_provisioner_loads_after_create(self, fake_kind, tmp_path):
+        fake_kind.add_image("app:1", "sha256:aaa")
+        loader = ImageLoader(tmp_path / "manifests")
+        provisioner = ClusterProvisioner(
+            ClusterRegistry(probe=None), image_loader=loader
+        )
+        try:
+            for name in ("a", "b"):
+                provisioner.submit(name, use_name_arg=True, images=["app:1"])
+            for name in ("a", "b"):
+                provisioner.wait(name)
+        finally:
+            provisioner.shutdown()
+        assert len(_loads(fake_kind)) == 2
+
+
+class TestKindImagesPlugin:
+    def test_ini_and_marker_images_loaded_once(
+        self, pytester, fake_kind, fake_ansible, project
+    ):
+        fake_kind.add_image("app:1", "sha256:aaa")
+        (project / "extra.tar").write_bytes(b"image")
+        pytester.makeini("[pytest]\nkind_images =\n    app:1\n")
+        pytester.makepyfile(
+            """
+            import pytest
+
+            pytestmark = pytest.mark.kind_images("extra.tar")
+
+            def test_one(kind_runner):
+                kind_runner("playbooks/site.yaml")
+
+            def test_two(kind_runner):
+                kind_runner("playbooks/site.yaml")
+            """
+        )
+        result = pytester.runpytest_inprocess(f"--kind-project-dir={project}")
+        result.assert_outcomes(passed=2)
+
+        loads = _loads(fake_kind)
+        assert [c[:2] for c in loads] == [
+            ["load", "docker-image"],
+            ["load", "image-archive"],
+        ]
+        assert loads[1][2] == str(project / "extra.tar")
+
+        result = pytester.runpytest_inprocess(f"--kind-project-dir={project}")
+        result.assert_outcomes(passed=2)
+        assert len(_loads(fake_kind)) == 2
+
+    def test_no_manifest_dir_without_images(self, pytester, fake_kind, project):
+        pytester.makepyfile("def test_plain():\n    pass\n")
+        result = pytester.runpytest_inprocess(f"--kind-project-dir={project}")
+        result.assert_outcomes(passed=1)
+        assert (pytester.path / ".pytest_cache").is_dir()
+        assert not list(pytester.path.rglob("pytest-ansible-kind-images"))
@@ -0,0 +1,43 @@
+"""Importing the plugin must not pull in ansible-runner, kubernetes or yaml."""
+
+from __future__ import annotations
+
+import subprocess
+import sys
+
+HEAVY = ("ansible_runner", "kubernetes", "yaml")
+
+
+def _loaded_after(code: str) -> list[str]:
+    probe = (
+        f"{code}\n"
+        "import sys\n"
+        f"print(','.join(m for m in {HEAVY!r} if m in sys.modules))\n"
+    )
+    out = subprocess.run(
+        [sys.executable, "-c", probe], check=True, capture_output=True, text=True
+    )
+    return [m for m in out.stdout.strip().split(",") if m]
+
+
+def test_plugin_import_is_light():
+    assert _loaded_after("import pytest_ansible_kind.main") == []
+
+
+def test_exceptions_import_is_light():
+    assert _loaded_after("from pytest_ansible_kind import KindError, KindRunner") == []
+
+
+def test_collect_only_is_light(pytester):
+    pytester.makeconftest(
+        f"""
+        import sys
+
+        def pytest_collection_finish(session):
+            loaded = [m for m in {HEAVY!r} if m in sys.modules]
+            print("HEAVY=" + ",".join(loaded))
+        """
+    )
+    pytester.makepyfile("def test_uses_runner(kind_runner):\n    pass\n")
+    result = pytester.runpytest_subprocess("--collect-only", "-s")
+    result.stdout.fnmatch_lines(["HEAVY="])
@@ -0,0 +1,220 @@
+"""Unit tests for the per-session project index."""
+
+from __future__ import annotations
+
+import os
+
+import pytest
+
+from pytest_ansible_kind import KindConfigError
+from pytest_ansible_kind.index import ProjectIndex, scan_references
+from pytest_ansible_kind.registry import ClusterRegistry
+from pytest_ansible_kind.runner import KindRunner
+
+
+@pytest.fixture
+def index(tmp_path, monkeypatch):
+    monkeypatch.setattr("tempfile.tempdir", str(tmp_path))
+    idx = ProjectIndex()
+    yield idx
+    idx.close()
+
+
+def _touch_later(path) -> None:
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+
+
+class TestProjectIndex:
+    def test_parses_once_until_modified(self, index, tmp_path):
+        cfg = tmp_path / "cluster.yaml"
+        cfg.write_text("name: alpha\n")
+        assert index.cluster_name(str(cfg)) == "alpha"
+        assert index.cluster_name(str(cfg)) == "alpha"
+        assert (index.parses, index.hits) == (1, 1)
+
+        cfg.write_text("name: beta\n")
+        _touch_later(cfg)
+        assert index.cluster_name(str(cfg)) == "beta"
+        assert index.parses == 2
+
+    def test_config_errors(self, index, tmp_path):
+        bad = tmp_path / "bad.yaml"
+        bad.write_text("name: [unclosed\n")
+        with pytest.raises(KindConfigError, match="Invalid YAML"):
+            index.cluster_name(str(bad))
+        with pytest.raises(KindConfigError, match="not found"):
+            index.cluster_name(str(tmp_path / "missing.yaml"))
+
+    def test_inventory_reused_by_content(self, index):
+        first = index.inventory(["localhost"])
+        assert index.inventory(["localhost"]) == first
+        other = index.inventory(["web", "db"])
+        assert other != first
+        with open(other, encoding="utf-8") as fh:
+            assert fh.read() == (
+                "web ansible_connection=local\ndb ansible_connection=local\n"
+            )
+
+        os.unlink(first)
+        assert os.path.exists(index.inventory(["localhost"]))
+        index.close()
+        assert not os.path.exists(other)
+
+    def test_runner_shares_index(self, fake_kind, fake_ansible, project, index):
+        runner = KindRunner(
+            str(project),
+            registry=ClusterRegistry(probe=None),
+            output="silent",
+            index=index,
+        )
+        try:
+            for _ in range(3):
+                runner("playbooks/site.yaml")
+        finally:
+            runner.close()
+        assert index.parses == 1
+        assert len({c["inventory"] for c in fake_ansible.calls}) == 1
+        # The index is not the runner's to close.
+        assert os.path.exists(fake_ansible.calls[0]["inventory"])
+
+
+class TestDependencies:
+    def _write(self, root, files):
+        for rel, text in files.items():
+            path = root / rel
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(text)
+
+    def test_follows_references(self, index, tmp_path):
+        self._write(
+            tmp_path,
+            {
+                "pb/site.yaml": "- import_playbook: base.yaml\n",
+                "pb/base.yaml": (
+                    "- hosts: all\n"
+                    "  vars_files: [vars/main.yaml]\n"
+                    "  roles: [local]\n"
+                    "  tasks:\n"
+                    "    - block:\n"
+                    "        - include_tasks: tasks/outer.yaml\n"
+                ),
+                "pb/vars/main.yaml": "a: 1\n",
+                "pb/tasks/outer.yaml": "- ansible.builtin.import_tasks: inner.yaml\n",
+                "pb/tasks/inner.yaml": "- include_vars: {file: extra.yaml}\n",
+                "pb/tasks/extra.yaml": "b: 2\n",
+                "pb/roles/local/tasks/main.yaml": "- ping:\n",
+                "pb/group_vars/all.yaml": "c: 3\n",
+                "inv/group_vars/all.yaml": "d: 4\n",
+                "inv/hosts.ini": "localhost\n",
+            },
+        )
+        deps = index.dependencies(
+            str(tmp_path / "pb" / "site.yaml"),
+            str(tmp_path / "roles"),
+            str(tmp_path / "inv" / "hosts.ini"),
+        )
+        expected = [
+            "inv/group_vars",
+            "pb/base.yaml",
+            "pb/group_vars",
+            "pb/roles/local",
+            "pb/site.yaml",
+            "pb/tasks/extra.yaml",
+            "pb/tasks/inner.yaml",
+            "pb/tasks/outer.yaml",
+            "pb/vars/main.yaml",
+        ]
+        assert sorted(os.path.relpath(p, tmp_path) for p in deps) == expected
+
+    @pytest.mark.parametrize(
+        "play",
+        [
+            "- import_playbook: missing.yaml\n",
+            "- hosts: all\n  vars_files: ['{{ env }}.yaml']\n",
+            "- hosts: all\n  tasks:\n    - include_tasks: '{{ item }}'\n",
+            "- hosts: all\n  roles: [community.general.thing]\n",
+            "- hosts: all\n  tasks:\n    - include_vars: {dir: vars}\n",
+        ],
+    )
+    def test_unresolvable_references(self, index, tmp_path, play):
+        playbook = tmp_path / "site.yaml"
+        playbook.write_text(play)
+        assert index.dependencies(str(playbook), str(tmp_path / "roles")) is None
+
+
+class TestScanReferences:
+    def test_finds_literal_references(self):
+        found = scan_references(
+            """
+def helper(kind_runner):
+    kind_runner.submit("shared.yaml")
+
+def test_call(kind_runner):
+    kind_runner("a.yaml", kind_config="cfg.yaml", inventory_file="inv.ini")
+
+class TestBatch:
+    def test_many(self, kind_runner):
+        kind_runner.run_many(["b.yaml", ("c.yaml", {"x": 1})])
+
+def test_dynamic(kind_runner, name):
+    kind_runner(name)
+    kind_runner("d.yaml", project_dir="/elsewhere")
+"""
+        )
+        assert found["helper"].playbooks == ["shared.yaml"]
+        assert found["test_call"].playbooks == ["a.yaml"]
+        assert found["test_call"].configs == ["cfg.yaml"]
+        assert found["test_call"].inventories == ["inv.ini"]
+        assert found["TestBatch.test_many"].playbooks == ["b.yaml", "c.yaml"]
+        assert "test_dynamic" not in found
+
+
+class TestCollectionValidation:
+    _TESTS = """
+import pytest
+
+def test_good(kind_runner):
+    kind_runner("playbooks/site.yaml")
+
+def test_bad(kind_runner):
+    kind_runner("playbooks/missing.yaml")
+"""
+
+    def test_bad_path_fails_before_cluster(
+        self, pytester, fake_kind, fake_ansible, project
+    ):
+        pytester.makepyfile(
+            self._TESTS
+            + """
+@pytest.mark.kind_cluster("missing-cluster.yaml")
+def test_bad_config(kind_runner):
+    pass
+"""
+        )
+        pytester.makeini("[pytest]\nkind_validate_references = true\n")
+        result = pytester.runpytest_inprocess(f"--kind-project-dir={project}")
+        result.assert_outcomes(passed=1, errors=2)
+        result.stdout.fnmatch_lines(
+            [
+                "*PlaybookNotFoundError*missing.yaml*",
+                "*KindConfigError*missing-cluster.yaml*",
+            ]
+        )
+        creates = [c for c in fake_kind.calls() if c[:2] == ["create", "cluster"]]
+        assert len(creates) == 1
+
+    def test_off_by_default(self, pytester, fake_kind, fake_ansible, project):
+        pytester.makepyfile(
+            self._TESTS
+            + """
+from pytest_ansible_kind.exceptions import PlaybookNotFoundError
+
+def test_expects_missing(kind_runner):
+    with pytest.raises(PlaybookNotFoundError):
+        kind_runner("playbooks/does-not-exist.yaml")
+"""
+        )
+        result = pytester.runpytest_inprocess(f"--kind-project-dir={project}")
+        result.assert_outcomes(passed=2, failed=1)
+        assert "PlaybookNotFoundError" in result.stdout.str()
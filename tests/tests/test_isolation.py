@@ -0,0 +1,131 @@
+"""Unit tests for per-test namespace isolation."""
+
+from __future__ import annotations
+
+import re
+
+import pytest
+
+from pytest_ansible_kind import KindRunner
+from pytest_ansible_kind.isolation import (
+    ISOLATION_LABEL,
+    NamespaceIsolation,
+    namespace_name,
+    nodeid_label,
+)
+from pytest_ansible_kind.registry import ClusterRegistry
+
+NODEID = "tests/test_app.py::TestApp::test_Deploy[param-1]"
+
+
+class TestNaming:
+    def test_namespace_is_dns_label(self):
+        name = namespace_name(NODEID)
+        assert re.fullmatch(r"[a-z0-9]([-a-z0-9]*[a-z0-9])?", name)
+        assert len(name) <= 63
+        assert name.startswith("kt-test-deploy-param-1-")
+
+    def test_namespace_is_stable_and_unique(self):
+        assert namespace_name(NODEID) == namespace_name(NODEID)
+        assert namespace_name(NODEID) != namespace_name(NODEID + "x")
+
+    def test_long_names_are_truncated(self):
+        assert len(namespace_name("t.py::test_" + "x" * 200)) <= 63
+
+
+class TestNamespaceIsolation:
+    def test_extravars_and_single_create(self, fake_kind):
+        isolation = NamespaceIsolation()
+        first = isolation.extravars(NODEID, "/kc")
+        second = isolation.extravars(NODEID, "/kc")
+
+        assert first == second
+        assert first["kind_namespace"] == namespace_name(NODEID)
+        assert first["kind_isolation_labels"] == {ISOLATION_LABEL: nodeid_label(NODEID)}
+        applies = [c for c in fake_kind.calls("kubectl") if c[0] == "apply"]
+        assert len(applies) == 1
+
+    def test_cleanup_bulk_deletes_then_waits(self, fake_kind):
+        isolation = NamespaceIsolation(timeout="5s")
+        isolation.extravars(NODEID, "/kc")
+        isolation.cleanup(NODEID)
+
+        calls = [c for c in fake_kind.calls("kubectl") if c[0] != "apply"]
+        ns = namespace_name(NODEID)
+        assert calls[0][:3] == ["delete", "namespace", ns]
+        assert "--wait=false" in calls[0]
+        assert calls[1][0] == "delete"
+        assert "clusterroles" in calls[1][1]
+        assert f"{ISOLATION_LABEL}={nodeid_label(NODEID)}" in calls[1]
+        assert calls[2] == ["wait", "--for=delete", f"namespace/{ns}", "--timeout=5s"]
+
+    def test_deleted_cluster_is_forgotten(self, fake_kind):
+        isolation = NamespaceIsolation()
+        isolation.extravars(NODEID, "/kc-a", "a")
+        isolation.extravars(NODEID, "/kc-b", "b")
+        isolation.invalidate_cluster("a")
+        isolation.cleanup(NODEID)
+
+        deletes = [c for c in fake_kind.calls("kubectl") if c[0] == "delete"]
+        assert len(deletes) == 2
+
+    def test_cleanup_unknown_test_is_noop(self, fake_kind):
+        NamespaceIsolation().cleanup(NODEID)
+        assert fake_kind.calls("kubectl") == []
+
+
+class TestRunnerIsolation:
+    def test_namespace_passed_to_playbook(
+        self, fake_kind, fake_ansible, project, monkeypatch
+    ):
+        monkeypatch.setenv("PYTEST_CURRENT_TEST", f"{NODEID} (call)")
+        runner = KindRunner(
+            str(project),
+            registry=ClusterRegistry(probe=None),
+            isolation=NamespaceIsolation(),
+        )
+        runner("playbooks/site.yaml", extravars={"replicas": 2})
+
+        extravars = fake_ansible.calls[0]["extravars"]
+        assert extravars["kind_namespace"] == namespace_name(NODEID)
+        assert extravars["replicas"] == 2
+
+    def test_teardown_cleans_up(self, pytester, fake_kind, fake_ansible, project):
+        pytester.makepyfile(
+            """
+            def test_one(kind_runner, kind_namespace):
+                kind_runner("playbooks/site.yaml")
+            """
+        )
+        result = pytester.runpytest_inprocess(
+            f"--kind-project-dir={project}", "--kind-isolation=namespace"
+        )
+        result.assert_outcomes(passed=1)
+
+        ns = namespace_name("test_teardown_cleans_up.py::test_one")
+        assert fake_ansible.calls[0]["extravars"]["kind_namespace"] == ns
+        verbs = [c[0] for c in fake_kind.calls("kubectl")]
+        assert verbs == ["apply", "delete", "delete", "wait"]
+
+    @pytest.mark.parametrize("policy, applies", [("call", 2), ("module", 1)])
+    def test_with_deleting_shutdown_policy(
+        self, pytester, fake_kind, fake_ansible, project, policy, applies
+    ):
+        pytester.makepyfile(
+            """
+            def test_one(kind_runner):
+                kind_runner("playbooks/site.yaml")
+                kind_runner("playbooks/site.yaml")
+            """
+        )
+        result = pytester.runpytest_inprocess(
+            f"--kind-project-dir={project}",
+            "--kind-isolation=namespace",
+            f"--kind-shutdown-policy={policy}",
+        )
+        result.assert_outcomes(passed=1)
+        assert fake_kind.clusters() == []
+        # The namespace is recreated with the cluster; nothing is cleaned
+        # up on a cluster that is already gone.
+        verbs = [c[0] for c in fake_kind.calls("kubectl")]
+        assert verbs == ["apply"] * applies
@@ -0,0 +1,120 @@
+"""Unit tests for cross-process cluster leases."""
+
+from __future__ import annotations
+
+import json
+import subprocess
+import sys
+import tempfile
+import threading
+
+from pytest_ansible_kind.lease import LeaseManager, _lease_path, cluster_lock
+from pytest_ansible_kind.providers import FakeProvider
+from pytest_ansible_kind.registry import ClusterRegistry
+
+_HOLDER = """
+import sys, tempfile
+tempfile.tempdir = sys.argv[1]
+from pytest_ansible_kind.lease import LeaseManager
+LeaseManager().acquire("shared", lambda: False)
+print("ready", flush=True)
+sys.stdin.readline()
+"""
+
+
+def _registry(provider: FakeProvider) -> ClusterRegistry:
+    return ClusterRegistry(probe=None, provider=provider)
+
+
+class TestClusterLock:
+    def test_reentrant_in_thread(self, tmp_path, monkeypatch):
+        monkeypatch.setattr("tempfile.tempdir", str(tmp_path))
+        with cluster_lock("a"):
+            with cluster_lock("a"):
+                pass
+
+    def test_excludes_other_threads(self, tmp_path, monkeypatch):
+        monkeypatch.setattr("tempfile.tempdir", str(tmp_path))
+        inside = threading.Event()
+
+        def other() -> None:
+            with cluster_lock("a"):
+                inside.set()
+
+        with cluster_lock("a"):
+            t = threading.Thread(target=other, daemon=True)
+            t.start()
+            assert not inside.wait(0.2)
+        t.join(5)
+        assert inside.is_set()
+
+
+class TestLeaseManager:
+    def test_last_holder_deletes(self, tmp_path, monkeypatch):
+        monkeypatch.setattr("tempfile.tempdir", str(tmp_path))
+        provider = FakeProvider()
+        first, second = _registry(provider), _registry(provider)
+        for registry in (first, second):
+            registry.ensure(name="warm", wait="0s", cfg_path=None, use_name_arg=True)
+        assert len(first.leases.holders("warm")) == 2
+
+        assert first.delete("warm") is False
+        assert provider.clusters == {"warm"}
+        assert second.delete("warm") is True
+        assert provider.deleted == ["warm"]
+
+    def test_acquire_is_idempotent(self, tmp_path, monkeypatch):
+        monkeypatch.setattr("tempfile.tempdir", str(tmp_path))
+        registry = _registry(FakeProvider())
+        for _ in range(3):
+            registry.forget("warm")
+            registry.ensure(name="warm", wait="0s", cfg_path=None, use_name_arg=True)
+        assert registry.leases.holders("warm") == [registry.leases.holder]
+
+    def test_close_releases_without_deleting(self, tmp_path, monkeypatch):
+        monkeypatch.setattr("tempfile.tempdir", str(tmp_path))
+        provider = FakeProvider()
+        registry = _registry(provider)
+        registry.ensure(name="warm", wait="0s", cfg_path=None, use_name_arg=True)
+        registry.close()
+        assert registry.leases.holders("warm") == []
+        assert provider.deleted == []
+
+    def test_dead_holders_are_pruned(self, tmp_path, monkeypatch):
+        monkeypatch.setattr("tempfile.tempdir", str(tmp_path))
+        dead = subprocess.run(
+            [sys.executable, "-c", "import os; print(os.getpid())"],
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        with open(_lease_path("warm"), "w") as fh:
+            json.dump({"holders": {"gone": {"pid": int(dead.stdout)}}}, fh)
+
+        deleted = LeaseManager().release("warm", lambda: None)
+        assert deleted is True
+
+
+class TestCrossProcess:
+    def test_other_process_keeps_cluster_alive(self, tmp_path, monkeypatch):
+        monkeypatch.setattr("tempfile.tempdir", str(tmp_path))
+        provider = FakeProvider()
+        holder = subprocess.Popen(
+            [sys.executable, "-c", _HOLDER, tempfile.gettempdir()],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            text=True,
+        )
+        try:
+            assert holder.stdout.readline().strip() == "ready"
+            registry = _registry(provider)
+            registry.ensure(name="shared", wait="0s", cfg_path=None, use_name_arg=True)
+            assert registry.delete("shared") is False
+            assert provider.deleted == []
+        finally:
+            holder.stdin.close()
+            holder.wait(10)
+
+        # The other process exited without releasing; its lease is pruned.
+        registry.ensure(name="shared", wait="0s", cfg_path=None, use_name_arg=True)
+        assert registry.delete("shared") is True
@@ -0,0 +1,165 @@
+"""Unit tests for running a playbook on a matrix of clusters in parallel."""
+
+from __future__ import annotations
+
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from pytest_ansible_kind import KindConfigError, PlaybookFailedError
+from pytest_ansible_kind.index import scan_references
+from pytest_ansible_kind.providers import FakeProvider
+from pytest_ansible_kind.registry import ClusterRegistry
+from pytest_ansible_kind.runner import KindRunner
+
+_CONFIGS = ["kind/single.yaml", "kind/multi.yaml", "kind/edge.yaml"]
+
+
+class SlowProvider(FakeProvider):
+    """Fake clusters that take a while to create; counts concurrent creates."""
+
+    def __init__(self, delay: float) -> None:
+        super().__init__()
+        self.delay = delay
+        self.active = 0
+        self.max_active = 0
+        self._count = threading.Lock()
+
+    def ensure(self, name, wait, cfg_path, use_name_arg):
+        with self._count:
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        try:
+            time.sleep(self.delay)
+            return super().ensure(name, wait, cfg_path, use_name_arg)
+        finally:
+            with self._count:
+                self.active -= 1
+
+
+@pytest.fixture
+def matrix_project(project, tmp_path, monkeypatch):
+    monkeypatch.setattr("tempfile.tempdir", str(tmp_path))
+    (project / "kind").mkdir()
+    for cfg in _CONFIGS:
+        name = cfg.split("/")[1].removesuffix(".yaml")
+        (project / cfg).write_text(f"kind: Cluster\nname: {name}\n")
+    return project
+
+
+def _runner(project, provider):
+    return KindRunner(
+        str(project),
+        registry=ClusterRegistry(probe=None, provider=provider),
+        output="silent",
+    )
+
+
+class TestRunMatrix:
+    def test_provisions_and_runs_in_parallel(
+        self, matrix_project, fake_ansible, monkeypatch
+    ):
+        def slow_run(**kwargs):
+            time.sleep(0.3)
+            return fake_ansible.run(**kwargs)
+
+        monkeypatch.setattr("ansible_runner.run", slow_run)
+        provider = SlowProvider(delay=0.3)
+        runner = _runner(matrix_project, provider)
+        try:
+            start = time.perf_counter()
+            runs = runner.run_matrix("playbooks/site.yaml", _CONFIGS)
+            elapsed = time.perf_counter() - start
+        finally:
+            runner.close()
+
+        assert list(runs) == _CONFIGS
+        assert [r.cluster for r in runs.values()] == ["single", "multi", "edge"]
+        assert all(r.ok and r.api_client is not None for r in runs.values())
+        assert provider.max_active == 3
+        # Serially this is 3 * (0.3 + 0.3)s.
+        assert elapsed < 1.2
+
+    def test_failures_reported_per_cluster(
+        self, matrix_project, fake_ansible, monkeypatch
+    ):
+        def run(**kwargs):
+            # Runs are concurrent: fail per call, not via shared fake state.
+            result = fake_ansible.run(**kwargs)
+            if "multi" in kwargs["envvars"]["KUBECONFIG"]:
+                return SimpleNamespace(status="failed", rc=2)
+            return result
+
+        monkeypatch.setattr("ansible_runner.run", run)
+        runner = _runner(matrix_project, FakeProvider())
+        try:
+            runs = runner.run_matrix(
+                "playbooks/site.yaml", _CONFIGS[:2], raise_on_error=False
+            )
+            with pytest.raises(PlaybookFailedError):
+                runner.run_matrix("playbooks/site.yaml", _CONFIGS[:2])
+        finally:
+            runner.close()
+        assert runs["kind/single.yaml"].ok
+        assert isinstance(runs["kind/multi.yaml"].error, PlaybookFailedError)
+        assert runs["kind/multi.yaml"].api_client is None
+
+    def test_configs_must_name_distinct_clusters(self, matrix_project):
+        (matrix_project / "kind" / "twin.yaml").write_text("name: single\n")
+        runner = _runner(matrix_project, FakeProvider())
+        try:
+            with pytest.raises(KindConfigError, match="also the cluster of"):
+                runner.run_matrix(
+                    "playbooks/site.yaml", ["kind/single.yaml", "kind/twin.yaml"]
+                )
+        finally:
+            runner.close()
+
+
+def test_scan_finds_matrix_references():
+    found = scan_references(
+        "def test_a(kind_runner, kind_matrix):\n"
+        "    kind_matrix('playbooks/a.yaml')\n"
+        "    kind_runner.run_matrix('playbooks/b.yaml', ['one.yaml', 'two.yaml'])\n"
+    )
+    assert found["test_a"].playbooks == ["playbooks/a.yaml", "playbooks/b.yaml"]
+    assert found["test_a"].configs == ["one.yaml", "two.yaml"]
+
+
+class TestFixture:
+    def test_marker_matrix(self, pytester, fake_kind, fake_ansible, matrix_project):
+        pytester.makepyfile(
+            """
+            import pytest
+
+            @pytest.mark.kind_matrix("kind/single.yaml", "kind/multi.yaml")
+            def test_topologies(kind_matrix):
+                runs = kind_matrix("playbooks/site.yaml")
+                assert [r.cluster for r in runs.values()] == ["single", "multi"]
+            """
+        )
+        result = pytester.runpytest_inprocess(
+            f"--kind-project-dir={matrix_project}", "--kind-preprovision"
+        )
+        result.assert_outcomes(passed=1)
+        assert fake_kind.clusters() == ["multi", "single"]
+
+    def test_missing_config_fails_before_setup(
+        self, pytester, fake_kind, fake_ansible, matrix_project
+    ):
+        pytester.makepyfile(
+            """
+            import pytest
+
+            @pytest.mark.kind_matrix("kind/single.yaml", "kind/nope.yaml")
+            def test_topologies(kind_matrix):
+                kind_matrix("playbooks/site.yaml")
+            """
+        )
+        pytester.makeini("[pytest]\nkind_validate_references = true\n")
+        result = pytester.runpytest_inprocess(f"--kind-project-dir={matrix_project}")
+        result.assert_outcomes(errors=1)
+        result.stdout.fnmatch_lines(["*nope.yaml*"])
+        assert fake_kind.clusters() == []
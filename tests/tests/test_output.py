@@ -0,0 +1,94 @@
+"""Unit tests for the buffered playbook output pipeline."""
+
+from __future__ import annotations
+
+import pytest
+
+from pytest_ansible_kind import KindRunner, PlaybookFailedError
+from pytest_ansible_kind.output import OutputPipeline
+from pytest_ansible_kind.registry import ClusterRegistry
+
+
+def _event(stdout: str, event: str = "runner_on_ok", **data) -> dict:
+    return {"event": event, "stdout": stdout, "event_data": data}
+
+
+class TestOutputPipeline:
+    def test_full_is_batched(self, capsys):
+        pipeline = OutputPipeline("full", batch_size=3)
+        pipeline(_event("one"))
+        pipeline(_event("two"))
+        assert capsys.readouterr().out == ""
+        pipeline(_event("three"))
+        assert capsys.readouterr().out == "one\ntwo\nthree\n"
+        pipeline(_event("four"))
+        pipeline.finish(failed=False)
+        assert capsys.readouterr().out == "four\n"
+
+    def test_summary_shows_failures_and_recap(self, capsys):
+        pipeline = OutputPipeline("summary")
+        pipeline(_event("ok: [localhost]"))
+        pipeline(_event("fatal: ignored", "runner_on_failed", ignore_errors=True))
+        pipeline(_event("fatal: [localhost]", "runner_on_failed"))
+        pipeline(_event("PLAY RECAP", "playbook_on_stats"))
+        pipeline.finish(failed=True)
+        assert capsys.readouterr().out == "fatal: [localhost]\nPLAY RECAP\n"
+
+    def test_on_failure_writes_tail_only_on_failure(self, capsys):
+        pipeline = OutputPipeline("on-failure", tail_lines=2)
+        for line in ("a", "b", "c"):
+            pipeline(_event(line))
+        pipeline.finish(failed=False)
+        assert capsys.readouterr().out == ""
+
+        pipeline.finish(failed=True)
+        assert capsys.readouterr().out == "b\nc\n"
+
+    def test_silent_keeps_bounded_tail(self, capsys):
+        pipeline = OutputPipeline("silent", tail_lines=2)
+        pipeline(_event("a\nb\nc"))
+        pipeline.finish(failed=True)
+        assert capsys.readouterr().out == ""
+        assert pipeline.tail() == "b\nc"
+
+    def test_unknown_mode(self):
+        with pytest.raises(ValueError):
+            OutputPipeline("verbose")
+
+
+class TestFailureOutput:
+    def test_tail_attached_to_error(self, fake_kind, fake_ansible, project, capsys):
+        fake_ansible.status, fake_ansible.rc = "failed", 2
+        fake_ansible.events = [
+            _event("TASK [demo : debug]"),
+            _event("fatal: [localhost]: FAILED!", "runner_on_failed"),
+        ]
+        runner = KindRunner(
+            str(project), registry=ClusterRegistry(probe=None), output="silent"
+        )
+        with pytest.raises(PlaybookFailedError) as exc_info:
+            runner("playbooks/site.yaml")
+
+        assert exc_info.value.output == "TASK [demo : debug]\nfatal: [localhost]: FAILED!"
+        assert "FAILED!" in str(exc_info.value)
+        assert capsys.readouterr().out == ""
+
+
+class TestRunnerOutput:
+    """Through the real ansible-runner and the fake ``ansible-playbook``."""
+
+    @pytest.mark.parametrize(
+        "mode, expected",
+        [("silent", 0), ("summary", 0), ("on-failure", 0), ("full", 1)],
+    )
+    def test_pipeline_is_the_only_writer(
+        self, fake_kind, project, capfd, mode, expected
+    ):
+        runner = KindRunner(
+            str(project), registry=ClusterRegistry(probe=None), output=mode
+        )
+        try:
+            runner("playbooks/site.yaml")
+        finally:
+            runner.close()
+        assert capfd.readouterr().out.count("TASK [fake : debug]") == expected
@@ -0,0 +1,96 @@
+"""Unit tests for the per-task timing profiler."""
+
+from __future__ import annotations
+
+import json
+
+from pytest_ansible_kind.profiling import TaskProfiler
+
+
+def _result(task: str, role: str, duration=None, created=None, uuid="t1") -> dict:
+    data = {"task": task, "role": role, "task_uuid": uuid}
+    if duration is not None:
+        data["duration"] = duration
+    event = {"event": "runner_on_ok", "event_data": data}
+    if created:
+        event["created"] = created
+    return event
+
+
+class TestTaskProfiler:
+    def test_aggregates_by_task_role_and_playbook(self):
+        profiler = TaskProfiler()
+        handler = profiler.handler(lambda: "site.yaml")
+        handler(_result("install", "web", 2.0))
+        handler(_result("install", "web", 1.0))
+        handler(_result("migrate", "db", 5.0))
+
+        assert profiler.tasks[("site.yaml", "web", "install")].total == 3.0
+        assert profiler.tasks[("site.yaml", "web", "install")].count == 2
+        assert profiler.tasks[("site.yaml", "web", "install")].max == 2.0
+        assert profiler.roles["db"].total == 5.0
+        assert profiler.playbooks["site.yaml"].total == 8.0
+        assert [key for key, _ in profiler.slowest_tasks(1)] == [
+            ("site.yaml", "db", "migrate")
+        ]
+
+    def test_duration_from_timestamps(self):
+        profiler = TaskProfiler()
+        handler = profiler.handler(lambda: "site.yaml")
+        handler(
+            {
+                "event": "playbook_on_task_start",
+                "created": "2024-01-01T00:00:00.000000",
+                "event_data": {"task_uuid": "t1"},
+            }
+        )
+        handler(_result("wait", "", created="2024-01-01T00:00:01.500000"))
+        assert profiler.playbooks["site.yaml"].total == 1.5
+
+    def test_ignores_other_events(self):
+        profiler = TaskProfiler()
+        handler = profiler.handler(lambda: "site.yaml")
+        handler({"event": "verbose", "stdout": "hello"})
+        handler(_result("no timing", ""))
+        assert profiler.tasks == {}
+
+    def test_json_export(self, tmp_path):
+        profiler = TaskProfiler()
+        profiler.record(playbook="p.yaml", role="r", task="t", seconds=1.25)
+        out = tmp_path / "profile.json"
+        profiler.write_json(str(out))
+
+        data = json.loads(out.read_text())
+        assert data["tasks"] == [
+            {
+                "playbook": "p.yaml",
+                "role": "r",
+                "task": "t",
+                "total": 1.25,
+                "count": 1,
+                "max": 1.25,
+            }
+        ]
+        assert data["roles"]["r"]["total"] == 1.25
+
+
+class TestProfileReport:
+    def test_terminal_summary_and_json(self, pytester, fake_kind, fake_ansible, project):
+        fake_ansible.events = [_result("install", "demo", 3.5)]
+        test_file = pytester.makepyfile(
+            """
+            def test_run(kind_runner):
+                kind_runner("playbooks/site.yaml")
+            """
+        )
+        out = pytester.path / "profile.json"
+        result = pytester.runpytest_inprocess(
+            f"--kind-project-dir={project}",
+            f"--kind-profile-json={out}",
+            "--kind-profile-top=5",
+            "--kind-profile",
+            str(test_file),
+        )
+        result.assert_outcomes(passed=1)
+        result.stdout.fnmatch_lines(["*kind profile*", "*3.50s*demo : install*"])
+        assert json.loads(out.read_text())["roles"]["demo"]["total"] == 3.5
@@ -0,0 +1,117 @@
+"""Unit tests for the pluggable cluster providers."""
+
+from __future__ import annotations
+
+import pytest
+import yaml
+
+from pytest_ansible_kind import KindConfigError
+from pytest_ansible_kind.providers import FakeProvider, KubeconfigProvider
+from pytest_ansible_kind.registry import ClusterRegistry
+from pytest_ansible_kind.runner import KindRunner
+
+_KUBECONFIG = {
+    "apiVersion": "v1",
+    "kind": "Config",
+    "clusters": [
+        {"name": "ci", "cluster": {"server": "https://127.0.0.1:7001"}},
+        {"name": "dev", "cluster": {"server": "https://127.0.0.1:7002"}},
+    ],
+    "contexts": [
+        {"name": "ci", "context": {"cluster": "ci", "user": "u"}},
+        {"name": "dev", "context": {"cluster": "dev", "user": "u"}},
+    ],
+    "current-context": "dev",
+    "users": [{"name": "u", "user": {"token": "t"}}],
+}
+
+
+@pytest.fixture
+def kubeconfig(tmp_path):
+    path = tmp_path / "warm-kubeconfig"
+    path.write_text(yaml.safe_dump(_KUBECONFIG))
+    return path
+
+
+class TestFakeProvider:
+    def test_runner_needs_no_binaries(
+        self, fake_ansible, project, tmp_path, monkeypatch
+    ):
+        monkeypatch.setenv("PATH", str(tmp_path))
+        monkeypatch.setattr("tempfile.tempdir", str(tmp_path))
+        provider = FakeProvider()
+        runner = KindRunner(str(project), name="fake", provider=provider)
+        try:
+            runner("playbooks/site.yaml")
+            runner("playbooks/site.yaml")
+        finally:
+            runner.close()
+        assert provider.created == ["fake"]
+        assert len(fake_ansible.calls) == 2
+
+    def test_shutdown_deletes_through_provider(
+        self, fake_ansible, project, tmp_path, monkeypatch
+    ):
+        monkeypatch.setattr("tempfile.tempdir", str(tmp_path))
+        provider = FakeProvider()
+        registry = ClusterRegistry(provider=provider)
+        runner = KindRunner(str(project), name="gone", shutdown=True, registry=registry)
+        runner("playbooks/site.yaml")
+        runner.close()
+        assert provider.deleted == []
+        registry.close()
+        assert provider.deleted == ["gone"]
+        assert provider.clusters == set()
+
+
+class TestKubeconfigProvider:
+    def test_uses_kubeconfig_as_is(self, kubeconfig):
+        provider = KubeconfigProvider(path=str(kubeconfig))
+        assert provider.ensure("any", "0s", None, False) is False
+        assert provider.kubeconfig_file("any") == str(kubeconfig)
+        assert provider.kubeconfig("any") == kubeconfig.read_text()
+
+    def test_context_becomes_current(self, kubeconfig):
+        provider = KubeconfigProvider(path=str(kubeconfig), context="ci")
+        assert provider.kubeconfig_file("kind") is None
+        assert yaml.safe_load(provider.kubeconfig("kind"))["current-context"] == "ci"
+
+    def test_unknown_context(self, kubeconfig):
+        provider = KubeconfigProvider(path=str(kubeconfig), context="prod")
+        with pytest.raises(KindConfigError, match="prod"):
+            provider.kubeconfig("kind")
+
+    def test_missing_kubeconfig(self, tmp_path):
+        provider = KubeconfigProvider(path=str(tmp_path / "nope"))
+        with pytest.raises(KindConfigError):
+            provider.ensure("kind", "0s", None, False)
+
+
+class TestProviderOption:
+    def test_kubeconfig_provider_skips_kind(
+        self, pytester, fake_kind, fake_ansible, project, kubeconfig
+    ):
+        pytester.makeini(
+            "[pytest]\n"
+            "kind_provider = kubeconfig\n"
+            f"kind_kubeconfig = {kubeconfig}\n"
+            "kind_context = ci\n"
+            "kind_shutdown = true\n"
+        )
+        pytester.makepyfile(
+            """
+            def test_one(kind_runner):
+                api_client = kind_runner("playbooks/site.yaml")
+                assert api_client.configuration.host == "https://127.0.0.1:7001"
+            """
+        )
+        result = pytester.runpytest_inprocess(f"--kind-project-dir={project}")
+        result.assert_outcomes(passed=1)
+        assert fake_kind.calls() == []
+        assert kubeconfig.exists()
+
+    def test_invalid_provider(self, pytester, project):
+        pytester.makeini("[pytest]\nkind_provider = minikube\n")
+        pytester.makepyfile("def test_noop():\n    pass\n")
+        result = pytester.runpytest_inprocess(f"--kind-project-dir={project}")
+        result.stderr.fnmatch_lines(["*kind_provider must be one of*"])
@@ -0,0 +1,103 @@
+"""Unit tests for parallel cluster pre-provisioning."""
+
+from __future__ import annotations
+
+import pytest
+
+from pytest_ansible_kind import KindClusterError
+from pytest_ansible_kind.provision import ClusterProvisioner
+from pytest_ansible_kind.registry import ClusterRegistry
+
+
+class TestClusterProvisioner:
+    def test_creates_clusters_concurrently(self, fake_kind):
+        provisioner = ClusterProvisioner(ClusterRegistry(probe=None))
+        try:
+            for name in ("a", "b", "c"):
+                provisioner.submit(name, use_name_arg=True)
+            for name in ("a", "b", "c"):
+                provisioner.wait(name)
+        finally:
+            provisioner.shutdown()
+        assert fake_kind.clusters() == ["a", "b", "c"]
+
+    def test_submit_is_deduplicated(self, fake_kind):
+        provisioner = ClusterProvisioner(ClusterRegistry(probe=None))
+        try:
+            first = provisioner.submit("a", use_name_arg=True)
+            assert provisioner.submit("a", use_name_arg=True) is first
+            provisioner.wait("a")
+        finally:
+            provisioner.shutdown()
+        creates = [c for c in fake_kind.calls() if c[:2] == ["create", "cluster"]]
+        assert len(creates) == 1
+
+    def test_wait_unknown_is_noop(self):
+        ClusterProvisioner(ClusterRegistry(probe=None)).wait("never-submitted")
+
+    def test_wait_reraises_creation_error(self, fake_kind, tmp_path):
+        provisioner = ClusterProvisioner(ClusterRegistry(probe=None))
+        try:
+            provisioner.submit(
+                "broken", cfg_path=str(tmp_path / "missing.yaml"), use_name_arg=True
+            )
+            with pytest.raises(KindClusterError):
+                provisioner.wait("broken")
+        finally:
+            provisioner.shutdown()
+
+
+class TestCollectionPreprovision:
+    def test_marker_clusters_created_after_collection(self, pytester, fake_kind):
+        pytester.makefile(".yaml", alpha="name: alpha\n", beta="name: beta\n")
+        pytester.makepyfile(
+            test_one="""
+            import pytest
+
+            pytestmark = pytest.mark.kind_cluster("alpha.yaml")
+
+            def test_a():
+                pass
+            """,
+            test_two="""
+            import pytest
+
+            @pytest.mark.kind_cluster(config="beta.yaml")
+            def test_b():
+                pass
+            """,
+        )
+        result = pytester.runpytest_inprocess(
+            "--kind-preprovision", f"--kind-project-dir={pytester.path}"
+        )
+        result.assert_outcomes(passed=2)
+        assert fake_kind.clusters() == ["alpha", "beta"]
+
+    def test_disabled_by_default(self, pytester, fake_kind):
+        pytester.makepyfile(
+            """
+            import pytest
+
+            @pytest.mark.kind_cluster("alpha.yaml")
+            def test_a():
+                pass
+            """
+        )
+        pytester.runpytest_inprocess().assert_outcomes(passed=1)
+        assert fake_kind.calls() == []
+
+    def test_collect_only_does_not_provision(self, pytester, fake_kind):
+        pytester.makefile(".yaml", alpha="name: alpha\n")
+        pytester.makepyfile(
+            """
+            import pytest
+
+            @pytest.mark.kind_cluster("alpha.yaml")
+            def test_a():
+                pass
+            """
+        )
+        pytester.runpytest_inprocess(
+            "--kind-preprovision", "--collect-only", f"--kind-project-dir={pytester.path}"
+        )
+        assert fake_kind.calls() == []
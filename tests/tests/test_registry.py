@@ -0,0 +1,124 @@
+"""Unit tests for the session-level cluster registry."""
+
+from __future__ import annotations
+
+import os
+import socket
+import stat
+
+from pytest_ansible_kind.providers import FakeProvider
+from pytest_ansible_kind.registry import (
+    ClusterRegistry,
+    ClusterState,
+    _server_address,
+    api_server_reachable,
+)
+
+
+def _ensure(registry: ClusterRegistry, name: str = "kind") -> str:
+    registry.ensure(name=name, wait="1s", cfg_path=None, use_name_arg=True)
+    return registry.kubeconfig_path(name)
+
+
+class TestClusterRegistry:
+    def test_repeated_calls_skip_subprocesses(self, fake_kind):
+        registry = ClusterRegistry(probe=lambda state: True)
+        first = _ensure(registry)
+        calls_after_first = len(fake_kind.calls())
+
+        for _ in range(5):
+            assert _ensure(registry) == first
+
+        assert len(fake_kind.calls()) == calls_after_first
+        assert registry.subprocesses_avoided == 10
+
+    def test_failed_probe_invalidates(self, fake_kind):
+        registry = ClusterRegistry(probe=lambda state: False)
+        _ensure(registry)
+        _ensure(registry)
+
+        fetches = [c for c in fake_kind.calls() if c[:2] == ["get", "kubeconfig"]]
+        assert len(fetches) == 2
+        assert registry.subprocesses_avoided == 0
+
+    def test_delete_forgets_cluster(self, fake_kind):
+        registry = ClusterRegistry(probe=lambda state: True)
+        _ensure(registry)
+        generation = registry.get("kind").generation
+
+        registry.delete("kind")
+        assert registry.get("kind") is None
+        assert fake_kind.clusters() == []
+
+        _ensure(registry)
+        assert registry.get("kind").generation != generation
+
+    def test_generation_tracks_kubeconfig(self, fake_kind):
+        registry = ClusterRegistry(probe=None)
+        _ensure(registry, "a")
+        _ensure(registry, "b")
+        assert registry.get("a").generation != registry.get("b").generation
+
+
+class CountingProvider(FakeProvider):
+    def __init__(self) -> None:
+        super().__init__()
+        self.fetches = 0
+
+    def kubeconfig(self, name: str) -> str:
+        self.fetches += 1
+        return super().kubeconfig(name)
+
+
+class TestKubeconfigFiles:
+    def test_private_file_per_generation(self):
+        provider = CountingProvider()
+        registry = ClusterRegistry(probe=None, provider=provider)
+        path = _ensure(registry, "a")
+        assert stat.S_IMODE(os.stat(path).st_mode) == 0o600
+        assert stat.S_IMODE(os.stat(os.path.dirname(path)).st_mode) == 0o700
+        assert registry.get("a").generation[:12] in os.path.basename(path)
+        with open(path) as fh:
+            assert fh.read() == registry.get("a").kubeconfig
+
+        for _ in range(3):
+            assert _ensure(registry, "a") == path
+        assert provider.fetches == 1
+        assert _ensure(registry, "b") != path
+
+        registry.close()
+        assert not os.path.exists(os.path.dirname(path))
+
+    def test_not_shared_between_registries(self):
+        provider = FakeProvider()
+        first = ClusterRegistry(probe=None, provider=provider)
+        second = ClusterRegistry(probe=None, provider=provider)
+        try:
+            assert _ensure(first) != _ensure(second)
+        finally:
+            first.close()
+            second.close()
+
+
+class TestLivenessProbe:
+    def test_server_address(self):
+        kubeconfig = "clusters:\n- cluster:\n    server: https://127.0.0.1:41234\n"
+        assert _server_address(kubeconfig) == ("127.0.0.1", 41234)
+
+    def test_server_address_invalid(self):
+        assert _server_address("not: [valid") is None
+        assert _server_address("clusters: []") is None
+
+    def test_reachable(self):
+        with socket.socket() as srv:
+            srv.bind(("127.0.0.1", 0))
+            srv.listen(1)
+            port = srv.getsockname()[1]
+            state = ClusterState(
+                name="kind",
+                kubeconfig=f"clusters:\n- cluster:\n    server: https://127.0.0.1:{port}\n",
+            )
+            assert api_server_reachable(state)
+
+    def test_unreachable_without_kubeconfig(self):
+        assert not api_server_reachable(ClusterState(name="kind"))
@@ -0,0 +1,185 @@
+"""Unit tests for the cluster shutdown policies."""
+
+from __future__ import annotations
+
+import threading
+import time
+
+import pytest
+
+from pytest_ansible_kind.providers import FakeProvider
+from pytest_ansible_kind.registry import ClusterRegistry, shutdown_policy
+from pytest_ansible_kind.runner import KindRunner
+
+
+class SlowDeleteProvider(FakeProvider):
+    """Fake provider whose deletes take a while and record their threads."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.threads: set[str] = set()
+
+    def delete(self, name: str) -> None:
+        self.threads.add(threading.current_thread().name)
+        time.sleep(0.1)
+        super().delete(name)
+
+
+@pytest.fixture
+def provider(tmp_path, monkeypatch) -> FakeProvider:
+    monkeypatch.setattr("tempfile.tempdir", str(tmp_path))
+    return FakeProvider()
+
+
+def _runner(project, provider, shutdown, registry=None, **kwargs):
+    registry = registry or ClusterRegistry(probe=None, provider=provider)
+    runner = KindRunner(
+        str(project), shutdown=shutdown, registry=registry, output="silent", **kwargs
+    )
+    return runner, registry
+
+
+class TestShutdownPolicy:
+    @pytest.mark.parametrize(
+        "value, expected",
+        [
+            (True, "session"),
+            (False, "never"),
+            (None, "never"),
+            ("true", "session"),
+            ("false", "never"),
+            ("Module", "module"),
+            ("call", "call"),
+        ],
+    )
+    def test_normalise(self, value, expected):
+        assert shutdown_policy(value) == expected
+
+    def test_rejects_unknown(self):
+        with pytest.raises(ValueError, match="sometimes"):
+            shutdown_policy("sometimes")
+
+
+class TestRunnerShutdown:
+    def test_call_deletes_after_every_call(self, fake_ansible, project, provider):
+        runner, _ = _runner(project, provider, "call", name="c")
+        runner("playbooks/site.yaml")
+        runner("playbooks/site.yaml")
+        runner.close()
+        assert provider.created == ["c", "c"]
+        assert provider.deleted == ["c", "c"]
+
+    def test_call_waits_for_concurrent_calls(
+        self, fake_ansible, project, provider, monkeypatch
+    ):
+        started, finish = threading.Event(), threading.Event()
+
+        def run(**kwargs):
+            if not started.is_set():
+                started.set()
+                assert finish.wait(10)
+            return fake_ansible.run(**kwargs)
+
+        monkeypatch.setattr("ansible_runner.run", run)
+        runner, _ = _runner(project, provider, "call", name="c")
+        try:
+            slow = runner.submit("playbooks/site.yaml")
+            assert started.wait(10)
+            runner("playbooks/site.yaml")
+            # The slow call is still running on the cluster.
+            assert provider.deleted == []
+            finish.set()
+            slow.result(10)
+        finally:
+            finish.set()
+            runner.close()
+        assert provider.created == ["c"]
+        assert provider.deleted == ["c"]
+
+    def test_module_deletes_on_close(self, fake_ansible, project, provider):
+        runner, _ = _runner(project, provider, "module", name="m")
+        runner("playbooks/site.yaml")
+        runner("playbooks/site.yaml")
+        assert provider.deleted == []
+        runner.close()
+        assert provider.created == ["m"]
+        assert provider.deleted == ["m"]
+
+    def test_session_deletes_when_registry_closes(
+        self, fake_ansible, project, provider
+    ):
+        runner, registry = _runner(project, provider, True, name="s")
+        runner("playbooks/site.yaml")
+        runner.close()
+        again, _ = _runner(project, provider, True, registry=registry, name="s")
+        again("playbooks/site.yaml")
+        again.close()
+        assert provider.deleted == []
+        registry.close()
+        assert provider.created == ["s"]
+        assert provider.deleted == ["s"]
+
+    def test_never_keeps_cluster(self, fake_ansible, project, provider):
+        runner, registry = _runner(project, provider, False, name="n")
+        runner("playbooks/site.yaml")
+        runner.close()
+        registry.close()
+        assert provider.deleted == []
+
+    def test_session_deletes_clusters_in_parallel(self, tmp_path, monkeypatch):
+        monkeypatch.setattr("tempfile.tempdir", str(tmp_path))
+        slow = SlowDeleteProvider()
+        registry = ClusterRegistry(probe=None, provider=slow)
+        for name in ("a", "b", "c", "d"):
+            registry.ensure(name=name, wait="0s", cfg_path=None, use_name_arg=True)
+            registry.schedule_delete(name)
+        registry.close()
+        assert sorted(slow.deleted) == ["a", "b", "c", "d"]
+        assert len(slow.threads) > 1
+
+
+class TestShutdownOption:
+    def _modules(self, pytester):
+        for mod in ("test_one", "test_two"):
+            pytester.makepyfile(
+                **{
+                    mod: """
+                    def test_a(kind_runner):
+                        kind_runner("playbooks/site.yaml")
+
+                    def test_b(kind_runner):
+                        kind_runner("playbooks/site.yaml")
+                    """
+                }
+            )
+
+    def _count(self, fake_kind, verb):
+        return len([c for c in fake_kind.calls() if c[:2] == [verb, "cluster"]])
+
+    def test_bare_flag_deletes_once_at_session_end(
+        self, pytester, fake_kind, fake_ansible, project
+    ):
+        self._modules(pytester)
+        # A plain flag: the test path after it is not taken as its value.
+        result = pytester.runpytest_inprocess(
+            f"--kind-project-dir={project}", "--kind-shutdown", str(pytester.path)
+        )
+        result.assert_outcomes(passed=4)
+        assert self._count(fake_kind, "create") == 1
+        assert self._count(fake_kind, "delete") == 1
+        assert fake_kind.clusters() == []
+
+    def test_module_policy(self, pytester, fake_kind, fake_ansible, project):
+        self._modules(pytester)
+        result = pytester.runpytest_inprocess(
+            f"--kind-project-dir={project}", "--kind-shutdown-policy=module"
+        )
+        result.assert_outcomes(passed=4)
+        assert self._count(fake_kind, "create") == 2
+        assert self._count(fake_kind, "delete") == 2
+
+    def test_invalid_ini(self, pytester, fake_kind, fake_ansible, project):
+        pytester.makeini("[pytest]\nkind_shutdown = sometimes\n")
+        self._modules(pytester)
+        result = pytester.runpytest_inprocess(f"--kind-project-dir={project}")
+        result.stdout.fnmatch_lines(["*kind_shutdown: shutdown must be*"])
@@ -0,0 +1,234 @@
+"""Unit tests for before/after cluster state diffs, against a fake API server."""
+
+from __future__ import annotations
+
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+from pytest_ansible_kind.clients import ApiClientPool
+from pytest_ansible_kind.registry import ClusterRegistry
+from pytest_ansible_kind.runner import KindRunner, RunFuture
+from pytest_ansible_kind.snapshot import diff_snapshot, parse_resource, take_snapshot
+
+_LISTS = {
+    "/api/v1/configmaps": ("v1", "ConfigMapList"),
+    "/apis/apps/v1/deployments": ("apps/v1", "DeploymentList"),
+    "/api/v1/namespaces": ("v1", "NamespaceList"),
+}
+
+
+def _obj(name: str, rv: str, namespace: str | None = "demo", uid: str = "") -> dict:
+    meta = {"name": name, "resourceVersion": rv, "uid": uid or f"uid-{name}"}
+    if namespace:
+        meta["namespace"] = namespace
+    return {"metadata": meta, "data": {"rv": rv}}
+
+
+class _Handler(BaseHTTPRequestHandler):
+    def log_message(self, *args) -> None:
+        pass
+
+    def do_GET(self) -> None:
+        api: FakeApi = self.server.api  # type: ignore[attr-defined]
+        url = urlparse(self.path)
+        query = {k: v[0] for k, v in parse_qs(url.query).items()}
+        api.requests.append((url.path, query, self.headers.get("Accept", "")))
+        if url.path not in _LISTS:
+            self.send_response(404)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        with api.lock:
+            items = list(api.objects.get(url.path, []))
+        start = int(query.get("continue") or 0)
+        end = start + int(query.get("limit") or len(items))
+        api_version, kind = _LISTS[url.path]
+        body = json.dumps(
+            {
+                "apiVersion": api_version,
+                "kind": kind,
+                "metadata": {"continue": str(end) if end < len(items) else ""},
+                "items": items[start:end],
+            }
+        ).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class FakeApi:
+    """Serves ``objects[path]`` as paginated lists."""
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.objects: dict[str, list[dict]] = {}
+        self.requests: list[tuple[str, dict, str]] = []
+
+
+@pytest.fixture
+def api():
+    fake = FakeApi()
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    server.daemon_threads = True
+    server.api = fake  # type: ignore[attr-defined]
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    from kubernetes import client
+
+    configuration = client.Configuration()
+    configuration.host = f"http://127.0.0.1:{server.server_address[1]}"
+    api_client = client.ApiClient(configuration=configuration)
+    fake.client = api_client
+    yield fake
+    api_client.close()
+    server.shutdown()
+    server.server_close()
+
+
+class TestParseResource:
+    @pytest.mark.parametrize(
+        "raw, path",
+        [
+            ("v1/pods", "/api/v1/pods"),
+            ("apps/v1/deployments", "/apis/apps/v1/deployments"),
+            (
+                "rbac.authorization.k8s.io/v1/roles",
+                "/apis/rbac.authorization.k8s.io/v1/roles",
+            ),
+            ("example.com/v1beta1/widgets", "/apis/example.com/v1beta1/widgets"),
+        ],
+    )
+    def test_paths(self, raw, path):
+        assert parse_resource(raw) == path
+
+    @pytest.mark.parametrize("raw", ["pods", "Deployment", "apps/deployments"])
+    def test_rejects(self, raw):
+        with pytest.raises(ValueError, match="invalid resource type"):
+            parse_resource(raw)
+
+
+class TestDiff:
+    def test_created_modified_deleted(self, api):
+        api.objects["/api/v1/configmaps"] = [
+            _obj("same", "1"),
+            _obj("changed", "2"),
+            _obj("gone", "3"),
+            _obj("recreated", "4"),
+        ]
+        api.objects["/apis/apps/v1/deployments"] = []
+        before = take_snapshot(api.client, ["v1/configmaps", "apps/v1/deployments"])
+        assert len(before) == 4
+
+        api.objects["/api/v1/configmaps"] = [
+            _obj("same", "1"),
+            _obj("changed", "7"),
+            _obj("recreated", "8", uid="uid-new"),
+        ]
+        api.objects["/apis/apps/v1/deployments"] = [_obj("web", "9")]
+        diff = diff_snapshot(api.client, before)
+
+        assert diff.created == {
+            "apps/v1/Deployment": {"demo/web": _obj("web", "9")},
+            "v1/ConfigMap": {
+                "demo/recreated": _obj("recreated", "8", uid="uid-new")
+            },
+        }
+        assert list(diff.modified["v1/ConfigMap"]) == ["demo/changed"]
+        assert sorted(diff.deleted["v1/ConfigMap"]) == ["demo/gone", "demo/recreated"]
+        assert diff.deleted["v1/ConfigMap"]["demo/gone"]["metadata"] == {
+            "name": "gone",
+            "namespace": "demo",
+            "uid": "uid-gone",
+            "resourceVersion": "3",
+        }
+        assert str(diff) == "2 created, 1 modified, 2 deleted"
+
+    def test_unchanged_is_empty(self, api):
+        api.objects["/api/v1/namespaces"] = [_obj("demo", "5", namespace=None)]
+        before = take_snapshot(api.client, ["v1/namespaces"])
+        diff = diff_snapshot(api.client, before)
+        assert not diff
+        assert before.objects["/api/v1/namespaces"] == {"demo": ("uid-demo", "5")}
+
+    def test_pages_and_metadata_only_before(self, api):
+        api.objects["/api/v1/configmaps"] = [_obj(f"cm{i}", "1") for i in range(1201)]
+        before = take_snapshot(api.client, ["v1/configmaps"])
+        assert len(before) == 1201
+        requests = [r for r in api.requests if r[0] == "/api/v1/configmaps"]
+        assert [q.get("continue") for _, q, _ in requests] == [None, "500", "1000"]
+        assert all(q["limit"] == "500" for _, q, _ in requests)
+        assert all("as=PartialObjectMetadataList" in a for _, _, a in requests)
+
+        api.requests.clear()
+        assert not diff_snapshot(api.client, before)
+        assert all("as=" not in a for _, _, a in api.requests)
+
+
+def test_runner_last_diff(api, fake_kind, fake_ansible, project, monkeypatch):
+    monkeypatch.setattr(ApiClientPool, "_build", lambda self, *args: api.client)
+    api.objects["/apis/apps/v1/deployments"] = []
+
+    def deploy(**kwargs):
+        api.objects["/apis/apps/v1/deployments"] = [_obj("web", "2")]
+        return fake_ansible.run(**kwargs)
+
+    monkeypatch.setattr("ansible_runner.run", deploy)
+    runner = KindRunner(
+        str(project),
+        registry=ClusterRegistry(probe=None),
+        output="silent",
+        api_clients=ApiClientPool(),
+        snapshot=["apps/v1/deployments"],
+    )
+    try:
+        runner("playbooks/site.yaml")
+        assert list(runner.last_diff.created["apps/v1/Deployment"]) == ["demo/web"]
+        runner("playbooks/site.yaml")
+        assert not runner.last_diff
+    finally:
+        runner.close()
+
+
+def test_submitted_runs_keep_their_diff(
+    api, fake_kind, fake_ansible, project, monkeypatch
+):
+    monkeypatch.setattr(ApiClientPool, "_build", lambda self, *args: api.client)
+    api.objects["/apis/apps/v1/deployments"] = []
+
+    def deploy(**kwargs):
+        api.objects["/apis/apps/v1/deployments"] = [_obj("web", "2")]
+        return fake_ansible.run(**kwargs)
+
+    monkeypatch.setattr("ansible_runner.run", deploy)
+    runner = KindRunner(
+        str(project),
+        registry=ClusterRegistry(probe=None),
+        output="silent",
+        api_clients=ApiClientPool(),
+        snapshot=["apps/v1/deployments"],
+    )
+    try:
+        future = runner.submit("playbooks/site.yaml")
+        assert isinstance(future, RunFuture)
+        future.result()
+        assert list(future.diff.created["apps/v1/Deployment"]) == ["demo/web"]
+        # The run happened on another thread: this one has no diff of its own.
+        assert runner.last_diff is None
+        runner("playbooks/site.yaml")
+        assert not runner.last_diff
+        assert future.diff
+    finally:
+        runner.close()
+
+
+def test_invalid_ini(pytester, fake_kind, fake_ansible, project):
+    pytester.makeini("[pytest]\nkind_snapshot =\n    v1/pods\n    pods\n")
+    result = pytester.runpytest_inprocess(f"--kind-project-dir={project}")
+    result.stderr.fnmatch_lines(["*kind_snapshot: invalid resource type 'pods'*"])
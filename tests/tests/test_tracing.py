@@ -0,0 +1,134 @@
+"""Unit tests for phase instrumentation and Chrome trace export."""
+
+from __future__ import annotations
+
+import json
+
+from pytest_ansible_kind import KindRunner
+from pytest_ansible_kind.main import _write_trace
+from pytest_ansible_kind.registry import ClusterRegistry
+from pytest_ansible_kind.tracing import (
+    PhaseTracer,
+    phase,
+    read_chrome_trace,
+    tracing,
+    write_chrome_trace,
+)
+
+
+class TestPhases:
+    def test_phase_without_tracer_is_noop(self):
+        with phase("anything"):
+            pass
+
+    def test_tags_are_merged(self):
+        tracer = PhaseTracer()
+        with tracing(tracer, playbook="site.yaml"):
+            with tracing(None, cluster="kind"):
+                with phase("work", extra="x"):
+                    pass
+            with phase("outer"):
+                pass
+
+        inner, outer = tracer.spans
+        assert inner.name == "work"
+        assert inner.tags == {"playbook": "site.yaml", "cluster": "kind", "extra": "x"}
+        assert outer.tags == {"playbook": "site.yaml"}
+
+    def test_subscribers_see_spans(self):
+        tracer = PhaseTracer()
+        seen = []
+        tracer.subscribe(seen.append)
+        with tracing(tracer), phase("a"):
+            pass
+        assert [s.name for s in seen] == ["a"]
+
+    def test_chrome_events(self):
+        tracer = PhaseTracer()
+        with tracing(tracer, cluster="kind"), phase("ansible_run"):
+            pass
+        meta, event = tracer.chrome_events(process_name="gw0")
+        assert meta["ph"] == "M" and meta["args"] == {"name": "gw0"}
+        assert event["ph"] == "X"
+        assert event["name"] == "ansible_run"
+        assert event["args"] == {"cluster": "kind"}
+        assert isinstance(event["ts"], int) and isinstance(event["dur"], int)
+
+
+class TestRunnerPhases:
+    def test_call_records_lifecycle(self, fake_kind, fake_ansible, project):
+        tracer = PhaseTracer()
+        runner = KindRunner(
+            str(project), registry=ClusterRegistry(probe=None), tracer=tracer
+        )
+        runner("playbooks/site.yaml")
+
+        names = {s.name for s in tracer.spans}
+        assert {
+            "call",
+            "check_binaries",
+            "cluster_exists",
+            "create_cluster",
+            "fetch_kubeconfig",
+            "inventory",
+            "ansible_run",
+            "api_client",
+        } <= names
+        run = next(s for s in tracer.spans if s.name == "ansible_run")
+        assert run.tags["cluster"] == "kind"
+        assert run.tags["playbook"] == "playbooks/site.yaml"
+
+
+class TestTraceFile:
+    def test_controller_merges_worker_fragments(self, tmp_path, monkeypatch):
+        monkeypatch.delenv("PYTEST_XDIST_WORKER", raising=False)
+        path = tmp_path / "trace.json"
+        write_chrome_trace(f"{path}.gw0", [{"name": "from-gw0", "ph": "X"}])
+
+        tracer = PhaseTracer()
+        with tracing(tracer), phase("local"):
+            pass
+        _write_trace(tracer, str(path))
+
+        names = [e["name"] for e in read_chrome_trace(str(path))]
+        assert "local" in names and "from-gw0" in names
+        assert not (tmp_path / "trace.json.gw0").exists()
+
+    def test_worker_writes_fragment(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("PYTEST_XDIST_WORKER", "gw1")
+        path = tmp_path / "trace.json"
+        _write_trace(PhaseTracer(), str(path))
+        assert (tmp_path / "trace.json.gw1").exists()
+        assert not path.exists()
+
+    def test_durations_summary_and_hook(self, pytester, fake_kind, fake_ansible, project):
+        pytester.makeconftest(
+            """
+            spans = []
+
+            def pytest_kind_phase(span):
+                spans.append(span.name)
+
+            def pytest_terminal_summary(terminalreporter):
+                terminalreporter.write_line(f"hooked: {'ansible_run' in spans}")
+            """
+        )
+        test_file = pytester.makepyfile(
+            """
+            def test_run(kind_runner):
+                kind_runner("playbooks/site.yaml")
+            """
+        )
+        trace = pytester.path / "trace.json"
+        result = pytester.runpytest_inprocess(
+            f"--kind-project-dir={project}",
+            f"--kind-trace={trace}",
+            "--kind-durations",
+            str(test_file),
+        )
+        result.assert_outcomes(passed=1)
+        result.stdout.fnmatch_lines(["hooked: True"])
+        result.stdout.fnmatch_lines(["*kind durations*", "ansible_run *"])
+        events = json.loads(trace.read_text())["traceEvents"]
+        nodeids = {e["args"].get("nodeid") for e in events if e["ph"] == "X"}
+        assert "test_durations_summary_and_hook.py::test_run" in nodeids
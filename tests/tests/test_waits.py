@@ -0,0 +1,285 @@
+"""Unit tests for the watch-based readiness waits, against a fake API server."""
+
+from __future__ import annotations
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+from pytest_ansible_kind import WaitError, waits
+from pytest_ansible_kind.providers import FakeProvider
+from pytest_ansible_kind.registry import ClusterRegistry
+from pytest_ansible_kind.runner import KindRunner
+
+_DEPLOYMENTS = "/apis/apps/v1/namespaces/demo/deployments"
+_JOBS = "/apis/batch/v1/namespaces/demo/jobs"
+
+
+def _deployment(name: str, rv: str, ready: bool) -> dict:
+    return {
+        "metadata": {"name": name, "resourceVersion": rv, "generation": 2},
+        "spec": {"replicas": 2},
+        "status": {
+            "observedGeneration": 2,
+            "replicas": 2,
+            "updatedReplicas": 2 if ready else 1,
+            "availableReplicas": 2 if ready else 1,
+        },
+    }
+
+
+class _Handler(BaseHTTPRequestHandler):
+    # Watches are streamed with chunked encoding, like the real API server.
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args) -> None:
+        pass
+
+    def do_GET(self) -> None:
+        api: FakeApi = self.server.api  # type: ignore[attr-defined]
+        url = urlparse(self.path)
+        query = {k: v[0] for k, v in parse_qs(url.query).items()}
+        name = query.get("fieldSelector", "").partition("=")[2]
+        key = (url.path, name)
+        api.requests.append((url.path, query))
+        if key not in api.objects:
+            self.send_response(404)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        if query.get("watch") != "true":
+            rv, obj = api.list_state(key)
+            body = json.dumps({"metadata": {"resourceVersion": rv}, "items": [obj]})
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body.encode())
+            return
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+
+        with api.lock:
+            api.watching += 1
+            api.max_watching = max(api.max_watching, api.watching)
+        try:
+            while True:
+                event = api.next_event(key)
+                if event is None:
+                    break
+                delay, payload = event
+                time.sleep(delay)
+                self._chunk(json.dumps(payload).encode() + b"\n")
+            # Hold the stream open like a real server until timeoutSeconds.
+            time.sleep(min(float(query.get("timeoutSeconds", 1)), 2))
+            self._chunk(b"")
+        except OSError:
+            pass  # the client stopped watching
+        finally:
+            with api.lock:
+                api.watching -= 1
+
+
+    def _chunk(self, data: bytes) -> None:
+        self.wfile.write(b"%x\r\n%s\r\n" % (len(data), data))
+        self.wfile.flush()
+
+
+class FakeApi:
+    """Scripted list responses and watch events per (path, name)."""
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.objects: dict[tuple[str, str], dict] = {}
+        self.events: dict[tuple[str, str], list[tuple[float, dict]]] = {}
+        self.requests: list[tuple[str, dict]] = []
+        self.watching = 0
+        self.max_watching = 0
+
+    def add(self, path: str, obj: dict, *events: tuple[float, str, dict]) -> None:
+        key = (path, obj["metadata"]["name"])
+        self.objects[key] = obj
+        self.events[key] = [
+            (delay, {"type": kind, "object": o}) for delay, kind, o in events
+        ]
+
+    def list_state(self, key) -> tuple[str, dict]:
+        with self.lock:
+            obj = self.objects[key]
+        return obj["metadata"]["resourceVersion"], obj
+
+    def next_event(self, key):
+        with self.lock:
+            pending = self.events[key]
+            if not pending:
+                return None
+            delay, event = pending.pop(0)
+            if event["type"] != "ERROR":
+                self.objects[key] = event["object"]
+            return delay, event
+
+    def calls(self, path: str, watch: bool) -> list[dict]:
+        return [
+            q
+            for p, q in self.requests
+            if p == path and (q.get("watch") == "true") == watch
+        ]
+
+
+@pytest.fixture
+def api():
+    fake = FakeApi()
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    server.daemon_threads = True
+    server.block_on_close = False
+    server.api = fake  # type: ignore[attr-defined]
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    from kubernetes import client
+
+    configuration = client.Configuration()
+    configuration.host = f"http://127.0.0.1:{server.server_address[1]}"
+    api_client = client.ApiClient(configuration=configuration)
+    fake.client = api_client
+    yield fake
+    api_client.close()
+    server.shutdown()
+    server.server_close()
+
+
+class TestConditions:
+    def test_deployment(self):
+        assert waits.deployment_ready(_deployment("d", "1", ready=True))
+        assert not waits.deployment_ready(_deployment("d", "1", ready=False))
+        stale = _deployment("d", "1", ready=True)
+        stale["status"]["observedGeneration"] = 1
+        assert not waits.deployment_ready(stale)
+
+    def test_statefulset_revision(self):
+        sts = {
+            "spec": {"replicas": 1},
+            "status": {
+                "readyReplicas": 1,
+                "currentRevision": "a",
+                "updateRevision": "b",
+            },
+        }
+        assert not waits.statefulset_ready(sts)
+        sts["status"]["currentRevision"] = "b"
+        assert waits.statefulset_ready(sts)
+
+    def test_crd_and_custom(self):
+        crd = {
+            "status": {
+                "conditions": [
+                    {"type": "NamesAccepted", "status": "True"},
+                    {"type": "Established", "status": "True"},
+                ]
+            }
+        }
+        assert waits.crd_established(crd)
+        assert waits.has_condition("Established")(crd)
+        assert not waits.has_condition("Established", "False")(crd)
+
+    @pytest.mark.parametrize(
+        "raw, expected", [(5, 5.0), ("90s", 90.0), ("2m", 120.0), ("250ms", 0.25)]
+    )
+    def test_seconds(self, raw, expected):
+        assert waits.seconds(raw) == expected
+
+
+class TestWatch:
+    def test_returns_when_watch_reports_ready(self, api):
+        api.add(
+            _DEPLOYMENTS,
+            _deployment("web", "10", ready=False),
+            (0.05, "MODIFIED", _deployment("web", "11", ready=False)),
+            (0.05, "MODIFIED", _deployment("web", "12", ready=True)),
+        )
+        (obj,) = waits.wait_all(api.client, [waits.deployment("web", "demo")], 10)
+        assert obj["metadata"]["resourceVersion"] == "12"
+
+        (listed,) = api.calls(_DEPLOYMENTS, watch=False)
+        (watched,) = api.calls(_DEPLOYMENTS, watch=True)
+        assert listed["fieldSelector"] == "metadata.name=web"
+        assert watched["resourceVersion"] == "10"
+
+    def test_ready_on_list_skips_watch(self, api):
+        api.add(_DEPLOYMENTS, _deployment("web", "10", ready=True))
+        waits.wait_all(api.client, [waits.deployment("web", "demo")], 10)
+        assert api.calls(_DEPLOYMENTS, watch=True) == []
+
+    def test_many_wait_concurrently(self, api):
+        for name in ("a", "b", "c"):
+            api.add(
+                _DEPLOYMENTS,
+                _deployment(name, "1", ready=False),
+                (0.3, "MODIFIED", _deployment(name, "2", ready=True)),
+            )
+        found = waits.wait_all(
+            api.client, [waits.deployment(n, "demo") for n in ("a", "b", "c")], 10
+        )
+        assert [o["metadata"]["name"] for o in found] == ["a", "b", "c"]
+        assert api.max_watching > 1
+
+    def test_failed_job_fails_fast(self, api):
+        failed = {
+            "metadata": {"name": "migrate", "resourceVersion": "4"},
+            "status": {
+                "conditions": [
+                    {"type": "Failed", "status": "True", "message": "BackoffLimit"}
+                ]
+            },
+        }
+        pending = {"metadata": {"name": "migrate", "resourceVersion": "3"}}
+        api.add(_JOBS, pending, (0.0, "MODIFIED", failed))
+        with pytest.raises(WaitError, match="job demo/migrate failed: BackoffLimit"):
+            waits.wait_all(api.client, [waits.job("migrate", "demo")], 10)
+
+    def test_timeout(self, api):
+        api.add(_DEPLOYMENTS, _deployment("web", "10", ready=False))
+        with pytest.raises(WaitError, match="timed out") as exc_info:
+            waits.wait_all(api.client, [waits.deployment("web", "demo")], 1)
+        assert exc_info.value.last["metadata"]["name"] == "web"
+
+    def test_expired_resource_version_relists(self, api):
+        gone = {"kind": "Status", "code": 410, "reason": "Gone", "message": "old"}
+        api.add(
+            _DEPLOYMENTS,
+            _deployment("web", "10", ready=False),
+            (0.0, "ERROR", gone),
+            (0.05, "MODIFIED", _deployment("web", "30", ready=True)),
+        )
+        waits.wait_all(api.client, [waits.deployment("web", "demo")], 10)
+        assert len(api.calls(_DEPLOYMENTS, watch=False)) == 2
+
+    def test_custom_condition(self, api):
+        api.add(
+            _DEPLOYMENTS,
+            _deployment("web", "10", ready=False),
+            (0.05, "MODIFIED", _deployment("web", "11", ready=False)),
+        )
+        scaled = waits.deployment("web", "demo").until(
+            lambda obj: obj["metadata"]["resourceVersion"] == "11"
+        )
+        (obj,) = waits.wait_all(api.client, [scaled], 10)
+        assert obj["metadata"]["resourceVersion"] == "11"
+
+
+def test_runner_wait_for(api, project, tmp_path, monkeypatch):
+    monkeypatch.setattr("tempfile.tempdir", str(tmp_path))
+    api.add(_DEPLOYMENTS, _deployment("web", "10", ready=True))
+    runner = KindRunner(
+        str(project), registry=ClusterRegistry(probe=None, provider=FakeProvider())
+    )
+    try:
+        (obj,) = runner.wait_for(api.client, waits.deployment("web", "demo"))
+    finally:
+        runner.close()
+    assert obj["metadata"]["name"] == "web"
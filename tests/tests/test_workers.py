@@ -0,0 +1,220 @@
+"""Unit tests for the pre-forked ansible-playbook worker pool."""
+
+from __future__ import annotations
+
+import json
+import os
+import shlex
+import subprocess
+import sys
+import time
+
+import pytest
+
+from pytest_ansible_kind.registry import ClusterRegistry
+from pytest_ansible_kind.runner import KindRunner
+from pytest_ansible_kind.workers import AnsibleWorkerPool, config_key
+
+# Stands in for ansible.cli.playbook: logs each import, reports what a job
+# sees and exits with $FAKE_RC.
+_ENTRY = """
+import json, os, sys, time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+with open(os.path.join(HERE, "imports.log"), "a") as fh:
+    fh.write(f"{os.getpid()}\\n")
+
+
+def main(argv):
+    if argv[1:] == ["sleep"]:
+        with open(os.path.join(HERE, "job.pid"), "w") as fh:
+            fh.write(str(os.getpid()))
+        time.sleep(60)
+    print(json.dumps({
+        "argv": argv,
+        "cwd": os.getcwd(),
+        "kubeconfig": os.environ.get("KUBECONFIG"),
+        "tty": sys.stdout.isatty(),
+        "server": os.getppid(),
+    }))
+    sys.exit(int(os.environ.get("FAKE_RC", "0")))
+"""
+
+
+@pytest.fixture
+def entry(tmp_path, monkeypatch):
+    lib = tmp_path / "lib"
+    lib.mkdir()
+    (lib / "fake_playbook.py").write_text(_ENTRY)
+    monkeypatch.setenv("PYTHONPATH", str(lib))
+    return lib
+
+
+@pytest.fixture
+def pool(entry):
+    pool = AnsibleWorkerPool(2, entry="fake_playbook:main", preload=())
+    yield pool
+    pool.close()
+
+
+def _command(pool: AnsibleWorkerPool, playbook: str, *args: str) -> list[str]:
+    kwargs = pool.runner_kwargs(playbook)
+    return [kwargs["binary"], *shlex.split(kwargs["cmdline"]), *args]
+
+
+def _run(pool, cwd, **env):
+    result = subprocess.run(
+        _command(pool, "site.yaml", "-i", "hosts"),
+        cwd=cwd,
+        env={**os.environ, **env},
+        capture_output=True,
+        text=True,
+        timeout=60,
+    )
+    return result.returncode, result.stdout
+
+
+class TestPool:
+    def test_jobs_share_one_warm_server(self, pool, entry, tmp_path):
+        runs = [_run(pool, tmp_path, KUBECONFIG=f"/kube/{i}") for i in range(3)]
+
+        assert [rc for rc, _ in runs] == [0, 0, 0]
+        seen = [json.loads(out) for _, out in runs]
+        assert seen[0]["argv"] == ["ansible-playbook", "site.yaml", "-i", "hosts"]
+        assert [s["kubeconfig"] for s in seen] == ["/kube/0", "/kube/1", "/kube/2"]
+        assert {s["cwd"] for s in seen} == {str(tmp_path)}
+        assert len({s["server"] for s in seen}) == 1
+        assert (entry / "imports.log").read_text().count("\n") == 1
+
+    def test_exit_status(self, pool, tmp_path):
+        assert _run(pool, tmp_path, FAKE_RC="2")[0] == 2
+
+    def test_server_per_ansible_config(self, pool, entry, tmp_path):
+        (tmp_path / "other").mkdir()
+        _run(pool, tmp_path)
+        _run(pool, tmp_path, ANSIBLE_ROLES_PATH="/roles")
+        _run(pool, tmp_path / "other")
+        _run(pool, tmp_path)
+        assert (entry / "imports.log").read_text().count("\n") == 3
+
+    def test_killed_client_stops_job(self, pool, entry, tmp_path):
+        proc = subprocess.Popen(_command(pool, "sleep"), cwd=tmp_path)
+        pid_file = entry / "job.pid"
+        deadline = time.monotonic() + 30
+        while not pid_file.exists() and time.monotonic() < deadline:
+            time.sleep(0.05)
+        job = int(pid_file.read_text())
+        proc.kill()
+        proc.wait()
+
+        deadline = time.monotonic() + 10
+        while time.monotonic() < deadline:
+            try:
+                os.kill(job, 0)
+            except ProcessLookupError:
+                break
+            time.sleep(0.05)
+        else:
+            pytest.fail("job outlived its client")
+
+    def test_falls_back_to_ansible_playbook(self, entry, tmp_path, monkeypatch):
+        bin_dir = tmp_path / "bin"
+        bin_dir.mkdir()
+        cold = bin_dir / "ansible-playbook"
+        cold.write_text(
+            f"#!{sys.executable}\nimport sys\nprint('cold', *sys.argv[1:])\n"
+        )
+        cold.chmod(0o755)
+        monkeypatch.setenv("PATH", f"{bin_dir}{os.pathsep}{os.environ['PATH']}")
+        pool = AnsibleWorkerPool(1, entry="no_such_module:main", preload=())
+        try:
+            assert _run(pool, tmp_path) == (0, "cold site.yaml -i hosts\n")
+        finally:
+            pool.close()
+        assert "no_such_module" in next(iter(pool.errors.values()))
+
+    def test_close_stops_servers(self, entry, tmp_path):
+        pool = AnsibleWorkerPool(1, entry="fake_playbook:main", preload=())
+        _run(pool, tmp_path)
+        (server,) = pool._servers.values()
+        sock_dir = os.path.dirname(server.socket)
+        pool.close()
+        assert server.proc.poll() is not None
+        assert not os.path.exists(sock_dir)
+
+    def test_key_ignores_unrelated_env(self):
+        base = {"HOME": "/root", "ANSIBLE_ROLES_PATH": "/r"}
+        assert config_key("/p", base) == config_key("/p", {**base, "KUBECONFIG": "x"})
+        assert config_key("/p", base) != config_key("/q", base)
+        assert config_key("/p", base) != config_key(
+            "/p", {**base, "ANSIBLE_FORCE_COLOR": "1"}
+        )
+
+
+def test_through_ansible_runner(pool, tmp_path):
+    """ansible-runner's own pty, status and stdout handling are unchanged."""
+    import ansible_runner
+
+    (tmp_path / "site.yaml").write_text("- hosts: localhost\n")
+
+    def run(**envvars):
+        return ansible_runner.run(
+            private_data_dir=str(tmp_path),
+            project_dir=str(tmp_path),
+            playbook="site.yaml",
+            inventory="localhost",
+            envvars={"KUBECONFIG": "/kube", **envvars},
+            artifact_dir=str(tmp_path / "artifacts"),
+            quiet=True,
+            suppress_env_files=True,
+            fact_cache_type="memory",
+            **pool.runner_kwargs("site.yaml"),
+        )
+
+    ok = run()
+    assert (ok.status, ok.rc) == ("successful", 0)
+    seen = json.loads(ok.stdout.read().strip().splitlines()[-1])
+    assert seen["argv"][:2] == ["ansible-playbook", "site.yaml"]
+    assert seen["kubeconfig"] == "/kube" and seen["tty"]
+
+    failed = run(FAKE_RC="2")
+    assert (failed.status, failed.rc) == ("failed", 2)
+
+
+def test_runner_dispatches_to_pool(fake_kind, fake_ansible, project):
+    pool = AnsibleWorkerPool(1)
+    runner = KindRunner(
+        str(project),
+        registry=ClusterRegistry(probe=None),
+        output="silent",
+        workers=pool,
+    )
+    try:
+        runner("playbooks/site.yaml")
+    finally:
+        runner.close()
+        pool.close()
+    (call,) = fake_ansible.calls
+    assert call["binary"] == sys.executable
+    assert shlex.split(call["cmdline"])[-1] == str(project / "playbooks/site.yaml")
+    assert call["playbook"] == str(project / "playbooks/site.yaml")
+
+
+class TestOption:
+    def test_fixture_uses_pool(self, pytester, fake_kind, fake_ansible, project):
+        pytester.makepyfile(
+            """
+            def test_run(kind_runner):
+                kind_runner("playbooks/site.yaml")
+            """
+        )
+        result = pytester.runpytest_inprocess(
+            f"--kind-project-dir={project}", "--kind-ansible-workers=2"
+        )
+        result.assert_outcomes(passed=1)
+        assert "_prefork.py" in fake_ansible.calls[0]["cmdline"]
+
+    def test_invalid_ini(self, pytester, fake_kind, fake_ansible, project):
+        pytester.makeini("[pytest]\nkind_ansible_workers = many\n")
+        result = pytester.runpytest_inprocess(f"--kind-project-dir={project}")
+        result.stderr.fnmatch_lines(["*kind_ansible_workers must be*"])
@@ -0,0 +1,79 @@
+"""Unit tests for per-xdist-worker cluster isolation."""
+
+from __future__ import annotations
+
+import threading
+from types import SimpleNamespace
+
+from pytest_ansible_kind.runner import _cluster_name, _ensure_kind, _kubeconfig
+from pytest_ansible_kind.utilities import resolve_cluster_name_suffix, xdist_worker_id
+
+
+def _config(cli: bool | None, ini: str) -> SimpleNamespace:
+    return SimpleNamespace(
+        getoption=lambda name: cli,
+        getini=lambda name: ini,
+    )
+
+
+class TestNameSuffix:
+    def test_worker_id_absent(self, monkeypatch):
+        monkeypatch.delenv("PYTEST_XDIST_WORKER", raising=False)
+        assert xdist_worker_id() is None
+
+    def test_worker_id_present(self, monkeypatch):
+        monkeypatch.setenv("PYTEST_XDIST_WORKER", "gw3")
+        assert xdist_worker_id() == "gw3"
+
+    def test_disabled_by_default(self, monkeypatch):
+        monkeypatch.setenv("PYTEST_XDIST_WORKER", "gw1")
+        assert resolve_cluster_name_suffix(_config(None, "false")) is None
+
+    def test_enabled_via_ini(self, monkeypatch):
+        monkeypatch.setenv("PYTEST_XDIST_WORKER", "gw1")
+        assert resolve_cluster_name_suffix(_config(None, "true")) == "gw1"
+
+    def test_enabled_via_cli(self, monkeypatch):
+        monkeypatch.setenv("PYTEST_XDIST_WORKER", "gw2")
+        assert resolve_cluster_name_suffix(_config(True, "false")) == "gw2"
+
+    def test_enabled_outside_xdist(self, monkeypatch):
+        monkeypatch.delenv("PYTEST_XDIST_WORKER", raising=False)
+        assert resolve_cluster_name_suffix(_config(True, "false")) is None
+
+    def test_cluster_name_with_suffix(self):
+        assert _cluster_name(None, suffix="gw0") == "kind-gw0"
+        assert _cluster_name(None, name="mine", suffix="gw1") == "mine-gw1"
+        assert _cluster_name(None) == "kind"
+
+
+class TestWorkerClusters:
+    def test_workers_get_separate_clusters_and_kubeconfigs(self, fake_kind):
+        for worker in ("gw0", "gw1"):
+            _ensure_kind(
+                name=_cluster_name(None, suffix=worker),
+                wait="1s",
+                cfg_path=None,
+                use_name_arg=True,
+            )
+        assert fake_kind.clusters() == ["kind-gw0", "kind-gw1"]
+        assert _kubeconfig("kind-gw0") != _kubeconfig("kind-gw1")
+
+    def test_concurrent_ensure_creates_once(self, fake_kind):
+        errors: list[BaseException] = []
+
+        def worker() -> None:
+            try:
+                _ensure_kind(name="shared", wait="1s", cfg_path=None, use_name_arg=True)
+            except BaseException as exc:  # pragma: no cover - surfaced below
+                errors.append(exc)
+
+        threads = [threading.Thread(target=worker) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert not errors
+        creates = [c for c in fake_kind.calls() if c[:2] == ["create", "cluster"]]
+        assert len(creates) == 1